@@ -0,0 +1,93 @@
+"""
+Lecturas a la réplica (DATABASE_REPLICA_URL) con read-your-writes.
+
+- Las escrituras y las lecturas dentro de una transacción van al primario.
+- Tras una escritura, el resto de la request lee del primario, y el mismo
+  cliente sigue "pegado" al primario durante REPLICA_STICKY_SECONDS (cubre
+  el retraso de replicación entre un PATCH y el GET siguiente). El cliente
+  es su cabecera Authorization o, si es anónimo, su IP real (la misma que
+  usan los limitadores: X-Forwarded-For según NUM_PROXIES).
+- La marca vive en la caché por defecto; si no es compartida entre workers
+  otro worker no la vería, así que todas las lecturas van al primario.
+- Tablas donde leer algo viejo es un problema de seguridad (lista negra de
+  tokens, claves de firma) se leen siempre del primario.
+"""
+import hashlib
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.throttling import BaseThrottle
+
+from users.cache_compartida import es_compartida
+
+PRIMARIO = "default"
+REPLICA = "replica"
+
+# Siempre al primario: (app_label, model_name) o app_label completo
+SIEMPRE_PRIMARIO = {"token_blacklist", ("users", "clavefirma")}
+
+_estado = ContextVar("estado_replica", default=None)
+
+
+def _forzar_primario(model):
+    meta = model._meta
+    return meta.app_label in SIEMPRE_PRIMARIO or (meta.app_label, meta.model_name) in SIEMPRE_PRIMARIO
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if (
+            (estado is not None and estado["primario"])
+            or _forzar_primario(model)
+            or connections[PRIMARIO].in_atomic_block
+        ):
+            return PRIMARIO
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado["primario"] = estado["escribio"] = True
+        return PRIMARIO
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Misma base de datos lógica
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación
+        return db == PRIMARIO
+
+
+def _clave_cliente(request):
+    identidad = request.headers.get("Authorization") or BaseThrottle().get_ident(request) or ""
+    return "replica:sticky:" + hashlib.sha256(identidad.encode()).hexdigest()[:32]
+
+
+class ReplicaStickinessMiddleware:
+    """Estado por request para ReplicaRouter (marca de cliente en la caché)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not es_compartida():
+            # Sin marca visible para todos los workers no hay read-your-writes
+            token = _estado.set({"primario": True, "escribio": False})
+            try:
+                return self.get_response(request)
+            finally:
+                _estado.reset(token)
+
+        clave = _clave_cliente(request)
+        estado = {"primario": bool(cache.get(clave)), "escribio": False}
+        token = _estado.set(estado)
+        try:
+            return self.get_response(request)
+        finally:
+            _estado.reset(token)
+            if estado["escribio"]:
+                cache.set(clave, True, timeout=settings.REPLICA_STICKY_SECONDS)
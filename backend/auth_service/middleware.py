@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class SoloAdminMiddleware:
+    """
+    Aplica settings.ADMIN_MIDDLEWARE solo a las rutas bajo ADMIN_URL_PREFIX
+    (perfil APP_PROFILE=api). Las llamadas a /api/ autentican con JWT y no
+    usan sesión ni cookies: no pagan sesiones, CSRF, mensajes ni X-Frame-Options.
+    Igual que BaseHandler, encadena los hooks process_view/process_exception
+    de la cadena interna (CsrfViewMiddleware valida en process_view).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefijo = settings.ADMIN_URL_PREFIX
+        self._view_middleware = []
+        self._exception_middleware = []
+
+        handler = get_response
+        for ruta in reversed(settings.ADMIN_MIDDLEWARE):
+            try:
+                mw = import_string(ruta)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(mw, "process_view"):
+                self._view_middleware.insert(0, mw.process_view)
+            if hasattr(mw, "process_exception"):
+                self._exception_middleware.append(mw.process_exception)
+            handler = convert_exception_to_response(mw)
+        self._cadena_admin = handler
+
+    def _es_admin(self, request):
+        return request.path_info.startswith(self.prefijo)
+
+    def __call__(self, request):
+        if self._es_admin(request):
+            return self._cadena_admin(request)
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._es_admin(request):
+            return None
+        for hook in self._view_middleware:
+            respuesta = hook(request, view_func, view_args, view_kwargs)
+            if respuesta is not None:
+                return respuesta
+        return None
+
+    def process_exception(self, request, exception):
+        if not self._es_admin(request):
+            return None
+        for hook in self._exception_middleware:
+            respuesta = hook(request, exception)
+            if respuesta is not None:
+                return respuesta
+        return None
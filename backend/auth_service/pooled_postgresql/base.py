@@ -0,0 +1,140 @@
+"""
+Backend PostgreSQL (psycopg2) con pool de conexiones en el cliente.
+
+Django 5.0 no trae pool propio para psycopg2: este backend reutiliza el
+oficial y solo cambia de dónde salen las conexiones. Al "cerrar" una conexión
+(fin de request con CONN_MAX_AGE=0) vuelve al pool en lugar de cerrarse, así
+que no se repite el handshake TCP + TLS contra Supabase en cada request.
+
+Configuración en DATABASES[alias]["POOL"]:
+    MAX_SIZE      conexiones abiertas como máximo por proceso
+    TIMEOUT       segundos esperando una conexión libre antes de fallar
+    CHECK_AFTER   inactividad (s) tras la que se comprueba con SELECT 1
+    MAX_IDLE      inactividad (s) tras la que se cierra en vez de reutilizarla
+    MAX_LIFETIME  vida máxima (s) de una conexión (reciclado)
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from psycopg2 import extensions
+
+
+class PoolConexiones:
+    """Pool acotado (semáforo) y LIFO: se reutiliza la conexión más reciente."""
+
+    def __init__(self, max_size=4, timeout=5, check_after=30, max_idle=300, max_lifetime=1800):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self._cupos = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._libres = deque()   # (conexión, creada_en, devuelta_en)
+        self._creadas = {}       # id(conexión) -> creada_en
+        self._contadores = {"nuevas": 0, "reutilizadas": 0, "descartadas": 0, "agotado": 0}
+
+    def obtener(self, conectar):
+        if not self._cupos.acquire(timeout=self.timeout):
+            self._contadores["agotado"] += 1
+            raise OperationalError(
+                f"Pool de conexiones agotado ({self.max_size}) tras {self.timeout} s de espera."
+            )
+        try:
+            while True:
+                with self._lock:
+                    if not self._libres:
+                        break
+                    conexion, creada_en, devuelta_en = self._libres.pop()
+                if self._sana(conexion, creada_en, devuelta_en):
+                    self._contadores["reutilizadas"] += 1
+                    return conexion
+                self._descartar(conexion)
+
+            conexion = conectar()
+            self._creadas[id(conexion)] = time.monotonic()
+            self._contadores["nuevas"] += 1
+            return conexion
+        except BaseException:
+            self._cupos.release()
+            raise
+
+    def _sana(self, conexion, creada_en, devuelta_en):
+        ahora = time.monotonic()
+        if conexion.closed or ahora - creada_en > self.max_lifetime or ahora - devuelta_en > self.max_idle:
+            return False
+        if ahora - devuelta_en > self.check_after:
+            try:
+                with conexion.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except Exception:
+                return False
+        return True
+
+    def devolver(self, conexion):
+        try:
+            estado = conexion.get_transaction_status() if not conexion.closed else None
+            if estado in (extensions.TRANSACTION_STATUS_INTRANS, extensions.TRANSACTION_STATUS_INERROR):
+                conexion.rollback()
+                estado = conexion.get_transaction_status()
+            if estado != extensions.TRANSACTION_STATUS_IDLE:
+                self._descartar(conexion)
+                return
+            creada_en = self._creadas.get(id(conexion), time.monotonic())
+            with self._lock:
+                self._libres.append((conexion, creada_en, time.monotonic()))
+        except Exception:
+            self._descartar(conexion)
+        finally:
+            self._cupos.release()
+
+    def _descartar(self, conexion):
+        self._contadores["descartadas"] += 1
+        self._creadas.pop(id(conexion), None)
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._lock:
+            libres = len(self._libres)
+        return dict(self._contadores, abiertas=len(self._creadas), libres=libres, max=self.max_size)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_para(alias, opciones):
+    """Un pool por alias y proceso (tras un fork no se comparten sockets)."""
+    clave = (alias, os.getpid())
+    pool = _pools.get(clave)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(clave)
+            if pool is None:
+                pool = _pools[clave] = PoolConexiones(**{k.lower(): v for k, v in opciones.items()})
+    return pool
+
+
+def stats_pools():
+    pid = os.getpid()
+    return {alias: pool.stats() for (alias, p), pool in list(_pools.items()) if p == pid}
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    @property
+    def pool(self):
+        return pool_para(self.alias, self.settings_dict.get("POOL", {}))
+
+    def get_new_connection(self, conn_params):
+        return self.pool.obtener(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            self.pool.devolver(self.connection)
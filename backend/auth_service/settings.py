@@ -42,6 +42,75 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# --- 🪶 Perfil de arranque (APP_PROFILE) ---
+# full: stack completo en todas las rutas (por defecto)
+# api:  sesiones, CSRF, mensajes y X-Frame-Options solo bajo /admin/; /api/
+#       (JWT sin estado) pasa por una cadena mínima y se omite staticfiles
+#       (collectstatic se ejecuta con el perfil full).
+# Comparativa: `python manage.py bench_middleware`
+APP_PROFILE = os.getenv("APP_PROFILE", "full")
+if APP_PROFILE not in ("full", "api"):
+    raise ValueError(f"APP_PROFILE debe ser 'full' o 'api', no {APP_PROFILE!r}")
+
+ADMIN_URL_PREFIX = "/admin/"
+ADMIN_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+if APP_PROFILE == "api":
+    INSTALLED_APPS.remove("django.contrib.staticfiles")
+    MIDDLEWARE = [
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "auth_service.middleware.SoloAdminMiddleware",
+    ]
+    # El admin sigue teniendo sesiones/autenticación/mensajes, dentro de SoloAdminMiddleware
+    SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
+# --- 📈 Métricas Prometheus (GET /metrics, ver users/metrics.py) ---
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# /metrics exige la cabecera X-Metrics-Key con este valor; sin clave responde
+# 404 (el servicio está expuesto a internet), salvo con DEBUG
+METRICS_API_KEY = os.getenv("METRICS_API_KEY", "")
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "users.metrics.MetricasMiddleware")
+
+# --- 🧮 Presupuesto de SQL por ruta (ver users/sql_budget.py) ---
+# off | log (aviso en el log) | raise (error: desarrollo y CI)
+SQL_BUDGET_MODE = os.getenv("SQL_BUDGET_MODE", "log" if DEBUG else "off")
+# Máximo de consultas por request según el nombre de la URL (sin BEGIN/COMMIT
+# ni recargas periódicas de cachés). Los listados no dependen de page_size.
+SQL_BUDGETS = {
+    "register": 2,                  # INSERT usuario + INSERT perfil
+    "login": 2,                     # SELECT usuario + INSERT OutstandingToken
+    "token_obtain_pair": 2,
+    "token_refresh": 1,             # solo si el Bloom da positivo
+    "logout": 3,
+    "google-login": 0,
+    "google-callback": 3,
+    "jwks": 0,
+    "introspect-batch": 2,
+    "api-root": 0,
+    "users-list": 2,                # página (+ estimación con ?total=1)
+    "POST users-list": 2,
+    "users-detail": 2,              # versión + fila si el If-None-Match no coincide
+    "PUT users-detail": 4,
+    "PATCH users-detail": 4,
+    "DELETE users-detail": 9,       # fila + perfiles (tienen señales) + borrado en cascada
+    "users-me": 1,
+    "users-export": 0,              # las filas se leen al transmitir, fuera de la vista
+    # users-importar: 4 por lote de USERS_IMPORT_BATCH_SIZE filas, sin tope fijo
+    "healthz": 0,
+    "readyz": 0,
+    "metrics": 0,
+}
+if SQL_BUDGET_MODE != "off":
+    MIDDLEWARE.insert(1 if METRICS_ENABLED else 0, "users.sql_budget.SQLBudgetMiddleware")
+
 ROOT_URLCONF = "auth_service.urls"
 
 # --- 🎨 Templates ---
@@ -67,22 +136,69 @@ WSGI_APPLICATION = "auth_service.wsgi.application"
 DB_SCHEMA = os.getenv("DB_SCHEMA", "auth_service")
 
 
-DATABASES = {
-    "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"),
-        conn_max_age=600,
-        ssl_require=True,
-    )
+# 🏊 DB_POOL=1 → pool de conexiones en el proceso (auth_service.pooled_postgresql):
+# cada request toma una conexión abierta y la devuelve al terminar.
+# Sin pool se mantiene la conexión persistente por hilo (CONN_MAX_AGE).
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+DB_POOL_OPTIONS = {
+    "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+    "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", "5")),
+    "CHECK_AFTER": float(os.getenv("DB_POOL_CHECK_AFTER", "30")),
+    "MAX_IDLE": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    "MAX_LIFETIME": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
 }
 
-# 🔧 Configurar el esquema automáticamente (auth_service, etc.)
-DATABASES["default"]["OPTIONS"] = {
-    "options": f"-c search_path={DB_SCHEMA},public"
+
+def _config_db(url):
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=0 if DB_POOL else 600,
+        conn_health_checks=not DB_POOL,
+        ssl_require=True,
+    ) if url else {}
+    # 🔧 Configurar el esquema automáticamente (auth_service, etc.)
+    config["OPTIONS"] = {
+        "options": f"-c search_path={DB_SCHEMA},public"
+    }
+    if DB_POOL:
+        config["ENGINE"] = "auth_service.pooled_postgresql"
+        config["POOL"] = DB_POOL_OPTIONS
+    return config
+
+
+DATABASES = {
+    "default": _config_db(os.getenv("DATABASE_URL")),
 }
 
+# 📖 Réplica de lectura opcional (ver auth_service/db_router.py)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# Segundos que un cliente lee del primario después de escribir
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = _config_db(DATABASE_REPLICA_URL)
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_ROUTERS = ["auth_service.db_router.ReplicaRouter"]
+    MIDDLEWARE.insert(1, "auth_service.db_router.ReplicaStickinessMiddleware")
+
 # --- 🧑‍💻 Usuarios ---
 AUTH_USER_MODEL = "users.Usuario"
 
+# --- 🔐 Contraseñas ---
+# Argon2id por defecto; los hashes PBKDF2 existentes se verifican y se
+# actualizan a Argon2id en el siguiente login correcto.
+PASSWORD_HASHERS = [
+    "users.hashing.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+
+# Pool de procesos para hashear/verificar fuera del worker (0 = en línea)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "5"))
+
 # --- 🌐 CORS ---
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -96,13 +212,32 @@ CORS_ALLOW_CREDENTIALS = True
 # --- 🔒 JWT + DRF ---
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Proxies delante del servicio (Render = 1): la IP del cliente es la que añade
+    # el último proxy a X-Forwarded-For, no lo que envíe el cliente. 0 = sin proxy
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "1")),
 }
 
+# 🛑 Límite de intentos de login/registro (formato "intentos/segundos")
+# Los contadores deben ser compartidos entre workers (users.E001 si no lo son)
+LOGIN_THROTTLE_CACHE = os.getenv("LOGIN_THROTTLE_CACHE", "default")
+LOGIN_THROTTLE_IP = os.getenv("LOGIN_THROTTLE_IP", "30/300")
+LOGIN_THROTTLE_EMAIL = os.getenv("LOGIN_THROTTLE_EMAIL", "10/300")
+LOGIN_THROTTLE_IP_EMAIL = os.getenv("LOGIN_THROTTLE_IP_EMAIL", "5/300")
+# Bloqueo progresivo: desde el fallo N, BASE * 2^(fallos - N) segundos (máx. MAX)
+LOGIN_LOCKOUT_THRESHOLD = int(os.getenv("LOGIN_LOCKOUT_THRESHOLD", "5"))
+LOGIN_LOCKOUT_BASE = int(os.getenv("LOGIN_LOCKOUT_BASE", "30"))
+LOGIN_LOCKOUT_MAX = int(os.getenv("LOGIN_LOCKOUT_MAX", "3600"))
+LOGIN_LOCKOUT_RESET = int(os.getenv("LOGIN_LOCKOUT_RESET", "86400"))
+
+# 🕒 ultimo_login en diferido: volcado cada N segundos (0 = escritura inmediata)
+LAST_SEEN_FLUSH_INTERVAL = float(os.getenv("LAST_SEEN_FLUSH_INTERVAL", "10"))
+LAST_SEEN_MAX_PENDING = int(os.getenv("LAST_SEEN_MAX_PENDING", "10000"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -113,8 +248,74 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers_jwt.CustomTokenRefreshSerializer",
 }
 
+# 🚫 Índice en memoria de tokens revocados (Bloom + LRU) delante de token_blacklist
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "200000"))
+REVOCATION_BLOOM_FP_RATE = float(os.getenv("REVOCATION_BLOOM_FP_RATE", "0.001"))
+REVOCATION_LRU_SIZE = int(os.getenv("REVOCATION_LRU_SIZE", "10000"))
+REVOCATION_SYNC_INTERVAL = int(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+# Ventana que se relee en cada sincronización (commits que llegan fuera de orden)
+REVOCATION_SYNC_OVERLAP = int(os.getenv("REVOCATION_SYNC_OVERLAP", "60"))
+REVOCATION_STATS_HOOK = os.getenv("REVOCATION_STATS_HOOK", "")
+
+# 🔑 Firma asimétrica (RS256/EdDSA) con claves rotables identificadas por `kid`.
+# Las claves se crean con `manage.py rotate_signing_keys` y se publican en
+# /api/auth/.well-known/jwks.json. Mientras no exista ninguna se firma con HS256.
+JWT_SIGNING_ALGORITHM = os.getenv("JWT_SIGNING_ALGORITHM", "RS256")
+JWT_KEYRING_REFRESH = int(os.getenv("JWT_KEYRING_REFRESH", "60"))
+# Mínimo entre recargas forzadas por un `kid` desconocido
+JWT_KEYRING_FORCED_REFRESH = int(os.getenv("JWT_KEYRING_FORCED_REFRESH", "5"))
+JWT_ACCEPT_LEGACY_HS256 = os.getenv("JWT_ACCEPT_LEGACY_HS256", "1") == "1"
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "300"))
+
+# 🔎 Introspección por lotes para el API gateway
+INTROSPECT_API_KEY = os.getenv("INTROSPECT_API_KEY", "")
+INTROSPECT_BATCH_MAX = int(os.getenv("INTROSPECT_BATCH_MAX", "100"))
+
+# ⚡ Autenticación por claims: construye request.user desde el token sin SELECT.
+# Si el token no trae los claims, o la caché no es compartida entre workers (la
+# marca de usuario desactivado no llegaría a los demás), se usa una caché por
+# usuario con TTL corto: como mucho una consulta por usuario y TTL.
+AUTH_CLAIMS_ONLY = os.getenv("AUTH_CLAIMS_ONLY", "1") == "1"
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+# 🗃️ Representación serializada de cada usuario (GET /api/users/{id}/), por versión
+USER_REPR_CACHE_TTL = int(os.getenv("USER_REPR_CACHE_TTL", "300"))
+
+# --- 🧠 Caché (local por defecto, Redis si se define REDIS_URL) ---
+# LocMem vive en cada proceso: con varios workers de gunicorn (WEB_CONCURRENCY,
+# la misma variable que lee gunicorn) lo que depende de una caché compartida
+# necesita REDIS_URL (ver users/cache_compartida.py)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "auth-service",
+        }
+    }
+
+# 🔎 Búsqueda de usuarios (?q=): máximo de resultados por consulta
+USER_SEARCH_LIMIT = int(os.getenv("USER_SEARCH_LIMIT", "25"))
+USER_SEARCH_MAX_LIMIT = int(os.getenv("USER_SEARCH_MAX_LIMIT", "100"))
+
+# 📄 Listado de usuarios paginado por cursor (?page_size= acotado al máximo)
+USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "50"))
+USERS_PAGE_SIZE_MAX = int(os.getenv("USERS_PAGE_SIZE_MAX", "200"))
+# 📤 Exportación en streaming: filas leídas del cursor por vuelta
+USERS_EXPORT_CHUNK_SIZE = int(os.getenv("USERS_EXPORT_CHUNK_SIZE", "2000"))
+# 📥 Importación masiva: filas por lote (una consulta + un bulk_create por lote)
+USERS_IMPORT_BATCH_SIZE = int(os.getenv("USERS_IMPORT_BATCH_SIZE", "1000"))
+
 # --- 🌍 Internacionalización ---
 LANGUAGE_CODE = "es"
 TIME_ZONE = "UTC"
@@ -131,7 +332,36 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
 GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "")
 
+# Cliente HTTP hacia Google: timeouts (s), reintentos y circuit breaker
+GOOGLE_HTTP_CONNECT_TIMEOUT = float(os.getenv("GOOGLE_HTTP_CONNECT_TIMEOUT", "3"))
+GOOGLE_HTTP_READ_TIMEOUT = float(os.getenv("GOOGLE_HTTP_READ_TIMEOUT", "5"))
+GOOGLE_HTTP_RETRIES = int(os.getenv("GOOGLE_HTTP_RETRIES", "2"))
+GOOGLE_HTTP_BACKOFF = float(os.getenv("GOOGLE_HTTP_BACKOFF", "0.2"))
+GOOGLE_HTTP_POOL_SIZE = int(os.getenv("GOOGLE_HTTP_POOL_SIZE", "10"))
+GOOGLE_CIRCUIT_THRESHOLD = int(os.getenv("GOOGLE_CIRCUIT_THRESHOLD", "5"))
+GOOGLE_CIRCUIT_COOLDOWN = int(os.getenv("GOOGLE_CIRCUIT_COOLDOWN", "30"))
+
+# id_token verificado localmente con certificados cacheados (refresh-ahead al 80% del TTL)
+GOOGLE_CERTS_REFRESH_AHEAD = float(os.getenv("GOOGLE_CERTS_REFRESH_AHEAD", "0.8"))
+GOOGLE_CERTS_DEFAULT_TTL = int(os.getenv("GOOGLE_CERTS_DEFAULT_TTL", "3600"))
+GOOGLE_USERINFO_FALLBACK = os.getenv("GOOGLE_USERINFO_FALLBACK", "1") == "1"
+
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+# --- 📬 Validación de dominios de email (registro) ---
+VALIDAR_DOMINIO_EMAIL = os.getenv("VALIDAR_DOMINIO_EMAIL", "0") == "1"
+MX_LOOKUP_TIMEOUT = float(os.getenv("MX_LOOKUP_TIMEOUT", "1.5"))
+MX_CACHE_TTL_MIN = int(os.getenv("MX_CACHE_TTL_MIN", "300"))
+MX_CACHE_TTL_MAX = int(os.getenv("MX_CACHE_TTL_MAX", "86400"))
+MX_CACHE_NEGATIVE_TTL = int(os.getenv("MX_CACHE_NEGATIVE_TTL", "900"))
+MX_CACHE_MAX_ENTRIES = int(os.getenv("MX_CACHE_MAX_ENTRIES", "10000"))
+DISPOSABLE_DOMAINS_FILE = os.getenv("DISPOSABLE_DOMAINS_FILE", "")
+DISPOSABLE_DOMAINS_RELOAD = int(os.getenv("DISPOSABLE_DOMAINS_RELOAD", "60"))
+MX_WARMUP_DOMAINS = [
+    d.strip() for d in os.getenv(
+        "MX_WARMUP_DOMAINS", "gmail.com,outlook.com,hotmail.com,yahoo.com,icloud.com"
+    ).split(",") if d.strip()
+]
+
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
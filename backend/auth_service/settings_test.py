@@ -0,0 +1,29 @@
+# Ajustes de los tests: `cd backend && python manage.py test --settings=auth_service.settings_test`
+# SQLite salvo que se defina DATABASE_URL (p. ej. para la búsqueda con pg_trgm).
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import SIMPLE_JWT
+
+SECRET_KEY = "tests-clave-hs256-de-al-menos-32-bytes"
+SIMPLE_JWT = {**SIMPLE_JWT, "SIGNING_KEY": SECRET_KEY}
+
+if not os.getenv("DATABASE_URL"):
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+# Segunda base independiente para los tests del router de réplica
+# (auth_service/db_router.py); el router solo se activa en esos tests
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "TEST": {"NAME": None if DATABASES["default"]["ENGINE"].endswith("sqlite3") else "test_auth_replica"},
+}
+
+# Hash rápido y en línea (sin pool de procesos)
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+PASSWORD_HASH_WORKERS = 0
+
+# Un worker con caché local: la misma que se usa en desarrollo sin Redis
+WEB_CONCURRENCY = 1
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests"}}
+
+LAST_SEEN_FLUSH_INTERVAL = 0
+VALIDAR_DOMINIO_EMAIL = False
@@ -1,7 +1,18 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from django.conf import settings
+
+from users.views_health import healthz, readyz
+
 urlpatterns = [
     path("admin/", admin.site.urls),          # opcional pero útil
     path("api/", include("users.urls")),      # expone /api/...
+    path("healthz", healthz, name="healthz"),  # liveness (sin BD)
+    path("readyz", readyz, name="readyz"),    # readiness (tras el calentamiento)
 ]
+
+if settings.METRICS_ENABLED:
+    from users.metrics import metrics_view
+
+    urlpatterns.append(path("metrics", metrics_view, name="metrics"))
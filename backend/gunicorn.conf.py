@@ -0,0 +1,27 @@
+# Configuración de gunicorn (se carga sola al arrancar desde backend/)
+import os
+import shutil
+
+# 📈 Métricas agregadas entre workers (users/metrics.py): debe fijarse antes de
+# que los workers importen prometheus_client
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/auth_service_metrics")
+
+
+def on_starting(server):
+    # Valores de un arranque anterior no deben sumarse a los nuevos
+    directorio = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.makedirs(directorio, exist_ok=True)
+
+
+def post_worker_init(worker):
+    # 🔥 Calentar el worker antes de que acepte conexiones (users/warmup.py)
+    from users.warmup import calentamiento
+
+    calentamiento.ejecutar()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    name = "users"
+
+    def ready(self):
+        # 🔔 Registrar señales (invalidación de cachés de usuario)
+        from . import signals  # noqa: F401
+
+        # ✅ Comprobaciones de configuración (cachés compartidas entre workers)
+        from . import checks  # noqa: F401
+
+        # 🔑 Firma asimétrica con llavero de claves (kid) para todos los JWT
+        from .jwt_keys import instalar_token_backend
+        instalar_token_backend()
+
+        # 📬 Pre-resolver MX de dominios populares (en un hilo, no bloquea el arranque)
+        from django.conf import settings
+        if settings.VALIDAR_DOMINIO_EMAIL:
+            from .email_domains import precalentar_en_fondo
+            precalentar_en_fondo()
@@ -2,8 +2,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RefreshToken
 from .serializers import UsuarioSerializer, LoginSerializer
+from .token_service import emitir_tokens
 from rest_framework.permissions import IsAuthenticated
 
 @api_view(["POST"])
@@ -12,12 +13,8 @@ def register_view(request):
     serializer = UsuarioSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
         return Response({
-            "tokens": {
-                "access": str(refresh.access_token),
-                "refresh": str(refresh),
-            },
+            "tokens": emitir_tokens(user),
             "user": UsuarioSerializer(user).data
         }, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -28,12 +25,8 @@ def login_view(request):
     serializer = LoginSerializer(data=request.data, context={"request": request})
     serializer.is_valid(raise_exception=True)
     user = serializer.validated_data["user"]
-    refresh = RefreshToken.for_user(user)
     return Response({
-        "tokens": {
-            "access": str(refresh.access_token),
-            "refresh": str(refresh),
-        },
+        "tokens": emitir_tokens(user),
         "user": UsuarioSerializer(user).data
     })
 
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache_compartida import es_compartida
+# Claims que LoginView / CustomTokenObtainPairSerializer ya incluyen en el token
+from .models import CLAIMS_USUARIO, Usuario
+
+# Campos que se guardan en la caché por usuario (fallback sin claims)
+CAMPOS_CACHE = CLAIMS_USUARIO + ("is_staff", "is_superuser")
+
+
+def cache_key_usuario(user_id):
+    return f"auth:usuario:{user_id}"
+
+
+def cache_key_inactivo(user_id):
+    return f"auth:inactivo:{user_id}"
+
+
+def cache_key_claims(user_id):
+    """Instante del último cambio de claims (rol, activo…): tokens anteriores no valen."""
+    return f"auth:claims:{user_id}"
+
+
+class UsuarioToken(TokenUser):
+    """
+    Usuario liviano construido desde los claims verificados del token
+    (o desde la caché por usuario). No tiene representación en la BD.
+    """
+
+    def __init__(self, token, datos):
+        super().__init__(token)
+        self.id = str(token[api_settings.USER_ID_CLAIM])
+        for campo, valor in datos.items():
+            setattr(self, campo, valor)
+
+    def __str__(self):
+        return f"{self.email} ({self.rol})"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Igual que JWTAuthentication, pero sin el SELECT a `usuarios` por request:
+    ✅ Si el token trae los claims del usuario → se usan directamente
+    ✅ Si no los trae → caché por usuario con TTL corto
+    ✅ Solo en el último caso se consulta la BD (una vez por TTL)
+    La caché se invalida desde `users.signals` al guardar/borrar un Usuario.
+    Si los claims cambiaron después de emitir el token (p. ej. se le quitó el
+    rol admin), el token trae claims viejos y también se usa la caché por
+    usuario hasta que caduque (los access renovados heredan el iat del refresh).
+    Los claims solo bastan si la marca de desactivado llega a todos los
+    workers (caché compartida); con LocMem y varios workers se usa siempre la
+    caché por usuario, así un usuario desactivado deja de entrar en
+    AUTH_USER_CACHE_TTL segundos como máximo.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("El token no contiene identificación de usuario.")
+
+        key_usuario = cache_key_usuario(user_id)
+        key_inactivo = cache_key_inactivo(user_id)
+        key_claims = cache_key_claims(user_id)
+        cacheado = cache.get_many([key_usuario, key_inactivo, key_claims])
+
+        # 🚫 Desactivado/eliminado después de emitir el token
+        if cacheado.get(key_inactivo):
+            raise AuthenticationFailed("Usuario inactivo.", code="user_inactive")
+
+        datos = cacheado.get(key_usuario)
+        cambio = cacheado.get(key_claims)
+        claims_vigentes = cambio is None or validated_token.get("iat", 0) > cambio
+        if datos is None and settings.AUTH_CLAIMS_ONLY and claims_vigentes and es_compartida():
+            if all(claim in validated_token for claim in CLAIMS_USUARIO):
+                datos = {claim: validated_token[claim] for claim in CLAIMS_USUARIO}
+
+        if datos is None:
+            datos = (
+                Usuario.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*CAMPOS_CACHE)
+                .first()
+            )
+            if datos is None:
+                raise AuthenticationFailed("Usuario no encontrado.", code="user_not_found")
+            cache.set(key_usuario, datos, timeout=settings.AUTH_USER_CACHE_TTL)
+
+        if not datos.get("activo", True):
+            raise AuthenticationFailed("Usuario inactivo.", code="user_inactive")
+
+        return UsuarioToken(validated_token, datos)
@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+logger = logging.getLogger(__name__)
+
+
+def _invertir(dominio):
+    """'x.mailinator.com' → 'com.mailinator.x' (los sufijos pasan a ser prefijos)."""
+    return ".".join(reversed(dominio.strip().lower().rstrip(".").split(".")))
+
+
+class _Entradas:
+    """Vista indexable sobre el blob ordenado (para usar `bisect` sin crear listas)."""
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1] - 1]
+
+
+class SuffixIndex:
+    """
+    Índice compacto de dominios bloqueados con coincidencia de subdominios.
+    Los dominios se guardan invertidos y ordenados en un único `bytes`
+    (separados por "\\n") más un `array` de offsets: ~tamaño del texto + 4 B
+    por entrada, sin un objeto str por dominio.
+    Búsqueda: un bisect por cada etiqueta del dominio consultado → O(etiquetas · log n).
+    """
+
+    def __init__(self, dominios):
+        invertidos = sorted({_invertir(d).encode() for d in dominios if d and d.strip()})
+        offsets = array("I", accumulate((len(d) + 1 for d in invertidos), initial=0))
+        self._entradas = _Entradas(b"\n".join(invertidos) + b"\n", offsets)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _existe(self, objetivo):
+        i = bisect_left(self._entradas, objetivo)
+        return i < len(self._entradas) and self._entradas[i] == objetivo
+
+    def __contains__(self, dominio):
+        invertido = _invertir(dominio).encode()
+        # "com", "com.mailinator", "com.mailinator.x" …
+        fin = invertido.find(b".")
+        while fin != -1:
+            if self._existe(invertido[:fin]):
+                return True
+            fin = invertido.find(b".", fin + 1)
+        return self._existe(invertido)
+
+    def nbytes(self):
+        e = self._entradas
+        return len(e.blob) + e.offsets.itemsize * len(e.offsets)
+
+
+def leer_lista(ruta):
+    """Un dominio por línea; ignora líneas vacías y comentarios (#)."""
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.split("#", 1)[0].strip()
+            if linea:
+                yield linea
+
+
+class DisposableBlocklist:
+    """
+    Lista de dominios desechables: los incorporados + el archivo
+    DISPOSABLE_DOMAINS_FILE (listas comunitarias de 100k+ dominios).
+    ✅ Coincide también subdominios (x.mailinator.com)
+    ✅ Recarga en caliente: si cambia el mtime del archivo se construye un
+       índice nuevo en segundo plano y se sustituye de forma atómica
+    """
+
+    def __init__(self, base, ruta, intervalo):
+        self.base = set(base)
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._indice = SuffixIndex(self.base)
+        self._mtime = None
+        self._revisado_en = 0.0
+        self._recargando = False
+        if ruta:
+            self.recargar()
+
+    def recargar(self):
+        """Construye el índice completo y lo publica con una sola asignación."""
+        try:
+            mtime = os.stat(self.ruta).st_mtime
+            indice = SuffixIndex(self.base.union(leer_lista(self.ruta)))
+        except OSError:
+            logger.warning("No se pudo leer la lista de dominios %s", self.ruta, exc_info=True)
+            return
+        self._indice = indice
+        self._mtime = mtime
+        logger.info("Lista de dominios desechables cargada: %d entradas", len(indice))
+
+    def _recargar_en_fondo(self):
+        try:
+            self.recargar()
+        finally:
+            self._recargando = False
+
+    def _revisar_cambios(self):
+        ahora = time.monotonic()
+        if not self.ruta or ahora - self._revisado_en < self.intervalo:
+            return
+        self._revisado_en = ahora
+        try:
+            mtime = os.stat(self.ruta).st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            with self._lock:
+                lanzar = not self._recargando
+                self._recargando = True
+            if lanzar:
+                threading.Thread(target=self._recargar_en_fondo, daemon=True).start()
+
+    def bloqueado(self, dominio):
+        self._revisar_cambios()
+        return dominio in self._indice
@@ -0,0 +1,161 @@
+import csv
+import json
+import logging
+
+from django.db import transaction
+
+from . import hashing
+from .models import Usuario, PerfilEstudiante, PerfilOrientador
+from .serializers import FilaImportSerializer
+
+logger = logging.getLogger(__name__)
+
+PERFILES = {
+    "estudiante": (PerfilEstudiante, (
+        "intereses", "habilidades", "carrera_interes", "grado_academico",
+        "institucion_id", "actualmente_estudiando",
+    )),
+    "orientador": (PerfilOrientador, (
+        "especialidad", "experiencia", "certificaciones", "institucion_id",
+    )),
+}
+CAMPOS_PERFIL = {campo for _, campos in PERFILES.values() for campo in campos}
+
+
+def detectar_formato(nombre, formato=None):
+    formato = formato or ("ndjson" if nombre.lower().endswith((".ndjson", ".jsonl")) else "csv")
+    if formato not in ("csv", "ndjson"):
+        raise ValueError("Formato no soportado. Usa: csv, ndjson")
+    return formato
+
+
+def leer_filas(archivo, formato):
+    """
+    Recorre un archivo de texto fila a fila → (número de línea, dict | None, error | None).
+    Las celdas vacías del CSV se tratan como campos ausentes.
+    """
+    if formato == "csv":
+        lector = csv.DictReader(archivo)
+        for fila in lector:
+            yield lector.line_num, {k.strip(): v for k, v in fila.items() if k and v not in ("", None)}, None
+        return
+    for numero, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            fila = json.loads(linea)
+        except json.JSONDecodeError as e:
+            yield numero, None, f"JSON no válido: {e.msg}"
+            continue
+        if not isinstance(fila, dict):
+            yield numero, None, "Cada línea debe ser un objeto JSON."
+            continue
+        yield numero, fila, None
+
+
+class ResultadoImport:
+    """Resumen de la importación + informe de errores por fila."""
+
+    def __init__(self):
+        self.creados = 0
+        self.existentes = 0
+        self.errores = []
+        # El archivo no se pudo leer hasta el final (codificación no válida)
+        self.interrumpido = False
+
+    def error(self, fila, email, errores):
+        self.errores.append({"fila": fila, "email": email, "errores": errores})
+
+    def resumen(self):
+        resumen = {"creados": self.creados, "existentes": self.existentes, "errores": self.errores}
+        if self.interrumpido:
+            resumen["interrumpido"] = True
+        return resumen
+
+
+def _hasta_fallo_de_codificacion(filas, resultado):
+    """
+    Corta la lectura en el primer byte que no es UTF-8 (TextIOWrapper lanza
+    UnicodeDecodeError al iterar) y lo registra como error de la fila siguiente.
+    """
+    numero = 0
+    try:
+        for numero, fila, error in filas:
+            yield numero, fila, error
+    except UnicodeDecodeError:
+        resultado.interrumpido = True
+        resultado.error(
+            numero + 1, None, f"El archivo no es UTF-8 válido a partir de la fila {numero + 1}; no se leyó el resto.",
+        )
+
+
+def _insertar_lote(lote, pool, resultado):
+    emails = [datos["email"] for _, datos in lote]
+    existentes = set(Usuario.objects.filter(email__in=emails).values_list("email", flat=True))
+    nuevos = [datos for _, datos in lote if datos["email"] not in existentes]
+    resultado.existentes += len(lote) - len(nuevos)
+    if not nuevos:
+        return
+
+    hashes = hashing.hashear_lote([datos.pop("password", None) for datos in nuevos], pool=pool)
+    usuarios, perfiles = [], []
+    for datos, encoded in zip(nuevos, hashes):
+        extra = {campo: datos.pop(campo) for campo in list(datos) if campo in CAMPOS_PERFIL}
+        usuario = Usuario(password=encoded, **datos)
+        usuarios.append(usuario)
+        if usuario.rol in PERFILES:
+            modelo, campos = PERFILES[usuario.rol]
+            perfiles.append(modelo(usuario=usuario, **{c: v for c, v in extra.items() if c in campos}))
+
+    with transaction.atomic():
+        # ON CONFLICT DO NOTHING: otra importación pudo crear el mismo email entre
+        # la consulta de existentes y el INSERT; se comprueba qué filas entraron
+        Usuario.objects.bulk_create(usuarios, batch_size=len(usuarios), ignore_conflicts=True)
+        insertados = set(
+            Usuario.objects.filter(id__in=[u.id for u in usuarios]).values_list("id", flat=True)
+        )
+        for modelo, _ in PERFILES.values():
+            filas = [p for p in perfiles if isinstance(p, modelo) and p.usuario_id in insertados]
+            if filas:
+                modelo.objects.bulk_create(filas, batch_size=len(filas))
+
+    resultado.creados += len(insertados)
+    resultado.existentes += len(usuarios) - len(insertados)
+
+
+def importar_usuarios(filas, tamano_lote, pool=hashing.pool):
+    """
+    Valida las filas en una sola pasada y las inserta por lotes de `tamano_lote`:
+    una consulta de existentes, hash en el pool de procesos y `bulk_create` de
+    usuarios y perfiles. Los emails ya registrados se cuentan como existentes,
+    así que re-ejecutar el mismo archivo es seguro. Si el archivo deja de ser
+    UTF-8 válido se importa lo leído hasta ahí y el resultado queda `interrumpido`.
+    """
+    resultado = ResultadoImport()
+    vistos = set()
+    lote = []
+    for numero, fila, error in _hasta_fallo_de_codificacion(filas, resultado):
+        if error:
+            resultado.error(numero, None, error)
+            continue
+        serializer = FilaImportSerializer(data=fila)
+        if not serializer.is_valid():
+            resultado.error(numero, fila.get("email"), serializer.errors)
+            continue
+        datos = dict(serializer.validated_data)
+        if datos["email"] in vistos:
+            resultado.error(numero, datos["email"], "Email repetido en el archivo.")
+            continue
+        vistos.add(datos["email"])
+        lote.append((numero, datos))
+        if len(lote) >= tamano_lote:
+            _insertar_lote(lote, pool, resultado)
+            lote = []
+    if lote:
+        _insertar_lote(lote, pool, resultado)
+
+    logger.info(
+        "Importación: %d creados, %d existentes, %d errores",
+        resultado.creados, resultado.existentes, len(resultado.errores),
+    )
+    return resultado
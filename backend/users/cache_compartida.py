@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def es_compartida(alias="default"):
+    """
+    True si todos los workers ven los mismos valores de la caché `alias`.
+    LocMem vive en cada proceso: solo equivale a compartida con un único worker.
+    """
+    backend = caches[alias]
+    if isinstance(backend, DummyCache):
+        return False
+    return settings.WEB_CONCURRENCY <= 1 or not isinstance(backend, LocMemCache)
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+from .cache_compartida import es_compartida
+
+
+@register()
+def cache_throttling_compartida(app_configs, **kwargs):
+    # Con contadores por worker el límite real sería WEB_CONCURRENCY × el configurado
+    if es_compartida(settings.LOGIN_THROTTLE_CACHE):
+        return []
+    return [Error(
+        f"La caché {settings.LOGIN_THROTTLE_CACHE!r} de LOGIN_THROTTLE_CACHE no es compartida "
+        f"entre los {settings.WEB_CONCURRENCY} workers: cada uno contaría los intentos por separado.",
+        hint="Define REDIS_URL (o apunta LOGIN_THROTTLE_CACHE a una caché compartida).",
+        id="users.E001",
+    )]
+
+
+@register()
+def cache_representaciones_compartida(app_configs, **kwargs):
+    if es_compartida():
+        return []
+    return [Warning(
+        f"La caché por defecto no es compartida entre los {settings.WEB_CONCURRENCY} workers: "
+        "la caché de representaciones de usuario (users.user_cache) queda desactivada.",
+        hint="Define REDIS_URL para servir GET /api/users/{id}/ desde la caché.",
+        id="users.W001",
+    )]
+
+
+@register()
+def replica_con_cache_compartida(app_configs, **kwargs):
+    # La marca de read-your-writes vive en la caché por defecto
+    if not getattr(settings, "DATABASE_REPLICA_URL", None) or es_compartida():
+        return []
+    return [Warning(
+        f"DATABASE_REPLICA_URL está definida pero la caché por defecto no es compartida entre los "
+        f"{settings.WEB_CONCURRENCY} workers: todas las lecturas irán al primario.",
+        hint="Define REDIS_URL para poder leer de la réplica sin perder read-your-writes.",
+        id="users.W002",
+    )]
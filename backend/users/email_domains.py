@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from django.conf import settings
+
+from .metrics import DNS_SEGUNDOS
+
+logger = logging.getLogger(__name__)
+
+
+class MXVerdictCache:
+    """
+    Veredicto "¿el dominio tiene MX?" cacheado por proceso.
+    ✅ TTL positivo = TTL del registro MX (acotado a [ttl_min, ttl_max])
+    ✅ Caché negativa para NXDOMAIN / sin MX (TTL del SOA o `ttl_negativo`)
+    ✅ Plazo máximo por consulta (`lifetime` del resolver)
+    ✅ Consultas concurrentes del mismo dominio se agrupan en una sola
+    Un timeout no es evidencia de un dominio inválido: se acepta y no se cachea.
+    """
+
+    def __init__(self, plazo, ttl_min, ttl_max, ttl_negativo, max_entradas):
+        self.plazo = plazo
+        self.ttl_min = ttl_min
+        self.ttl_max = ttl_max
+        self.ttl_negativo = ttl_negativo
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._veredictos = OrderedDict()  # dominio -> (valido, expira_en)
+        self._en_curso = {}               # dominio -> Future
+
+    def _acotar(self, ttl):
+        return max(self.ttl_min, min(self.ttl_max, ttl))
+
+    def _resolver(self, dominio):
+        """Devuelve (valido, ttl) o (True, None) si no hubo respuesta a tiempo."""
+        # dnspython se importa al primer uso: solo lo necesita el registro
+        import dns.exception
+        import dns.resolver
+
+        resolver = dns.resolver.Resolver()
+        resolver.lifetime = self.plazo
+        resolver.timeout = self.plazo
+        try:
+            respuesta = resolver.resolve(dominio, "MX")
+            return True, self._acotar(respuesta.rrset.ttl)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            return False, self._ttl_soa(e)
+        except (dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+            logger.warning("Consulta MX sin respuesta para %s: %s", dominio, e)
+            return True, None
+
+    def _ttl_soa(self, error):
+        # RFC 2308: la caché negativa dura min(TTL del SOA, SOA.minimum)
+        import dns.rdatatype
+        import dns.resolver
+
+        try:
+            if isinstance(error, dns.resolver.NXDOMAIN):
+                respuesta = error.response(error.qnames()[0])
+            else:
+                respuesta = error.kwargs["response"]
+            for rrset in respuesta.authority:
+                if rrset.rdtype == dns.rdatatype.SOA:
+                    return self._acotar(min(rrset.ttl, rrset[0].minimum))
+        except Exception:
+            pass
+        return self.ttl_negativo
+
+    def tiene_mx(self, dominio):
+        dominio = dominio.lower().rstrip(".")
+        ahora = time.monotonic()
+        with self._lock:
+            cacheado = self._veredictos.get(dominio)
+            if cacheado and cacheado[1] > ahora:
+                return cacheado[0]
+            futuro = self._en_curso.get(dominio)
+            propietario = futuro is None
+            if propietario:
+                futuro = self._en_curso[dominio] = Future()
+
+        if not propietario:
+            try:
+                return futuro.result(timeout=self.plazo)
+            except FuturesTimeoutError:
+                return True
+
+        inicio = time.perf_counter()
+        try:
+            valido, ttl = self._resolver(dominio)
+            resultado = "timeout" if ttl is None else ("valid" if valido else "invalid")
+        except Exception as e:
+            logger.warning("Error validando MX de %s: %s", dominio, e)
+            valido, ttl, resultado = False, None, "error"
+        DNS_SEGUNDOS.labels(resultado).observe(time.perf_counter() - inicio)
+        with self._lock:
+            if ttl is not None:
+                self._veredictos[dominio] = (valido, time.monotonic() + ttl)
+                self._veredictos.move_to_end(dominio)
+                while len(self._veredictos) > self.max_entradas:
+                    self._veredictos.popitem(last=False)
+            del self._en_curso[dominio]
+        futuro.set_result(valido)
+        return valido
+
+    def precalentar(self, dominios):
+        for dominio in dominios:
+            self.tiene_mx(dominio)
+
+
+mx_cache = MXVerdictCache(
+    plazo=settings.MX_LOOKUP_TIMEOUT,
+    ttl_min=settings.MX_CACHE_TTL_MIN,
+    ttl_max=settings.MX_CACHE_TTL_MAX,
+    ttl_negativo=settings.MX_CACHE_NEGATIVE_TTL,
+    max_entradas=settings.MX_CACHE_MAX_ENTRIES,
+)
+
+
+def precalentar_en_fondo():
+    """Resuelve en un hilo los dominios populares (MX_WARMUP_DOMAINS)."""
+    if settings.MX_WARMUP_DOMAINS:
+        threading.Thread(
+            target=mx_cache.precalentar, args=(settings.MX_WARMUP_DOMAINS,), daemon=True,
+        ).start()
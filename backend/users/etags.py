@@ -0,0 +1,65 @@
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class NoModificado(Exception):
+    """El cliente ya tiene la versión actual (If-None-Match coincide)."""
+
+    def __init__(self, etag):
+        super().__init__(etag)
+        self.etag = etag
+
+
+class PrecondicionFallida(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "El recurso cambió desde que lo leíste (If-Match no coincide)."
+    default_code = "precondition_failed"
+
+
+def etag_usuario(version, *versiones_perfil):
+    """
+    ETag fuerte de un usuario: su versión (y la del perfil si se incluye).
+    `ultimo_login` queda fuera a propósito: lo mantiene el servidor
+    (users.last_seen) sin subir la versión, así un login no invalida el
+    If-Match de quien está editando.
+    """
+    return '"' + "-".join(["u%d" % version, *("p%d" % v for v in versiones_perfil)]) + '"'
+
+
+def etag_lista(filas, *extra, con_perfil=False):
+    """ETag fuerte de una página: ids + versiones de sus filas y los enlaces."""
+    h = hashlib.sha256()
+    for fila in filas:
+        h.update(f"{fila.pk}:{fila.version};".encode())
+        if con_perfil and fila.perfil is not None:
+            h.update(f"p{fila.perfil.version};".encode())
+    for valor in extra:
+        h.update(f"{valor};".encode())
+    return '"l%s"' % h.hexdigest()[:32]
+
+
+def _sin_debil(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def coincide_if_none_match(request, etag):
+    """Comparación débil (RFC 9110 §13.1.2)."""
+    cabecera = request.headers.get("If-None-Match")
+    if not cabecera:
+        return False
+    etags = parse_etags(cabecera)
+    return etags == ["*"] or _sin_debil(etag) in {_sin_debil(e) for e in etags}
+
+
+def coincide_if_match(request, etag):
+    """Comparación fuerte (RFC 9110 §13.1.1): una ETag débil nunca coincide."""
+    etags = parse_etags(request.headers.get("If-Match", ""))
+    return etags == ["*"] or etag in etags
+
+
+def no_modificado(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,100 @@
+import logging
+import re
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+
+from .http_client import google_client
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+
+class GoogleCertsCache:
+    """
+    Certificados públicos de Google (kid → PEM) compartidos por el proceso.
+    ✅ TTL tomado del `Cache-Control: max-age` de la respuesta
+    ✅ Refresh-ahead: pasado `refresco_anticipado` del TTL se renuevan en un
+       hilo de fondo mientras se siguen usando los actuales
+    ✅ Solo se bloquea si no hay certificados o ya expiraron
+    """
+
+    def __init__(self, url, refresco_anticipado, ttl_por_defecto):
+        self.url = url
+        self.refresco_anticipado = refresco_anticipado
+        self.ttl_por_defecto = ttl_por_defecto
+        self._lock = threading.Lock()
+        self._certs = None
+        self._obtenidos_en = 0.0
+        self._ttl = 0
+        self._refrescando = False
+
+    def _descargar(self):
+        r = google_client.get(self.url, "google_certs")
+        r.raise_for_status()
+        match = re.search(r"max-age=(\d+)", r.headers.get("Cache-Control", ""))
+        ttl = int(match.group(1)) if match else self.ttl_por_defecto
+        with self._lock:
+            self._certs = r.json()
+            self._obtenidos_en = time.monotonic()
+            self._ttl = ttl
+
+    def _refrescar_en_fondo(self):
+        try:
+            self._descargar()
+        except Exception:
+            logger.warning("No se pudieron refrescar los certificados de Google", exc_info=True)
+        finally:
+            self._refrescando = False
+
+    def get(self, kid=None):
+        edad = time.monotonic() - self._obtenidos_en
+        if self._certs is None or edad >= self._ttl or (kid and kid not in self._certs):
+            self._descargar()
+        elif edad >= self._ttl * self.refresco_anticipado and not self._refrescando:
+            with self._lock:
+                lanzar = not self._refrescando
+                self._refrescando = True
+            if lanzar:
+                threading.Thread(target=self._refrescar_en_fondo, daemon=True).start()
+        return self._certs
+
+
+google_certs = GoogleCertsCache(
+    GOOGLE_CERTS_URL,
+    refresco_anticipado=settings.GOOGLE_CERTS_REFRESH_AHEAD,
+    ttl_por_defecto=settings.GOOGLE_CERTS_DEFAULT_TTL,
+)
+
+
+class IdTokenInvalido(Exception):
+    pass
+
+
+def verificar_id_token(id_token):
+    """
+    Verifica localmente el `id_token` devuelto en el intercambio del código
+    (firma, `aud` = nuestro client_id, emisor, expiración) y devuelve sus claims.
+    """
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        claims = google_jwt.decode(
+            id_token,
+            certs=google_certs.get(kid),
+            audience=settings.GOOGLE_CLIENT_ID,
+            clock_skew_in_seconds=10,
+        )
+    except (google_exceptions.GoogleAuthError, jwt.InvalidTokenError, ValueError) as e:
+        raise IdTokenInvalido(str(e)) from e
+
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise IdTokenInvalido("Emisor del id_token no válido.")
+    if not claims.get("email") or not claims.get("email_verified", False):
+        raise IdTokenInvalido("El id_token no trae un email verificado.")
+    return claims
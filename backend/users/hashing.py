@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .metrics import HASH_SEGUNDOS
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id con coste configurable por entorno. Al cambiar el coste,
+    `must_update` marca los hashes antiguos y se re-hashean en el siguiente login.
+    """
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class HashingBusy(APIException):
+    """El pool de hashing no respondió dentro de PASSWORD_HASH_TIMEOUT."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "El servicio de contraseñas está saturado, intenta de nuevo."
+    default_code = "hashing_busy"
+
+
+# --- ⚙️ Funciones que corren en los procesos del pool ---
+def _inicializar_proceso():
+    # Idempotente con "fork"; necesario con "spawn" (el hijo no hereda Django)
+    import django
+    django.setup()
+
+
+def _verificar(password, encoded):
+    return verify_password(password, encoded)
+
+
+def _hashear(password):
+    return make_password(password)
+
+
+class HashingPool:
+    """
+    Pool de procesos acotado para hashear y verificar contraseñas fuera del
+    worker. Con `workers=0` todo se ejecuta en línea (desarrollo/tests).
+    Se crea en el primer uso y se recrea si el worker hace fork (gunicorn).
+    """
+
+    def __init__(self, workers, timeout):
+        self.workers = workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, initializer=_inicializar_proceso,
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def ejecutar(self, funcion, *args):
+        if self.workers <= 0:
+            return funcion(*args)
+        futuro = self._get_executor().submit(funcion, *args)
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            futuro.cancel()
+            raise HashingBusy()
+
+    def mapear(self, funcion, valores, chunksize=1):
+        """Aplica `funcion` a cada valor repartiendo el trabajo entre los procesos."""
+        if self.workers <= 0:
+            return [funcion(v) for v in valores]
+        return list(self._get_executor().map(funcion, valores, chunksize=chunksize))
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    timeout=settings.PASSWORD_HASH_TIMEOUT,
+)
+
+
+def hashear(password):
+    """Equivalente a make_password(), ejecutado en el pool."""
+    if password is None:
+        return make_password(None)
+    with HASH_SEGUNDOS.labels("hash").time():
+        return pool.ejecutar(_hashear, password)
+
+
+def hashear_lote(passwords, pool=pool):
+    """
+    make_password() para muchas contraseñas (importación masiva). Las vacías
+    quedan como contraseña inutilizable sin pasar por el pool.
+    """
+    pendientes = [p for p in passwords if p]
+    chunksize = max(1, len(pendientes) // (max(pool.workers, 1) * 4))
+    with HASH_SEGUNDOS.labels("hash_batch").time():
+        hashes = iter(pool.mapear(_hashear, pendientes, chunksize=chunksize))
+    return [next(hashes) if p else make_password(None) for p in passwords]
+
+
+def verificar(password, encoded, setter=None):
+    """
+    Equivalente a check_password(), ejecutado en el pool.
+    Si el hash es heredado (PBKDF2) o de coste antiguo, `setter` lo actualiza.
+    """
+    if password is None:
+        return False
+    with HASH_SEGUNDOS.labels("verify").time():
+        es_correcta, debe_actualizar = pool.ejecutar(_verificar, password, encoded)
+    if setter and es_correcta and debe_actualizar:
+        setter(password)
+    return es_correcta
@@ -0,0 +1,159 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .metrics import GOOGLE_SEGUNDOS
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """El circuito está abierto: el proveedor está degradado, se falla rápido."""
+
+
+class CircuitBreaker:
+    """
+    Cerrado → abierto tras `umbral` fallos consecutivos; tras `enfriamiento`
+    segundos pasa a semiabierto y deja pasar una sola llamada de prueba.
+    """
+
+    def __init__(self, umbral, enfriamiento):
+        self.umbral = umbral
+        self.enfriamiento = enfriamiento
+        self._lock = threading.Lock()
+        self._fallos = 0
+        self._abierto_hasta = 0.0
+        self._prueba_en_curso = False
+
+    @property
+    def estado(self):
+        if self._fallos < self.umbral:
+            return "cerrado"
+        return "abierto" if time.monotonic() < self._abierto_hasta else "semiabierto"
+
+    def antes_de_llamar(self):
+        with self._lock:
+            estado = self.estado
+            if estado == "abierto" or (estado == "semiabierto" and self._prueba_en_curso):
+                raise CircuitOpen("Proveedor OAuth no disponible temporalmente.")
+            if estado == "semiabierto":
+                self._prueba_en_curso = True
+
+    def exito(self):
+        with self._lock:
+            self._fallos = 0
+            self._prueba_en_curso = False
+
+    def fallo(self):
+        with self._lock:
+            self._fallos += 1
+            self._prueba_en_curso = False
+            if self._fallos >= self.umbral:
+                self._abierto_hasta = time.monotonic() + self.enfriamiento
+
+
+class OAuthHttpClient:
+    """
+    Cliente HTTP compartido para llamadas salientes de OAuth.
+    ✅ requests.Session con keep-alive y pool de conexiones
+    ✅ Timeouts estrictos de conexión y lectura
+    ✅ Reintentos acotados con backoff exponencial y jitter
+    ✅ Circuit breaker para fallar rápido si el proveedor está degradado
+    ✅ Latencia por llamada (logger + contadores en memoria)
+    Los POST solo se reintentan ante un timeout de conexión (la petición no
+    llegó a enviarse): un `code` de OAuth es de un solo uso.
+    """
+
+    REINTENTABLES = {429, 500, 502, 503, 504}
+
+    def __init__(self, timeout, reintentos, backoff, pool_size, breaker):
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.breaker = breaker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._metricas = {}
+
+    def get(self, url, operacion, **kwargs):
+        return self._llamar("GET", url, operacion, **kwargs)
+
+    def post(self, url, operacion, **kwargs):
+        return self._llamar("POST", url, operacion, **kwargs)
+
+    def _llamar(self, metodo, url, operacion, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        intento = 0
+        while True:
+            self.breaker.antes_de_llamar()
+            inicio = time.perf_counter()
+            try:
+                response = self.session.request(metodo, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._registrar(operacion, inicio, error=True)
+                self.breaker.fallo()
+                reintentable = isinstance(e, requests.exceptions.ConnectTimeout) or (
+                    metodo == "GET"
+                    and isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                )
+                if not reintentable or intento >= self.reintentos:
+                    raise
+            else:
+                error = response.status_code >= 500
+                self._registrar(operacion, inicio, error=error)
+                if error:
+                    self.breaker.fallo()
+                else:
+                    self.breaker.exito()
+                if (
+                    response.status_code not in self.REINTENTABLES
+                    or metodo != "GET"
+                    or intento >= self.reintentos
+                ):
+                    return response
+
+            intento += 1
+            # Backoff exponencial con jitter completo
+            time.sleep(random.uniform(0, self.backoff * 2 ** intento))
+
+    # --- 📊 Métricas ---
+    def _registrar(self, operacion, inicio, error):
+        segundos = time.perf_counter() - inicio
+        GOOGLE_SEGUNDOS.labels(operacion, str(error).lower()).observe(segundos)
+        ms = segundos * 1000
+        logger.info("oauth %s %.1f ms%s", operacion, ms, " (error)" if error else "")
+        with self._lock:
+            m = self._metricas.setdefault(
+                operacion, {"llamadas": 0, "errores": 0, "ms_total": 0.0, "ms_max": 0.0}
+            )
+            m["llamadas"] += 1
+            m["errores"] += int(error)
+            m["ms_total"] += ms
+            m["ms_max"] = max(m["ms_max"], ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                operacion: dict(m, ms_medio=m["ms_total"] / m["llamadas"])
+                for operacion, m in self._metricas.items()
+            } | {"circuito": self.breaker.estado}
+
+
+google_client = OAuthHttpClient(
+    timeout=(settings.GOOGLE_HTTP_CONNECT_TIMEOUT, settings.GOOGLE_HTTP_READ_TIMEOUT),
+    reintentos=settings.GOOGLE_HTTP_RETRIES,
+    backoff=settings.GOOGLE_HTTP_BACKOFF,
+    pool_size=settings.GOOGLE_HTTP_POOL_SIZE,
+    breaker=CircuitBreaker(
+        umbral=settings.GOOGLE_CIRCUIT_THRESHOLD,
+        enfriamiento=settings.GOOGLE_CIRCUIT_COOLDOWN,
+    ),
+)
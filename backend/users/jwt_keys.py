@@ -0,0 +1,195 @@
+import hashlib
+import json
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+from jwt import InvalidAlgorithmError, InvalidTokenError
+from jwt.algorithms import get_default_algorithms
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+
+from .sql_budget import fuera_de_presupuesto
+
+
+class KeyRing:
+    """
+    Caché en proceso de las claves de firma (`ClaveFirma`).
+    ✅ Las claves PEM se parsean una sola vez por recarga
+    ✅ Se recarga cada `intervalo` segundos (una consulta por worker)
+    ✅ Un `kid` desconocido fuerza una recarga (clave rotada en otra instancia),
+       como mucho una cada `intervalo_forzado` segundos: tokens con `kid`
+       inventados no generan una consulta por request
+    """
+
+    def __init__(self, intervalo, intervalo_forzado):
+        self.intervalo = intervalo
+        self.intervalo_forzado = intervalo_forzado
+        self._lock = threading.Lock()
+        self._cargado_en = None
+        self._forzado_en = None
+        self._firma = None        # (kid, algoritmo, clave_privada)
+        self._publicas = {}       # kid -> (algoritmo, clave_publica)
+        self._jwks = {"keys": []}
+        self._etag = None
+
+    def _vigente(self):
+        return self._cargado_en is not None and time.monotonic() - self._cargado_en < self.intervalo
+
+    def cargar(self, forzar=False):
+        if not forzar and self._vigente():
+            return
+        with self._lock:
+            if not forzar and self._vigente():
+                return
+            from .models import ClaveFirma
+
+            ahora = timezone.now()
+            try:
+                with fuera_de_presupuesto():
+                    claves = list(ClaveFirma.objects.vigentes(ahora))
+            except DatabaseError:
+                # Tabla aún no migrada → se mantiene la firma HS256 heredada
+                claves = []
+
+            algoritmos = get_default_algorithms()
+            firma, publicas, jwks = None, {}, []
+            for clave in claves:
+                alg = algoritmos[clave.algoritmo]
+                publica = alg.prepare_key(clave.clave_publica)
+                publicas[clave.kid] = (clave.algoritmo, publica)
+
+                jwk = alg.to_jwk(publica, as_dict=True)
+                jwk.update({"kid": clave.kid, "alg": clave.algoritmo, "use": "sig"})
+                jwks.append(jwk)
+
+                if firma is None and clave.activa_desde <= ahora:
+                    firma = (clave.kid, clave.algoritmo, alg.prepare_key(clave.clave_privada))
+
+            cuerpo = {"keys": jwks}
+            self._firma = firma
+            self._publicas = publicas
+            self._jwks = cuerpo
+            self._etag = '"%s"' % hashlib.sha256(
+                json.dumps(cuerpo, sort_keys=True).encode()
+            ).hexdigest()[:32]
+            self._cargado_en = time.monotonic()
+
+    def clave_firma(self):
+        self.cargar()
+        return self._firma
+
+    def _puede_forzar(self):
+        return self._forzado_en is None or time.monotonic() - self._forzado_en >= self.intervalo_forzado
+
+    def clave_publica(self, kid):
+        self.cargar()
+        if kid not in self._publicas and self._puede_forzar():
+            with self._lock:
+                if not self._puede_forzar():
+                    return self._publicas.get(kid)
+                self._forzado_en = time.monotonic()
+            self.cargar(forzar=True)
+        return self._publicas.get(kid)
+
+    def jwks(self):
+        self.cargar()
+        return self._jwks, self._etag
+
+
+keyring = KeyRing(
+    intervalo=settings.JWT_KEYRING_REFRESH,
+    intervalo_forzado=settings.JWT_KEYRING_FORCED_REFRESH,
+)
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    Firma con la clave asimétrica activa del llavero (RS256/EdDSA) y añade
+    `kid` a la cabecera. Verifica por `kid` contra las claves publicadas.
+    Los tokens sin `kid` (HS256 previos a la migración) se siguen aceptando
+    mientras `JWT_ACCEPT_LEGACY_HS256` esté activo. Sin claves en el llavero
+    se firma igual que antes (HS256 con SIGNING_KEY).
+    """
+
+    def __init__(self, *args, keyring, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.keyring = keyring
+
+    def encode(self, payload):
+        firma = self.keyring.clave_firma()
+        if firma is None:
+            return super().encode(payload)
+
+        kid, algoritmo, clave_privada = firma
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            clave_privada,
+            algorithm=algoritmo,
+            headers={"kid": kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except InvalidTokenError as ex:
+            raise TokenBackendError("Token is invalid or expired") from ex
+
+        if kid is None:
+            if not settings.JWT_ACCEPT_LEGACY_HS256:
+                raise TokenBackendError("Token is invalid or expired")
+            return super().decode(token, verify=verify)
+
+        publica = self.keyring.clave_publica(kid)
+        if publica is None:
+            raise TokenBackendError("Token is invalid or expired")
+
+        algoritmo, clave_publica = publica
+        try:
+            return jwt.decode(
+                token,
+                clave_publica,
+                algorithms=[algoritmo],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except InvalidAlgorithmError as ex:
+            raise TokenBackendError("Invalid algorithm specified") from ex
+        except InvalidTokenError as ex:
+            raise TokenBackendError("Token is invalid or expired") from ex
+
+
+def instalar_token_backend():
+    """
+    Sustituye el backend global de simplejwt (`state.token_backend`), que es el
+    que usan RefreshToken/AccessToken, TokenRefreshView y la autenticación.
+    """
+    from rest_framework_simplejwt import state
+    from rest_framework_simplejwt.settings import api_settings
+
+    state.token_backend = KeyRingTokenBackend(
+        api_settings.ALGORITHM,
+        api_settings.SIGNING_KEY,
+        api_settings.VERIFYING_KEY,
+        api_settings.AUDIENCE,
+        api_settings.ISSUER,
+        api_settings.JWK_URL,
+        api_settings.LEEWAY,
+        api_settings.JSON_ENCODER,
+        keyring=keyring,
+    )
@@ -0,0 +1,133 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.conf import settings
+from django.utils import timezone
+
+from .sql_budget import fuera_de_presupuesto
+from .user_cache import user_repr_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LastSeenRecorder:
+    """
+    Write-behind de `ultimo_login`: el login solo anota (id → instante) en
+    memoria y un hilo de fondo vuelca el búfer cada `intervalo` segundos con un
+    único UPDATE … FROM (VALUES …) por lote.
+    ✅ Varios logins del mismo usuario entre volcados → una sola fila
+    ✅ Búfer acotado: al llenarse se adelanta el volcado; si la BD no responde
+       y se supera el límite, se descartan usuarios nuevos (no hay bloqueo)
+    ✅ Volcado final al apagar el worker (atexit)
+    ✅ No sube `version`: un login no cambia la ETag del usuario (ultimo_login
+       se serializa, pero no entra en la ETag; ver users.etags)
+    Con `intervalo=0` se escribe en línea (desarrollo/tests).
+    """
+
+    def __init__(self, intervalo, max_pendientes, tamano_lote=1000):
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self.tamano_lote = tamano_lote
+        self._lock = threading.Lock()
+        self._pendientes = {}
+        self._despertar = threading.Event()
+        self._hilo = None
+        self._pid = None
+        self.descartados = 0
+        atexit.register(self.volcar)
+
+    def registrar(self, user_id, cuando=None):
+        cuando = cuando or timezone.now()
+        if self.intervalo <= 0:
+            self._escribir([(user_id, cuando)])
+            return
+        with self._lock:
+            previo = self._pendientes.get(user_id)
+            if previo is None and len(self._pendientes) >= self.max_pendientes:
+                self.descartados += 1
+                self._despertar.set()
+                return
+            if previo is None or cuando > previo:
+                self._pendientes[user_id] = cuando
+            lleno = len(self._pendientes) >= self.max_pendientes // 2
+        self._asegurar_hilo()
+        if lleno:
+            self._despertar.set()
+
+    def pendientes(self):
+        return len(self._pendientes)
+
+    # --- 🧵 Hilo de volcado ---
+    def _asegurar_hilo(self):
+        # Un hilo por proceso: tras un fork (gunicorn) se arranca otro
+        if self._hilo is None or self._pid != os.getpid():
+            with self._lock:
+                if self._hilo is None or self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._hilo = threading.Thread(target=self._bucle, daemon=True)
+                    self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+            close_old_connections()
+            self.volcar()
+
+    def volcar(self):
+        with self._lock:
+            filas, self._pendientes = list(self._pendientes.items()), {}
+        if not filas:
+            return
+        try:
+            for i in range(0, len(filas), self.tamano_lote):
+                self._escribir(filas[i:i + self.tamano_lote])
+        except DatabaseError:
+            logger.warning("No se pudo volcar ultimo_login (%d usuarios)", len(filas), exc_info=True)
+            # Se reintentan en el próximo volcado sin pisar instantes más recientes
+            with self._lock:
+                for user_id, cuando in filas:
+                    if len(self._pendientes) >= self.max_pendientes:
+                        self.descartados += 1
+                    elif user_id not in self._pendientes or self._pendientes[user_id] < cuando:
+                        self._pendientes[user_id] = cuando
+
+    def _escribir(self, filas):
+        from .models import Usuario
+
+        meta = Usuario._meta
+        campo_id = meta.pk
+        campo_fecha = meta.get_field("ultimo_login")
+        tabla = connection.ops.quote_name(meta.db_table)
+        params = [
+            (campo_id.get_db_prep_value(user_id, connection), campo_fecha.get_db_prep_value(cuando, connection))
+            for user_id, cuando in filas
+        ]
+        with fuera_de_presupuesto(), transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                valores = ", ".join(["(%s::uuid, %s::timestamptz)"] * len(params))
+                cursor.execute(
+                    f"UPDATE {tabla} AS u SET ultimo_login = v.instante "
+                    f"FROM (VALUES {valores}) AS v(id, instante) "
+                    f"WHERE u.id = v.id AND (u.ultimo_login IS NULL OR u.ultimo_login < v.instante)",
+                    [valor for fila in params for valor in fila],
+                )
+            else:
+                cursor.executemany(
+                    f"UPDATE {tabla} SET ultimo_login = %s "
+                    f"WHERE id = %s AND (ultimo_login IS NULL OR ultimo_login < %s)",
+                    [(instante, user_id, instante) for user_id, instante in params],
+                )
+        # El UPDATE directo no emite post_save: la representación cacheada se
+        # renueva a mano (la versión de la fila, y con ella la ETag, no cambia)
+        for user_id, _ in filas:
+            user_repr_cache.invalidar(user_id)
+
+
+last_seen = LastSeenRecorder(
+    intervalo=settings.LAST_SEEN_FLUSH_INTERVAL,
+    max_pendientes=settings.LAST_SEEN_MAX_PENDING,
+)
@@ -0,0 +1,56 @@
+import random
+import string
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.blocklist import SuffixIndex
+
+TLDS = ["com", "net", "org", "io", "xyz", "info", "co", "me"]
+
+
+def _dominio(rng):
+    etiqueta = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(5, 14)))
+    return f"{etiqueta}.{rng.choice(TLDS)}"
+
+
+class Command(BaseCommand):
+    help = "Mide coste de búsqueda y memoria del índice de dominios desechables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entradas", type=int, nargs="*", default=[100_000, 1_000_000])
+        parser.add_argument("--consultas", type=int, default=200_000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'entradas':>10} {'build s':>8} {'índice MB':>10} {'RSS máx MB':>10} "
+            f"{'ns/hit':>8} {'ns/subdom':>10} {'ns/miss':>8}"
+        )
+        for n in options["entradas"]:
+            rng = random.Random(n)
+            dominios = [_dominio(rng) for _ in range(n)]
+
+            inicio = time.perf_counter()
+            indice = SuffixIndex(dominios)
+            build = time.perf_counter() - inicio
+            # ru_maxrss en KiB (Linux): incluye la lista de entrada y el pico de construcción
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+            k = options["consultas"]
+            casos = {
+                "hit": [rng.choice(dominios) for _ in range(k)],
+                "subdom": [f"mx.{rng.choice(dominios)}" for _ in range(k)],
+                "miss": [_dominio(rng) + "x" for _ in range(k)],
+            }
+            ns = {}
+            for nombre, consultas in casos.items():
+                inicio = time.perf_counter()
+                for dominio in consultas:
+                    dominio in indice
+                ns[nombre] = (time.perf_counter() - inicio) / k * 1e9
+
+            self.stdout.write(
+                f"{len(indice):>10} {build:>8.2f} {indice.nbytes() / 2**20:>10.1f} {rss:>10.1f} "
+                f"{ns['hit']:>8.0f} {ns['subdom']:>10.0f} {ns['miss']:>8.0f}"
+            )
@@ -0,0 +1,73 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from users.hashing import TunedArgon2PasswordHasher
+
+
+def _medir(hasher_path, variante, duracion):
+    """Hashes/segundo de un hasher en un solo núcleo (corre en un proceso hijo)."""
+    import django
+    django.setup()
+    from django.utils.module_loading import import_string
+
+    hasher = import_string(hasher_path)()
+    for attr, valor in variante.items():
+        setattr(hasher, attr, valor)
+
+    hasher.encode("calentamiento", hasher.salt())
+    n, inicio = 0, time.perf_counter()
+    while time.perf_counter() - inicio < duracion:
+        hasher.encode("benchmark-password", hasher.salt())
+        n += 1
+    return n / (time.perf_counter() - inicio)
+
+
+def _parse_coste(texto):
+    t, m, p = (int(x) for x in texto.split(":"))
+    return {"time_cost": t, "memory_cost": m, "parallelism": p}
+
+
+class Command(BaseCommand):
+    help = "Mide hashes por segundo por núcleo para cada hasher/coste configurado"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--duracion", type=float, default=2.0, help="Segundos por medición")
+        parser.add_argument(
+            "--procesos", type=int, default=os.cpu_count() or 1,
+            help="Procesos en paralelo (uno por núcleo)",
+        )
+        parser.add_argument(
+            "--argon2", nargs="*", default=[], metavar="T:M:P",
+            help="Costes Argon2 adicionales: time_cost:memory_cost(KiB):parallelism",
+        )
+
+    def handle(self, *args, **options):
+        casos = []
+        for hasher in get_hashers():
+            ruta = f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+            variante = {}
+            if hasattr(hasher, "time_cost"):
+                variante = {a: getattr(hasher, a) for a in ("time_cost", "memory_cost", "parallelism")}
+            elif hasattr(hasher, "iterations"):
+                variante = {"iterations": hasher.iterations}
+            casos.append((ruta, variante))
+
+        argon2 = f"{TunedArgon2PasswordHasher.__module__}.{TunedArgon2PasswordHasher.__qualname__}"
+        casos += [(argon2, _parse_coste(c)) for c in options["argon2"]]
+
+        procesos = options["procesos"]
+        self.stdout.write(f"{'hasher':<45} {'coste':<40} {'h/s/núcleo':>11} {'h/s total':>10}")
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            for ruta, variante in casos:
+                resultados = list(executor.map(
+                    _medir, [ruta] * procesos, [variante] * procesos, [options["duracion"]] * procesos,
+                ))
+                total = sum(resultados)
+                coste = " ".join(f"{k}={v}" for k, v in variante.items())
+                self.stdout.write(
+                    f"{ruta.rsplit('.', 1)[-1]:<45} {coste:<40} {total / procesos:>11.1f} {total:>10.1f}"
+                )
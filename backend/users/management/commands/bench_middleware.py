@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Se ejecuta en un intérprete nuevo por perfil: el perfil se fija al importar settings
+_MEDICION = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+arranque = time.perf_counter() - t0
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+RESPUESTA = HttpResponse(b"{}", content_type="application/json")
+
+def vista(request):
+    return RESPUESTA
+
+class Handler(BaseHandler):
+    # Sin resolver URLs ni vistas reales: solo la cadena de middleware
+    def _get_response(self, request):
+        for hook in self._view_middleware:
+            respuesta = hook(request, vista, (), {})
+            if respuesta is not None:
+                return respuesta
+        return vista(request)
+
+handler = Handler()
+handler.load_middleware()
+rf = RequestFactory()
+n = int(sys.argv[1])
+rutas = {}
+for ruta in sys.argv[2:]:
+    request = rf.get(ruta, HTTP_AUTHORIZATION="Bearer x", HTTP_ORIGIN="http://localhost:5173")
+    inicio = time.perf_counter()
+    for _ in range(n):
+        vista(request)
+    base = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for _ in range(n):
+        handler.get_response(request)
+    rutas[ruta] = max(time.perf_counter() - inicio - base, 0) / n
+print(json.dumps({
+    "arranque": arranque,
+    "modulos": len(sys.modules),
+    "apps": len(settings.INSTALLED_APPS),
+    "middleware": len(settings.MIDDLEWARE),
+    "rutas": rutas,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara los perfiles APP_PROFILE (full/api): tiempo de arranque del worker "
+        "(wsgi + URLconf, intérprete nuevo) y coste de la cadena de middleware por request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000)
+        parser.add_argument("--arranques", type=int, default=5, help="Intérpretes por perfil (se toma la mediana)")
+        parser.add_argument("--rutas", nargs="+", default=["/api/users/me/", "/admin/login/"])
+        parser.add_argument("--perfiles", nargs="+", default=["full", "api"])
+
+    def handle(self, *args, **options):
+        for perfil in options["perfiles"]:
+            medidas = [self._medir(perfil, options) for _ in range(options["arranques"])]
+            arranque = statistics.median(m["arranque"] for m in medidas)
+            m = medidas[0]
+            self.stdout.write(
+                f"[{perfil}] arranque {arranque * 1000:.0f} ms · {m['modulos']} módulos · "
+                f"{m['apps']} apps · {m['middleware']} middleware"
+            )
+            for ruta in options["rutas"]:
+                coste = statistics.median(m["rutas"][ruta] for m in medidas)
+                self.stdout.write(f"    {ruta:<28} {coste * 1e6:>8.1f} µs/request de middleware")
+
+    def _medir(self, perfil, options):
+        env = dict(os.environ, APP_PROFILE=perfil)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "auth_service.settings")
+        resultado = subprocess.run(
+            [sys.executable, "-c", _MEDICION, str(options["requests"]), *options["rutas"]],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        return json.loads(resultado.stdout.strip().splitlines()[-1])
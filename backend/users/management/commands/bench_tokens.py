@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models import Usuario
+from users.token_service import token_minter
+from users.tokens import RefreshToken
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _for_user(usuario):
+    # Camino anterior: RefreshToken.for_user + claims a mano + str() de cada token
+    refresh = RefreshToken.for_user(usuario)
+    access = refresh.access_token
+    for t in (refresh, access):
+        t["email"] = usuario.email
+        t["nombre"] = usuario.nombre
+        t["apellido"] = usuario.apellido
+        t["rol"] = usuario.rol
+        t["activo"] = usuario.activo
+    return {"access": str(access), "refresh": str(refresh)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara pares de tokens por segundo: RefreshToken.for_user frente a "
+        "users.token_service (uno a uno y por lotes). Los OutstandingToken se revierten"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=2000)
+        parser.add_argument("--lote", type=int, default=500)
+
+    def handle(self, *args, **options):
+        n, lote = options["tokens"], options["lote"]
+        try:
+            with transaction.atomic():
+                usuario = Usuario.objects.create(
+                    email="bench.tokens@example.com", nombre="Bench", apellido="Tokens",
+                    password=make_password(None),
+                )
+                firma = token_minter.keyring.clave_firma()
+                self.stdout.write(f"Firma: {firma[1] if firma else 'HS256 (SIGNING_KEY)'} · {n} pares")
+
+                self._medir("RefreshToken.for_user", n, lambda: [_for_user(usuario) for _ in range(n)])
+                self._medir("token_minter.emitir", n, lambda: [token_minter.emitir(usuario) for _ in range(n)])
+                self._medir(
+                    f"token_minter.emitir_lote ({lote})", n,
+                    lambda: [token_minter.emitir_lote([usuario] * lote) for _ in range(n // lote)],
+                )
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _medir(self, nombre, n, funcion):
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(f"{nombre:<32} {n / segundos:>10.0f} pares/s  {segundos / n * 1e6:>8.1f} µs/par")
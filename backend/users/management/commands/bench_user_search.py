@@ -0,0 +1,85 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from users.models import Usuario
+from users.search import buscar_usuarios
+
+NOMBRES = ["José", "María", "Ángel", "Lucía", "Martín", "Sofía", "Andrés", "Camila", "Raúl", "Inés"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Sánchez", "Gómez", "Díaz", "Núñez"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara plan y latencia de la búsqueda de usuarios (icontains vs. índice "
+        "trigram) sobre un dataset sembrado dentro de una transacción que se revierte"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--usuarios", type=int, default=200_000)
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--terminos", nargs="*", default=["jose", "perez", "gonzalez12", "mart", "zzz"])
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._sembrar(options["usuarios"])
+                for termino in options["terminos"]:
+                    self._comparar(termino, options["repeticiones"])
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write("Dataset revertido.")
+
+    def _sembrar(self, n):
+        rng = random.Random(42)
+        password = make_password(None)
+        lote = []
+        for i in range(n):
+            nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+            lote.append(Usuario(
+                email=f"bench{i}.{apellido.lower()}{i % 97}@example.com",
+                nombre=nombre, apellido=apellido, password=password,
+            ))
+            if len(lote) == 5000:
+                Usuario.objects.bulk_create(lote)
+                lote = []
+        Usuario.objects.bulk_create(lote)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE usuarios")
+        self.stdout.write(f"Sembrados {n} usuarios ({connection.vendor})")
+
+    def _medir(self, construir, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            list(construir())
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
+
+    def _comparar(self, termino, repeticiones):
+        qs = Usuario.objects.all().order_by("-fecha_registro")
+        limite = settings.USER_SEARCH_LIMIT
+        casos = {
+            "icontains": lambda: qs.filter(
+                Q(email__icontains=termino) | Q(nombre__icontains=termino) | Q(apellido__icontains=termino)
+            )[:limite],
+            "buscar_usuarios": lambda: buscar_usuarios(qs, termino, limite),
+        }
+        self.stdout.write(f"\n=== q={termino!r}")
+        for nombre, construir in casos.items():
+            analizar = {"analyze": True} if connection.vendor == "postgresql" else {}
+            plan = construir().explain(**analizar)
+            ms = self._medir(construir, repeticiones)
+            self.stdout.write(f"--- {nombre}: mediana {ms:.2f} ms, {len(list(construir()))} resultados")
+            self.stdout.write(plan)
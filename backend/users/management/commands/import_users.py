@@ -0,0 +1,57 @@
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.bulk_import import detectar_formato, importar_usuarios, leer_filas
+from users.hashing import HashingPool
+
+
+class Command(BaseCommand):
+    help = "Importa usuarios (y sus perfiles) desde un archivo CSV o NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo")
+        parser.add_argument("--formato", choices=["csv", "ndjson"])
+        parser.add_argument("--lote", type=int, default=settings.USERS_IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Procesos para hashear contraseñas (0 = en línea)",
+        )
+        parser.add_argument("--reporte", help="Ruta CSV donde escribir los errores por fila")
+
+    def handle(self, *args, **options):
+        try:
+            formato = detectar_formato(options["archivo"], options["formato"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        # Pool propio del comando: usa todos los núcleos, sin el timeout de las peticiones
+        pool = HashingPool(workers=options["workers"], timeout=None)
+        inicio = time.perf_counter()
+        try:
+            with open(options["archivo"], encoding="utf-8-sig", newline="") as f:
+                resultado = importar_usuarios(leer_filas(f, formato), options["lote"], pool=pool)
+        finally:
+            pool.cerrar()
+        segundos = time.perf_counter() - inicio
+
+        if options["reporte"]:
+            with open(options["reporte"], "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["fila", "email", "errores"])
+                for e in resultado.errores:
+                    writer.writerow([e["fila"], e["email"] or "", json.dumps(e["errores"], ensure_ascii=False)])
+        else:
+            for e in resultado.errores[:20]:
+                self.stdout.write(f"  fila {e['fila']} ({e['email'] or '-'}): {e['errores']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Creados: {resultado.creados} · existentes: {resultado.existentes} · "
+            f"errores: {len(resultado.errores)} · {segundos:.1f} s"
+        ))
+        if resultado.interrumpido:
+            raise CommandError(resultado.errores[-1]["errores"])
@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Arranque de un worker en un intérprete nuevo: wsgi → URLconf → primera request
+_ARRANQUE = r"""
+import io, sys, time
+t0 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+t_wsgi = time.perf_counter() - t0
+estado = []
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[1], "QUERY_STRING": "",
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+    "REMOTE_ADDR": "127.0.0.1", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    "wsgi.url_scheme": "http", "wsgi.version": (1, 0), "wsgi.multithread": False,
+    "wsgi.multiprocess": True, "wsgi.run_once": False,
+}
+respuesta = application(environ, lambda status, headers, exc_info=None: estado.append(status))
+b"".join(respuesta)
+respuesta.close()
+print("TIEMPOS", t_wsgi, time.perf_counter() - t0, estado[0], file=sys.stdout)
+"""
+
+_LINEA = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Informe tipo `python -X importtime`: imports más lentos al arrancar un worker "
+        "y tiempo hasta la primera request (intérprete nuevo)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ruta", default="/api/users/me/", help="Ruta de la primera request")
+        parser.add_argument("--top", type=int, default=25)
+        parser.add_argument("--orden", choices=["acumulado", "propio"], default="acumulado")
+        parser.add_argument("--paquete", help="Solo módulos bajo este prefijo (p. ej. users)")
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        resultado = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _ARRANQUE, options["ruta"]],
+            cwd=settings.BASE_DIR, env=dict(os.environ), capture_output=True, text=True, check=True,
+        )
+        total = time.perf_counter() - inicio
+
+        imports = []
+        for linea in resultado.stderr.splitlines():
+            m = _LINEA.match(linea)
+            if m:
+                propio, acumulado, sangria, modulo = m.groups()
+                imports.append((int(propio), int(acumulado), len(sangria) // 2, modulo))
+        if options["paquete"]:
+            prefijo = options["paquete"]
+            imports = [i for i in imports if i[3] == prefijo or i[3].startswith(prefijo + ".")]
+
+        columna = 1 if options["orden"] == "acumulado" else 0
+        self.stdout.write(f"{'propio ms':>10} {'acum. ms':>10}  módulo")
+        for propio, acumulado, nivel, modulo in sorted(imports, key=lambda i: -i[columna])[:options["top"]]:
+            self.stdout.write(f"{propio / 1000:>10.1f} {acumulado / 1000:>10.1f}  {modulo} (nivel {nivel})")
+
+        _, t_wsgi, t_primera, estado = next(
+            linea for linea in resultado.stdout.splitlines() if linea.startswith("TIEMPOS")
+        ).split(" ", 3)
+        self.stdout.write(
+            f"\n{len(imports)} módulos importados · wsgi listo en {float(t_wsgi) * 1000:.0f} ms · "
+            f"primera request ({options['ruta']} → {estado}) en {float(t_primera) * 1000:.0f} ms · "
+            f"proceso completo {total * 1000:.0f} ms (incluye -X importtime)"
+        )
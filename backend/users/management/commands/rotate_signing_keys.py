@@ -0,0 +1,85 @@
+import uuid
+from datetime import timedelta
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import ClaveFirma
+
+
+def generar_par(algoritmo):
+    if algoritmo == "EdDSA":
+        privada = ed25519.Ed25519PrivateKey.generate()
+    else:
+        privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    pem_privada = privada.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    pem_publica = privada.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return pem_privada, pem_publica
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una nueva clave de firma JWT y retira las anteriores tras un "
+        "periodo de solapamiento (siguen publicadas en el JWKS hasta entonces)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algoritmo", choices=["RS256", "EdDSA"], default=settings.JWT_SIGNING_ALGORITHM,
+        )
+        parser.add_argument(
+            "--solapamiento", type=int,
+            default=int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()),
+            help="Segundos que las claves anteriores siguen verificando tokens "
+                 "(por defecto, la vida de un refresh token)",
+        )
+        parser.add_argument(
+            "--publicar-antes", type=int, default=settings.JWKS_MAX_AGE,
+            help="Segundos que la nueva clave se publica en el JWKS antes de "
+                 "empezar a firmar (por defecto, el max-age del JWKS)",
+        )
+        parser.add_argument(
+            "--purgar", action="store_true",
+            help="Elimina de la BD las claves ya retiradas",
+        )
+
+    def handle(self, *args, **options):
+        ahora = timezone.now()
+        activa_desde = ahora + timedelta(seconds=options["publicar_antes"])
+        retirada_en = activa_desde + timedelta(seconds=options["solapamiento"])
+        pem_privada, pem_publica = generar_par(options["algoritmo"])
+
+        with transaction.atomic():
+            retiradas = ClaveFirma.objects.filter(retirada_en__isnull=True).update(
+                retirada_en=retirada_en
+            )
+            clave = ClaveFirma.objects.create(
+                kid=uuid.uuid4().hex,
+                algoritmo=options["algoritmo"],
+                clave_privada=pem_privada,
+                clave_publica=pem_publica,
+                activa_desde=activa_desde,
+            )
+            if options["purgar"]:
+                purgadas, _ = ClaveFirma.objects.filter(retirada_en__lte=ahora).delete()
+                self.stdout.write(f"Claves retiradas eliminadas: {purgadas}")
+
+        self.stdout.write(
+            f"Nueva clave {clave.kid} ({clave.algoritmo}), firma desde {activa_desde:%Y-%m-%d %H:%M:%S}"
+        )
+        if retiradas:
+            self.stdout.write(
+                f"{retiradas} clave(s) anterior(es) se retiran el {retirada_en:%Y-%m-%d %H:%M:%S}"
+            )
@@ -0,0 +1,116 @@
+"""
+Métricas Prometheus del servicio (GET /metrics).
+
+Cada worker agrega en su propio proceso. Con gunicorn, PROMETHEUS_MULTIPROC_DIR
+(lo fija gunicorn.conf.py) hace que cada worker escriba sus valores en
+archivos mmap de ese directorio y /metrics sume los de todos los workers, así
+que da igual qué worker atienda el scrape.
+"""
+import hmac
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+_BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# --- 🌐 HTTP ---
+HTTP_LATENCIA = Histogram(
+    "auth_http_request_duration_seconds", "Latencia por ruta (nombre de la URL).",
+    ["route", "method", "status"], buckets=_BUCKETS_LATENCIA,
+)
+DB_CONSULTAS = Histogram(
+    "auth_db_queries_per_request", "Consultas SQL por request.",
+    ["route"], buckets=(0, 1, 2, 3, 4, 6, 8, 12, 20, 50),
+)
+DB_SEGUNDOS = Histogram(
+    "auth_db_query_seconds_per_request", "Tiempo total en SQL por request.",
+    ["route"], buckets=_BUCKETS_LATENCIA,
+)
+
+# --- 🔐 Autenticación ---
+LOGINS = Counter(
+    "auth_login_total", "Resultados de login (success, bad_credentials, inactive, throttled).",
+    ["via", "outcome"],
+)
+TOKENS_EMITIDOS = Counter("auth_tokens_issued_total", "JWT emitidos.", ["type"])
+TOKENS_REVOCADOS = Counter("auth_tokens_blacklisted_total", "Refresh tokens añadidos a la lista negra.")
+
+# --- ⏱️ Dependencias lentas ---
+HASH_SEGUNDOS = Histogram(
+    "auth_password_hash_seconds", "Hash/verificación de contraseñas (incluye la espera del pool).",
+    ["operation"], buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2, 5),
+)
+DNS_SEGUNDOS = Histogram(
+    "auth_mx_lookup_seconds", "Consultas MX de validación de email (solo fallos de caché).",
+    ["result"], buckets=_BUCKETS_LATENCIA,
+)
+GOOGLE_SEGUNDOS = Histogram(
+    "auth_google_request_seconds", "Llamadas salientes a Google OAuth.",
+    ["operation", "error"], buckets=_BUCKETS_LATENCIA,
+)
+
+
+def login(via, resultado):
+    LOGINS.labels(via, resultado).inc()
+
+
+# --- 🧱 Middleware ---
+class _ContadorSQL:
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.segundos += time.perf_counter() - inicio
+
+
+class MetricasMiddleware:
+    """Latencia, consultas SQL y tiempo en SQL por request, etiquetados por ruta."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        contador = _ContadorSQL()
+        inicio = time.perf_counter()
+        with ExitStack() as pila:
+            for alias in connections:
+                pila.enter_context(connections[alias].execute_wrapper(contador))
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        match = getattr(request, "resolver_match", None)
+        ruta = (match.url_name or match.route) if match else "sin_ruta"
+        HTTP_LATENCIA.labels(ruta, request.method, response.status_code).observe(duracion)
+        DB_CONSULTAS.labels(ruta).observe(contador.consultas)
+        DB_SEGUNDOS.labels(ruta).observe(contador.segundos)
+        return response
+
+
+# --- 📈 Exposición ---
+def metrics_view(request):
+    """Solo con X-Metrics-Key = METRICS_API_KEY; sin clave configurada, 404 (salvo DEBUG)."""
+    clave = settings.METRICS_API_KEY
+    if not clave:
+        if not settings.DEBUG:
+            raise Http404
+    elif not hmac.compare_digest(request.headers.get("X-Metrics-Key", ""), clave):
+        return HttpResponseForbidden()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return HttpResponse(generate_latest(registro), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_usuario_documentacion_usuario_email_validado_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveFirma',
+            fields=[
+                ('kid', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('algoritmo', models.CharField(choices=[('RS256', 'RSA SHA-256'), ('EdDSA', 'Ed25519')], default='RS256', max_length=10)),
+                ('clave_privada', models.TextField()),
+                ('clave_publica', models.TextField()),
+                ('creada_en', models.DateTimeField(auto_now_add=True)),
+                ('activa_desde', models.DateTimeField()),
+                ('retirada_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'claves_firma_jwt',
+            },
+        ),
+    ]
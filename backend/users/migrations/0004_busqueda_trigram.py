@@ -0,0 +1,66 @@
+from django.db import migrations
+
+# Índice de búsqueda de usuarios (solo Postgres): pg_trgm + unaccent.
+# unaccent() no es IMMUTABLE, así que se envuelve en f_unaccent() para poder indexarla.
+# Todo calificado por esquema: la expresión indexada no puede depender del
+# search_path (en Supabase las extensiones viven en el esquema `extensions`).
+SQL_EXTENSIONES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+]
+
+SQL_FUNCION = """
+    CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT {esquema}.unaccent('{esquema}.unaccent'::regdictionary, $1) $$
+"""
+
+SQL_INDICE = """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS usuarios_busqueda_trgm
+    ON usuarios USING gin ((public.f_unaccent(lower(nombre || ' ' || apellido || ' ' || email))) {esquema}.gin_trgm_ops)
+"""
+
+SQL_ELIMINAR = [
+    "DROP INDEX CONCURRENTLY IF EXISTS usuarios_busqueda_trgm",
+    "DROP FUNCTION IF EXISTS public.f_unaccent(text)",
+]
+
+
+def esquema_extension(schema_editor, extension):
+    """Esquema donde CREATE EXTENSION dejó la extensión (public, extensions…), ya entrecomillado."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT n.nspname FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace "
+            "WHERE e.extname = %s",
+            [extension],
+        )
+        return schema_editor.quote_name(cursor.fetchone()[0])
+
+
+def crear(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in SQL_EXTENSIONES:
+        schema_editor.execute(sql)
+    schema_editor.execute(SQL_FUNCION.format(esquema=esquema_extension(schema_editor, "unaccent")))
+    schema_editor.execute(SQL_INDICE.format(esquema=esquema_extension(schema_editor, "pg_trgm")))
+
+
+def eliminar(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in SQL_ELIMINAR:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ir dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('users', '0003_clavefirma'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear, eliminar),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_busqueda_trigram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(fields=['fecha_registro', 'id'], name='usuarios_fecha_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_usuario_fecha_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilestudiante',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='perfilorientador',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='usuario',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
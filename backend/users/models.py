@@ -1,7 +1,16 @@
 import uuid
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
+from . import hashing
+
+# Relación inversa del perfil de cada rol
+RELACION_PERFIL = {"estudiante": "perfil_estudiante", "orientador": "perfil_orientador"}
+
+# Campos que viajan como claims en los JWT (ver users.authentication)
+CLAIMS_USUARIO = ("email", "nombre", "apellido", "rol", "activo")
+
 
 class UsuarioManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -20,7 +29,27 @@ class UsuarioManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
-class Usuario(AbstractBaseUser, PermissionsMixin):
+class ConVersion(models.Model):
+    """
+    Versión de la fila (ETag / If-Match). Sube en cada save() con
+    `version = version + 1` en el propio UPDATE.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        self.version = models.F("version") + 1
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
+
+
+class Usuario(ConVersion, AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(max_length=255, unique=True)
     nombre = models.CharField(max_length=100)
@@ -58,12 +87,58 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         db_table = "usuarios"
+        indexes = [
+            # Paginación keyset del listado (ver users.pagination)
+            models.Index(fields=["fecha_registro", "id"], name="usuarios_fecha_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.email} ({self.rol})"
 
-
-class PerfilEstudiante(models.Model):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia.recordar_claims()
+        return instancia
+
+    def recordar_claims(self):
+        """Guarda los claims tal como están en la BD (para `claims_cambiaron`)."""
+        self._claims_bd = {c: self.__dict__[c] for c in CLAIMS_USUARIO if c in self.__dict__}
+
+    def claims_cambiaron(self):
+        """True si el último save() cambió algún claim (sin estado previo conocido: sí)."""
+        previos = getattr(self, "_claims_bd", None)
+        if previos is None or len(previos) < len(CLAIMS_USUARIO):
+            return True
+        return any(self.__dict__.get(c) != previos[c] for c in CLAIMS_USUARIO)
+
+    @property
+    def perfil(self):
+        """Perfil según el rol (sin consulta si se cargó con select_related)."""
+        relacion = RELACION_PERFIL.get(self.rol)
+        if relacion is None:
+            return None
+        try:
+            return getattr(self, relacion)
+        except ObjectDoesNotExist:
+            return None
+
+    # 🔐 Hash y verificación en el pool de procesos (users.hashing)
+    def set_password(self, raw_password):
+        self.password = hashing.hashear(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Re-hash por algoritmo/coste, no es un cambio de contraseña
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return hashing.verificar(raw_password, self.password, setter)
+
+
+class PerfilEstudiante(ConVersion):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     usuario = models.OneToOneField(
         Usuario, on_delete=models.CASCADE, db_column="usuario_id", related_name="perfil_estudiante"
@@ -80,7 +155,7 @@ class PerfilEstudiante(models.Model):
    
 
 
-class PerfilOrientador(models.Model):
+class PerfilOrientador(ConVersion):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     usuario = models.OneToOneField(
         Usuario, on_delete=models.CASCADE, db_column="usuario_id", related_name="perfil_orientador"
@@ -93,3 +168,36 @@ class PerfilOrientador(models.Model):
     class Meta:
         db_table = "perfiles_orientadores"
 
+
+
+class ClaveFirmaQuerySet(models.QuerySet):
+    def vigentes(self, ahora):
+        """Claves publicadas en el JWKS: no retiradas todavía."""
+        return self.filter(
+            models.Q(retirada_en__isnull=True) | models.Q(retirada_en__gt=ahora)
+        ).order_by("-activa_desde")
+
+
+class ClaveFirma(models.Model):
+    """Par de claves asimétricas para firmar JWT, identificado por `kid`."""
+    kid = models.CharField(max_length=64, primary_key=True)
+    algoritmo = models.CharField(
+        max_length=10,
+        choices=[("RS256", "RSA SHA-256"), ("EdDSA", "Ed25519")],
+        default="RS256",
+    )
+    clave_privada = models.TextField()
+    clave_publica = models.TextField()
+    creada_en = models.DateTimeField(auto_now_add=True)
+    # Se firma con la clave más reciente cuya activa_desde ya pasó
+    activa_desde = models.DateTimeField()
+    # Tras retirada_en deja de publicarse y de verificarse
+    retirada_en = models.DateTimeField(null=True, blank=True)
+
+    objects = ClaveFirmaQuerySet.as_manager()
+
+    class Meta:
+        db_table = "claves_firma_jwt"
+
+    def __str__(self):
+        return f"{self.kid} ({self.algoritmo})"
@@ -0,0 +1,126 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimar_total(queryset):
+    """
+    Total aproximado sin COUNT(*): en Postgres, la estimación de filas del
+    planificador (EXPLAIN); en otros motores (SQLite en tests), el conteo real.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre (fecha_registro, id) descendente.
+    ✅ WHERE (fecha_registro, id) < (…) + índice compuesto → cada página
+       cuesta lo mismo que la primera, sin OFFSET
+    ✅ Cursor opaco y estable (base64 de la última/primera fila)
+    ✅ ?page_size= acotado por USERS_PAGE_SIZE_MAX
+    ✅ ?total=1 añade `total_estimado` (estimación, no COUNT(*))
+    """
+    campos = ("fecha_registro", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        try:
+            tamano = int(request.query_params.get(self.page_size_query_param, settings.USERS_PAGE_SIZE))
+        except ValueError:
+            tamano = settings.USERS_PAGE_SIZE
+        return max(1, min(tamano, settings.USERS_PAGE_SIZE_MAX))
+
+    # --- 🔐 Cursor opaco ---
+    def encode_cursor(self, fila, atras):
+        valores = [str(getattr(fila, campo)) for campo in self.campos]
+        crudo = json.dumps([valores, int(atras)], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+    def decode_cursor(self, request, modelo):
+        crudo = request.query_params.get(self.cursor_query_param)
+        if not crudo:
+            return None
+        try:
+            valores, atras = json.loads(base64.urlsafe_b64decode(crudo + "=" * (-len(crudo) % 4)))
+            campos = [modelo._meta.get_field(campo) for campo in self.campos]
+            valores = [campo.to_python(valor) for campo, valor in zip(campos, valores, strict=True)]
+        except Exception:
+            raise NotFound("Cursor inválido.")
+        return valores, bool(atras)
+
+    def _despues_de(self, queryset, valores, operador):
+        connection = connections[queryset.db]
+        meta = queryset.model._meta
+        campos = [meta.get_field(campo) for campo in self.campos]
+        columnas = ", ".join(
+            f"{connection.ops.quote_name(meta.db_table)}.{connection.ops.quote_name(c.column)}"
+            for c in campos
+        )
+        marcadores = ", ".join(["%s"] * len(campos))
+        params = [c.get_db_prep_value(v, connection) for c, v in zip(campos, valores)]
+        return RawSQL(f"({columnas}) {operador} ({marcadores})", params, output_field=BooleanField())
+
+    # --- 📄 Página ---
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        descendente = [f"-{campo}" for campo in self.campos]
+
+        atras = False
+        qs = queryset.order_by(*descendente)
+        if cursor:
+            valores, atras = cursor
+            qs = queryset.filter(self._despues_de(queryset, valores, ">" if atras else "<"))
+            qs = qs.order_by(*self.campos) if atras else qs.order_by(*descendente)
+
+        filas = list(qs[: self.page_size + 1])
+        hay_mas = len(filas) > self.page_size
+        filas = filas[: self.page_size]
+        if atras:
+            filas.reverse()
+
+        self.siguiente = filas[-1] if filas and (atras or hay_mas) else None
+        self.anterior = filas[0] if filas and cursor and (hay_mas or not atras) else None
+        self.total = None
+        if request.query_params.get("total") in ("1", "true"):
+            self.total = estimar_total(queryset)
+        return filas
+
+    def _link(self, fila, atras):
+        if fila is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(fila, atras))
+
+    def get_next_link(self):
+        return self._link(self.siguiente, atras=False)
+
+    def get_previous_link(self):
+        return self._link(self.anterior, atras=True)
+
+    def get_paginated_response(self, data):
+        cuerpo = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.total is not None:
+            cuerpo["total_estimado"] = self.total
+        cuerpo["results"] = data
+        return Response(cuerpo)
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
 from rest_framework.permissions import BasePermission
 
 class IsAdmin(BasePermission):
@@ -9,3 +11,12 @@ class IsSelfOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
         return bool(user and user.is_authenticated and (getattr(user, "rol", "") == "admin" or str(obj.id) == str(user.id)))
+
+class HasIntrospectionKey(BasePermission):
+    """Gateway con la clave compartida (cabecera X-Introspect-Key) o un admin autenticado."""
+    def has_permission(self, request, view):
+        clave = settings.INTROSPECT_API_KEY
+        enviada = request.headers.get("X-Introspect-Key", "")
+        if clave and enviada and constant_time_compare(clave, enviada):
+            return True
+        return IsAdmin().has_permission(request, view)
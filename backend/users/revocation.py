@@ -0,0 +1,187 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .sql_budget import fuera_de_presupuesto
+
+
+class BloomFilter:
+    """Filtro de Bloom de tamaño fijo sobre un bytearray (sin falsos negativos)."""
+
+    def __init__(self, capacidad, tasa_fp):
+        capacidad = max(1, capacidad)
+        self.m = max(64, int(-capacidad * math.log(tasa_fp) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.m / capacidad * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _posiciones(self, valor):
+        digest = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def add(self, valor):
+        for pos in self._posiciones(valor):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, valor):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._posiciones(valor))
+
+
+class RevocationIndex:
+    """
+    Índice por worker de los `jti` en la lista negra, delante de Postgres.
+    ✅ Bloom filter: un negativo es definitivo → sin consulta a la BD
+    ✅ LRU exacto con los revocados recientes → positivos sin BD
+    ✅ Solo un positivo del Bloom fuera del LRU consulta la BD (posible falso positivo)
+    Se reconstruye en el primer uso y se actualiza de forma incremental como
+    mucho cada `intervalo` segundos. Los `id` se asignan al insertar, no al
+    hacer commit: una transacción lenta puede aparecer con un `id` menor que
+    el último visto. Por eso cada sincronización relee desde el último `id`
+    que ya se había visto hace `solapamiento` segundos.
+    """
+
+    def __init__(self, capacidad, tasa_fp, tamano_lru, intervalo, solapamiento):
+        self.capacidad = capacidad
+        self.tasa_fp = tasa_fp
+        self.tamano_lru = tamano_lru
+        self.intervalo = intervalo
+        self.solapamiento = solapamiento
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._lru = OrderedDict()
+        self._ultimo_id = 0
+        self._marcas = deque()    # (instante, último id visto) por sincronización
+        self._insertados = 0
+        self._sincronizado_en = None
+        self._contadores = dict.fromkeys(
+            ("consultas", "negativos_bloom", "aciertos_lru", "consultas_bd",
+             "falsos_positivos", "sincronizaciones", "reconstrucciones"), 0,
+        )
+
+    # --- 🧱 Mantenimiento ---
+    def _recordar(self, jti):
+        self._lru[jti] = True
+        self._lru.move_to_end(jti)
+        while len(self._lru) > self.tamano_lru:
+            self._lru.popitem(last=False)
+
+    def _anadir(self, jti):
+        if jti in self._bloom:
+            # Releído en la ventana de solapamiento (o falso positivo: ya consulta la BD)
+            return
+        self._bloom.add(jti)
+        self._insertados += 1
+        self._recordar(jti)
+
+    def reconstruir(self):
+        """Recarga el índice completo (solo tokens revocados aún no expirados)."""
+        with self._lock, fuera_de_presupuesto():
+            self._bloom = BloomFilter(self.capacidad, self.tasa_fp)
+            self._lru = OrderedDict()
+            self._insertados = 0
+            filas = (
+                BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+                .order_by("id")
+                .values_list("id", "token__jti")
+            )
+            for pk, jti in filas.iterator(chunk_size=5000):
+                self._anadir(jti)
+                self._ultimo_id = max(self._ultimo_id, pk)
+            self._sincronizado_en = time.monotonic()
+            self._marcas = deque([(self._sincronizado_en, self._ultimo_id)])
+            self._contadores["reconstrucciones"] += 1
+
+    def _releer_desde(self, ahora):
+        """Último `id` visto hace al menos `solapamiento` segundos (o el más antiguo)."""
+        limite = ahora - self.solapamiento
+        while len(self._marcas) > 1 and self._marcas[1][0] <= limite:
+            self._marcas.popleft()
+        return self._marcas[0][1]
+
+    def sincronizar(self, forzar=False):
+        if self._bloom is None:
+            self.reconstruir()
+            return
+        if not forzar and time.monotonic() - self._sincronizado_en < self.intervalo:
+            return
+        with self._lock, fuera_de_presupuesto():
+            ahora = time.monotonic()
+            nuevos = (
+                BlacklistedToken.objects.filter(id__gt=self._releer_desde(ahora))
+                .order_by("id")
+                .values_list("id", "token__jti")
+            )
+            for pk, jti in nuevos:
+                self._anadir(jti)
+                self._ultimo_id = max(self._ultimo_id, pk)
+            self._sincronizado_en = ahora
+            self._marcas.append((ahora, self._ultimo_id))
+            self._contadores["sincronizaciones"] += 1
+            saturado = self._insertados > self.capacidad
+
+        if saturado:
+            # Demasiadas inserciones → la tasa de falsos positivos se dispara
+            self.reconstruir()
+        self._notificar()
+
+    # --- 🔎 Consultas ---
+    def revocar(self, jti):
+        """Registra una revocación hecha en este worker (visible al instante)."""
+        if self._bloom is None:
+            self.reconstruir()
+        with self._lock:
+            self._anadir(jti)
+
+    def esta_revocado(self, jti):
+        self.sincronizar()
+        self._contadores["consultas"] += 1
+
+        if jti in self._lru:
+            self._contadores["aciertos_lru"] += 1
+            return True
+        if jti not in self._bloom:
+            self._contadores["negativos_bloom"] += 1
+            return False
+
+        self._contadores["consultas_bd"] += 1
+        revocado = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if revocado:
+            with self._lock:
+                self._recordar(jti)
+        else:
+            self._contadores["falsos_positivos"] += 1
+        return revocado
+
+    # --- 📊 Estadísticas ---
+    def stats(self):
+        contadores = dict(self._contadores)
+        consultas = contadores["consultas"] or 1
+        contadores.update({
+            "tasa_sin_bd": 1 - contadores["consultas_bd"] / consultas,
+            "tasa_falsos_positivos": contadores["falsos_positivos"] / consultas,
+            "entradas_bloom": self._insertados,
+            "entradas_lru": len(self._lru),
+            "bytes_bloom": len(self._bloom.bits) if self._bloom else 0,
+        })
+        return contadores
+
+    def _notificar(self):
+        if settings.REVOCATION_STATS_HOOK:
+            import_string(settings.REVOCATION_STATS_HOOK)(self.stats())
+
+
+revocation_index = RevocationIndex(
+    capacidad=settings.REVOCATION_BLOOM_CAPACITY,
+    tasa_fp=settings.REVOCATION_BLOOM_FP_RATE,
+    tamano_lru=settings.REVOCATION_LRU_SIZE,
+    intervalo=settings.REVOCATION_SYNC_INTERVAL,
+    solapamiento=settings.REVOCATION_SYNC_OVERLAP,
+)
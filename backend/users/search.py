@@ -0,0 +1,44 @@
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Misma expresión que el índice GIN de las migraciones 0004/0007 (deben coincidir
+# para que Postgres use el índice). f_unaccent va calificada: no depende del search_path
+EXPRESION_BUSQUEDA = "public.f_unaccent(lower(nombre || ' ' || apellido || ' ' || email))"
+
+
+def _escapar_like(texto):
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def buscar_usuarios(qs, q, limite):
+    """
+    Búsqueda de usuarios por nombre, apellido o email.
+    🐘 Postgres: índice GIN pg_trgm sobre la expresión sin tildes
+       → coincidencia por subcadena (LIKE) o por similitud de palabra (<%),
+       ordenada por relevancia.
+    🪶 Otros motores (SQLite en tests): el filtro `icontains` de siempre.
+    """
+    if connection.vendor != "postgresql":
+        return qs.filter(
+            Q(email__icontains=q) |
+            Q(nombre__icontains=q) |
+            Q(apellido__icontains=q)
+        )[:limite]
+
+    patron = f"%{_escapar_like(q.lower())}%"
+    coincide = RawSQL(
+        f"({EXPRESION_BUSQUEDA} LIKE public.f_unaccent(%s) OR public.f_unaccent(lower(%s)) <%% {EXPRESION_BUSQUEDA})",
+        (patron, q),
+        output_field=BooleanField(),
+    )
+    relevancia = RawSQL(
+        f"word_similarity(public.f_unaccent(lower(%s)), {EXPRESION_BUSQUEDA})",
+        (q,),
+        output_field=FloatField(),
+    )
+    return (
+        qs.filter(coincide)
+        .annotate(relevancia=relevancia)
+        .order_by("-relevancia", "-fecha_registro")[:limite]
+    )
@@ -1,11 +1,15 @@
 import re
-import dns.resolver
-import os
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import authenticate
-from django.utils import timezone
+from django.db import IntegrityError, transaction
+from .blocklist import DisposableBlocklist
+from .email_domains import mx_cache
+from . import metrics
+from .last_seen import last_seen
 from .models import Usuario, PerfilEstudiante, PerfilOrientador
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+# 🚀 Serializer para JWT extendido: uno solo, definido en serializers_jwt
+from .serializers_jwt import CustomTokenObtainPairSerializer  # noqa: F401
 
 
 # 🧩 1. Serializer general de Usuario
@@ -38,6 +42,45 @@ class UsuarioSerializer(serializers.ModelSerializer):
         return instance
 
 
+# 👤 Perfiles (solo lectura, anidados según el rol)
+class PerfilEstudianteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PerfilEstudiante
+        fields = [
+            "intereses", "habilidades", "carrera_interes", "grado_academico",
+            "institucion_id", "actualmente_estudiando",
+        ]
+
+
+class PerfilOrientadorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PerfilOrientador
+        fields = ["especialidad", "experiencia", "certificaciones", "institucion_id"]
+
+
+PERFIL_SERIALIZERS = {
+    "estudiante": PerfilEstudianteSerializer,
+    "orientador": PerfilOrientadorSerializer,
+}
+
+
+class UsuarioConPerfilSerializer(UsuarioSerializer):
+    """
+    Usuario + el perfil de su rol (`perfil`: null para admin/institución).
+    Pensado para querysets con select_related de ambos perfiles.
+    """
+    perfil = serializers.SerializerMethodField()
+
+    class Meta(UsuarioSerializer.Meta):
+        fields = UsuarioSerializer.Meta.fields + ["perfil"]
+
+    def get_perfil(self, obj):
+        perfil = obj.perfil
+        if perfil is None:
+            return None
+        return PERFIL_SERIALIZERS[obj.rol](perfil).data
+
+
 # 🔐 2. Serializer de Login clásico
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -49,25 +92,22 @@ class LoginSerializer(serializers.Serializer):
 
         user = authenticate(request=self.context.get("request"), email=email, password=password)
         if not user:
+            metrics.login("login", "bad_credentials")
             raise serializers.ValidationError("Credenciales inválidas")
 
-        user.ultimo_login = timezone.now()
-        user.save(update_fields=["ultimo_login"])
+        last_seen.registrar(user.pk)
+        metrics.login("login", "success")
         attrs["user"] = user
         return attrs
 
 
-# 🚀 3. Serializer para JWT extendido
-class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    """Extiende el token JWT para incluir más datos del usuario."""
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        token["email"] = user.email
-        token["nombre"] = user.nombre
-        token["apellido"] = user.apellido
-        token["rol"] = user.rol
-        return token
+# 🔎 Introspección por lotes (gateway)
+class IntrospectBatchSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.INTROSPECT_BATCH_MAX,
+    )
 
 
 # 🚫 Dominios temporales conocidos
@@ -77,8 +117,15 @@ DISPOSABLE_DOMAINS = {
     "maildrop.cc", "getnada.com", "dispostable.com", "mailnesia.com",
 }
 
-# ⚙️ Variable de entorno: valida MX solo en producción
-VALIDAR_DOMINIO_EMAIL = os.getenv("VALIDAR_DOMINIO_EMAIL", "0") == "1"
+# 📚 Índice con subdominios + lista externa (DISPOSABLE_DOMAINS_FILE) con recarga en caliente
+disposable_blocklist = DisposableBlocklist(
+    DISPOSABLE_DOMAINS,
+    ruta=settings.DISPOSABLE_DOMAINS_FILE,
+    intervalo=settings.DISPOSABLE_DOMAINS_RELOAD,
+)
+
+# ⚙️ Variable de entorno: valida MX solo en producción (caché en users.email_domains)
+VALIDAR_DOMINIO_EMAIL = settings.VALIDAR_DOMINIO_EMAIL
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -87,6 +134,8 @@ class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = Usuario
         fields = ["nombre", "apellido", "email", "password", "rol", "telefono"]
+        # La restricción UNIQUE de la tabla ya impide duplicados: sin exists() previo
+        extra_kwargs = {"email": {"validators": []}}
 
     # --- 🧠 Validación avanzada del email ---
     def validate_email(self, value):
@@ -97,23 +146,16 @@ class RegisterSerializer(serializers.ModelSerializer):
         dominio = value.split("@")[1].lower()
 
         # ❌ Bloquear dominios temporales
-        if dominio in DISPOSABLE_DOMAINS:
+        if disposable_blocklist.bloqueado(dominio):
             raise serializers.ValidationError(
                 "No se permiten correos temporales o desechables."
             )
 
         # ✅ Validar dominio DNS solo si está activado
-        if VALIDAR_DOMINIO_EMAIL:
-            try:
-                dns.resolver.resolve(dominio, "MX")
-            except Exception:
-                raise serializers.ValidationError(
-                    f"El dominio '{dominio}' no parece tener un servidor de correo configurado."
-                )
-
-        # 🔁 Evitar duplicados
-        if Usuario.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Este correo ya está registrado.")
+        if VALIDAR_DOMINIO_EMAIL and not mx_cache.tiene_mx(dominio):
+            raise serializers.ValidationError(
+                f"El dominio '{dominio}' no parece tener un servidor de correo configurado."
+            )
 
         return value
 
@@ -129,12 +171,52 @@ class RegisterSerializer(serializers.ModelSerializer):
             user.activo = False
 
         # ✅ Se considera el email validado tras pasar la verificación
-        user.save()
+        # 🔁 Duplicados: los detecta el INSERT (UNIQUE), no una consulta previa
+        try:
+            with transaction.atomic():
+                user.save()
+
+                # Crear perfiles según rol
+                if rol == "estudiante":
+                    PerfilEstudiante.objects.create(usuario=user)
+                elif rol == "orientador":
+                    PerfilOrientador.objects.create(usuario=user)
+        except IntegrityError:
+            if Usuario.objects.filter(email=user.email).exists():
+                raise serializers.ValidationError({"email": ["Este correo ya está registrado."]})
+            raise
+
+        return user
 
-        # Crear perfiles según rol
-        if rol == "estudiante":
-            PerfilEstudiante.objects.create(usuario=user)
-        elif rol == "orientador":
-            PerfilOrientador.objects.create(usuario=user)
+# 📥 Fila de importación masiva (ver users.bulk_import)
+class FilaImportSerializer(serializers.Serializer):
+    """
+    Valida una fila del archivo de importación. Sin `exists()` ni MX por fila:
+    los duplicados se resuelven por lote y el dominio solo contra la lista
+    de desechables.
+    """
+    email = serializers.EmailField(max_length=255)
+    nombre = serializers.CharField(max_length=100)
+    apellido = serializers.CharField(max_length=100)
+    password = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    rol = serializers.ChoiceField(choices=["estudiante", "orientador", "institucion"], default="estudiante")
+    telefono = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    fecha_nacimiento = serializers.DateField(required=False, allow_null=True)
+    activo = serializers.BooleanField(default=True)
+
+    # Perfil (según el rol)
+    institucion_id = serializers.UUIDField(required=False, allow_null=True)
+    intereses = serializers.CharField(required=False, allow_blank=True)
+    habilidades = serializers.CharField(required=False, allow_blank=True)
+    carrera_interes = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    grado_academico = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    actualmente_estudiando = serializers.BooleanField(required=False)
+    especialidad = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    experiencia = serializers.CharField(required=False, allow_blank=True)
+    certificaciones = serializers.CharField(required=False, allow_blank=True)
 
-        return user
\ No newline at end of file
+    def validate_email(self, value):
+        value = Usuario.objects.normalize_email(value)
+        if disposable_blocklist.bloqueado(value.split("@")[1].lower()):
+            raise serializers.ValidationError("No se permiten correos temporales o desechables.")
+        return value
@@ -1,4 +1,9 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from . import metrics
+from .last_seen import last_seen
+from .token_service import claims_usuario, emitir_tokens
+from .tokens import RefreshToken
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
@@ -8,12 +13,35 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def get_token(cls, user):
         token = super().get_token(user)
 
-        # 🔹 Agregamos información adicional al payload
-        token["email"] = user.email
-        token["nombre"] = user.nombre
-        token["apellido"] = user.apellido
-        token["rol"] = user.rol
-        token["id"] = str(user.id)
-        token["activo"] = user.activo
+        # 🔹 Mismos claims que el resto de logins (users.token_service)
+        for claim, valor in claims_usuario(user).items():
+            token[claim] = valor
 
         return token
+
+    def validate(self, attrs):
+        # Autenticación de TokenObtainSerializer; la emisión, en un solo paso
+        try:
+            data = super(TokenObtainPairSerializer, self).validate(attrs)
+        except AuthenticationFailed:
+            # simplejwt no distingue credenciales incorrectas de cuenta inactiva
+            metrics.login("token", "bad_credentials")
+            raise
+        data.update(emitir_tokens(self.user))
+        last_seen.registrar(self.user.pk)
+        metrics.login("token", "success")
+        return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh que comprueba la lista negra con el índice en memoria.
+    """
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        metrics.TOKENS_EMITIDOS.labels("access").inc()
+        if "refresh" in data:
+            metrics.TOKENS_EMITIDOS.labels("refresh").inc()
+        return data
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import cache_key_claims, cache_key_inactivo, cache_key_usuario
+from .models import PerfilEstudiante, PerfilOrientador, Usuario
+from .user_cache import user_repr_cache
+
+
+def _ttl_marca_inactivo():
+    # La marca debe vivir al menos lo que vive un access token ya emitido
+    return int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds())
+
+
+def _ttl_marca_claims():
+    # El refresh copia sus claims (y su iat) a cada access nuevo: dura lo que un refresh
+    return int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
+
+
+@receiver(post_save, sender=Usuario)
+def invalidar_cache_auth(sender, instance, created, **kwargs):
+    """Invalida la caché de autenticación al guardar (o desactivar) un Usuario."""
+    cache.delete(cache_key_usuario(instance.pk))
+    if not created and instance.claims_cambiaron():
+        # Los tokens ya emitidos llevan el rol/estado anterior: dejan de valer sus claims
+        cache.set(cache_key_claims(instance.pk), time.time(), timeout=_ttl_marca_claims())
+    instance.recordar_claims()
+    if instance.activo:
+        cache.delete(cache_key_inactivo(instance.pk))
+    else:
+        cache.set(cache_key_inactivo(instance.pk), True, timeout=_ttl_marca_inactivo())
+
+
+@receiver(post_delete, sender=Usuario)
+def invalidar_cache_auth_borrado(sender, instance, **kwargs):
+    cache.delete(cache_key_usuario(instance.pk))
+    cache.set(cache_key_inactivo(instance.pk), True, timeout=_ttl_marca_inactivo())
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_representacion(sender, instance, **kwargs):
+    """Nueva versión de la representación cacheada (users.user_cache)."""
+    user_repr_cache.invalidar(instance.pk)
+
+
+@receiver(post_save, sender=PerfilEstudiante)
+@receiver(post_delete, sender=PerfilEstudiante)
+@receiver(post_save, sender=PerfilOrientador)
+@receiver(post_delete, sender=PerfilOrientador)
+def invalidar_representacion_perfil(sender, instance, **kwargs):
+    user_repr_cache.invalidar(instance.usuario_id)
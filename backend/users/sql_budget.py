@@ -0,0 +1,142 @@
+"""
+Presupuesto de SQL por request.
+
+Cada ruta (nombre de la URL, o "MÉTODO nombre" si un método necesita otro
+límite) declara en settings.SQL_BUDGETS cuántas sentencias puede ejecutar
+como máximo. SQLBudgetMiddleware registra todas las sentencias de la request
+(duración y punto de llamada en el código del proyecto) y, si la ruta se
+pasa, lo deja en el log (SQL_BUDGET_MODE=log) o falla (SQL_BUDGET_MODE=raise,
+para desarrollo y CI).
+
+No cuentan:
+- el control de transacciones (BEGIN, COMMIT, SAVEPOINT…)
+- el mantenimiento periódico de las cachés en proceso (llavero, índice de
+  revocados, volcado de ultimo_login), marcado con `fuera_de_presupuesto()`
+
+En tests:
+    with capturar_sql() as registro:
+        client.post(reverse("login"), datos)
+    comprobar_presupuesto("login", registro, "POST")
+"""
+import logging
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE SAVEPOINT")
+_fuera = ContextVar("sql_fuera_de_presupuesto", default=False)
+# Middlewares que envuelven las consultas: no aportan nada a la pila
+_SIN_PILA = ("users/sql_budget.py", "users/metrics.py")
+
+
+@contextmanager
+def fuera_de_presupuesto():
+    """Las sentencias del bloque se registran pero no cuentan para el presupuesto."""
+    token = _fuera.set(True)
+    try:
+        yield
+    finally:
+        _fuera.reset(token)
+
+
+class PresupuestoSQLExcedido(AssertionError):
+    pass
+
+
+def _punto_de_llamada(profundidad=4):
+    """Últimos marcos del código del proyecto (sin Django ni dependencias)."""
+    raiz = str(settings.BASE_DIR)
+    marcos = traceback.StackSummary.extract(traceback.walk_stack(None), lookup_lines=False)
+    propios = []
+    for m in marcos:
+        relativo = m.filename[len(raiz) + 1:]
+        if m.filename.startswith(raiz) and "site-packages" not in m.filename and relativo not in _SIN_PILA:
+            propios.append(f"{relativo}:{m.lineno} {m.name}")
+    return propios[:profundidad]
+
+
+class RegistroSQL:
+    """execute_wrapper que guarda cada sentencia con su duración y su origen."""
+
+    def __init__(self):
+        self.sentencias = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sentencias.append({
+                "alias": context["connection"].alias,
+                "sql": sql,
+                "ms": (time.perf_counter() - inicio) * 1000,
+                "pila": _punto_de_llamada(),
+                "cuenta": not _fuera.get() and not sql.lstrip().upper().startswith(_CONTROL),
+            })
+
+    @property
+    def contadas(self):
+        return [s for s in self.sentencias if s["cuenta"]]
+
+    def informe(self):
+        lineas = []
+        for i, s in enumerate(self.sentencias, 1):
+            marca = "" if s["cuenta"] else " (no cuenta)"
+            lineas.append(f"{i:>3}. [{s['alias']}] {s['ms']:.1f} ms{marca}: {s['sql'][:300]}")
+            lineas.extend(f"       ← {marco}" for marco in s["pila"])
+        return "\n".join(lineas)
+
+
+@contextmanager
+def capturar_sql():
+    """Registra las sentencias de todas las bases de datos dentro del bloque (hilo actual)."""
+    registro = RegistroSQL()
+    with ExitStack() as pila:
+        for alias in connections:
+            pila.enter_context(connections[alias].execute_wrapper(registro))
+        yield registro
+
+
+def presupuesto(ruta, metodo=None):
+    presupuestos = settings.SQL_BUDGETS
+    return presupuestos.get(f"{metodo} {ruta}", presupuestos.get(ruta))
+
+
+def comprobar_presupuesto(ruta, registro, metodo=None, limite=None):
+    """Falla con el detalle de las sentencias si `ruta` supera su presupuesto."""
+    limite = presupuesto(ruta, metodo) if limite is None else limite
+    if limite is None:
+        raise KeyError(f"La ruta {ruta!r} no tiene presupuesto en SQL_BUDGETS")
+    usadas = len(registro.contadas)
+    if usadas > limite:
+        raise PresupuestoSQLExcedido(
+            f"{ruta}: {usadas} consultas (presupuesto {limite})\n{registro.informe()}"
+        )
+
+
+class SQLBudgetMiddleware:
+    """Aplica SQL_BUDGETS a cada request (ver docstring del módulo)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capturar_sql() as registro:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        ruta = match.url_name if match else None
+        if presupuesto(ruta, request.method) is not None:
+            try:
+                comprobar_presupuesto(ruta, registro, request.method)
+            except PresupuestoSQLExcedido as e:
+                if settings.SQL_BUDGET_MODE == "raise":
+                    raise
+                logger.warning("Presupuesto SQL excedido en %s %s\n%s", request.method, request.path, e)
+        return response
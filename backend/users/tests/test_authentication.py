@@ -0,0 +1,72 @@
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import Usuario
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.user = crear_usuario("estudiante@example.com")
+        self.client = cliente(self.user)
+
+    def test_sin_consultas_con_claims(self):
+        self.client.get(reverse("users-me"))   # llavero y caché de representación
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse("users-me")).status_code, 200)
+
+    def test_usuario_desactivado_recibe_401(self):
+        self.assertEqual(self.client.get(reverse("users-me")).status_code, 200)
+        self.user.activo = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("users-me")).status_code, 401)
+
+    def test_usuario_degradado_pierde_el_rol_del_token(self):
+        admin = crear_usuario("admin@example.com", rol="admin")
+        client = cliente(admin)
+        self.assertEqual(client.get(reverse("users-list")).status_code, 200)
+        admin.rol = "estudiante"
+        admin.save()
+        # El token sigue diciendo rol=admin; la marca obliga a leer el rol actual
+        self.assertEqual(client.get(reverse("users-list")).status_code, 403)
+
+    def test_token_posterior_al_cambio_usa_los_claims(self):
+        # Cambio unos segundos antes de emitir el token nuevo
+        with mock.patch("users.signals.time.time", return_value=time.time() - 5):
+            self.user.apellido = "Nuevo"
+            self.user.save()
+        client = cliente(Usuario.objects.get(pk=self.user.pk))
+        client.get(reverse("users-me"))
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get(reverse("users-me")).status_code, 200)
+
+    def test_guardar_sin_cambiar_claims_no_marca(self):
+        user = Usuario.objects.get(pk=self.user.pk)
+        user.save()
+        self.client.get(reverse("users-me"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse("users-me")).status_code, 200)
+
+    def test_usuario_borrado_recibe_401(self):
+        self.user.delete()
+        self.assertEqual(self.client.get(reverse("users-me")).status_code, 401)
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_varios_workers_sin_cache_compartida_consulta_la_bd(self):
+        # update() no emite post_save: es lo que ve un worker distinto del
+        # que desactivó al usuario (la marca quedó en la LocMem del otro)
+        Usuario.objects.filter(pk=self.user.pk).update(activo=False)
+        self.assertEqual(self.client.get(reverse("users-me")).status_code, 401)
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_varios_workers_una_consulta_por_ttl(self):
+        self.client.get(reverse("users-me"))
+        # Solo la lectura de /me (sin caché de representaciones): el usuario
+        # autenticado sale de la caché por usuario
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse("users-me")).status_code, 200)
@@ -0,0 +1,84 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from users.blocklist import DisposableBlocklist, SuffixIndex
+
+from .utils import CLAVE, cliente
+
+
+class SuffixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.indice = SuffixIndex(["mailinator.com", "Yopmail.COM.", "co.uk.example", "", "  "])
+
+    def test_dominio_y_subdominios(self):
+        for dominio in ("mailinator.com", "x.mailinator.com", "a.b.mailinator.com", "YOPMAIL.com", "yopmail.com."):
+            self.assertIn(dominio, self.indice)
+
+    def test_no_coincide_por_sufijo_de_texto(self):
+        # "notmailinator.com" termina igual, pero no es un subdominio
+        for dominio in ("notmailinator.com", "mailinator.co", "com", "gmail.com", "mailinator.com.evil.org"):
+            self.assertNotIn(dominio, self.indice)
+
+    def test_entradas_vacias_y_duplicadas(self):
+        self.assertEqual(len(SuffixIndex(["a.com", "A.com", "", "b.com"])), 2)
+        self.assertNotIn("a.com", SuffixIndex([]))
+
+
+class DisposableBlocklistTests(SimpleTestCase):
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "dominios.txt")
+        self.escribir("# lista comunitaria\nguerrillamail.com\n\nspam.example  # comentario\n", mtime=100)
+
+    def escribir(self, texto, mtime):
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            f.write(texto)
+        os.utime(self.ruta, (mtime, mtime))
+
+    def test_base_mas_archivo(self):
+        lista = DisposableBlocklist({"mailinator.com"}, ruta=self.ruta, intervalo=60)
+        for dominio in ("mailinator.com", "guerrillamail.com", "x.spam.example"):
+            self.assertTrue(lista.bloqueado(dominio), dominio)
+        self.assertFalse(lista.bloqueado("gmail.com"))
+
+    def test_recarga_en_caliente_al_cambiar_el_mtime(self):
+        lista = DisposableBlocklist({"mailinator.com"}, ruta=self.ruta, intervalo=60)
+        self.escribir("nuevo.example\n", mtime=200)
+        with mock.patch("users.blocklist.threading.Thread") as hilo, \
+                mock.patch("users.blocklist.time.monotonic", return_value=1000.0):
+            # Mientras se construye el índice nuevo se sigue usando el anterior
+            self.assertFalse(lista.bloqueado("nuevo.example"))
+            self.assertFalse(lista.bloqueado("nuevo.example"))
+        hilo.assert_called_once_with(target=lista._recargar_en_fondo, daemon=True)
+
+        lista._recargar_en_fondo()
+        self.assertTrue(lista.bloqueado("nuevo.example"))
+        self.assertTrue(lista.bloqueado("mailinator.com"))
+        self.assertFalse(lista.bloqueado("guerrillamail.com"))
+
+    def test_sin_cambios_no_recarga(self):
+        lista = DisposableBlocklist(set(), ruta=self.ruta, intervalo=60)
+        with mock.patch("users.blocklist.threading.Thread") as hilo, \
+                mock.patch("users.blocklist.time.monotonic", return_value=1000.0):
+            lista.bloqueado("gmail.com")
+        hilo.assert_not_called()
+
+    def test_archivo_ilegible_conserva_el_indice(self):
+        lista = DisposableBlocklist({"mailinator.com"}, ruta=self.ruta, intervalo=60)
+        os.remove(self.ruta)
+        with self.assertLogs("users.blocklist", "WARNING"):
+            lista.recargar()
+        self.assertTrue(lista.bloqueado("guerrillamail.com"))
+
+
+class RegistroDesechableTests(TestCase):
+    def test_registro_con_subdominio_desechable(self):
+        datos = {"email": "a@x.mailinator.com", "password": CLAVE, "nombre": "N", "apellido": "A"}
+        respuesta = cliente().post(reverse("register"), datos, format="json")
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("email", respuesta.data)
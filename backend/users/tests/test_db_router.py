@@ -0,0 +1,91 @@
+import time
+from unittest import mock
+
+from django.db import router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from auth_service.db_router import ReplicaStickinessMiddleware
+from users.models import ClaveFirma, Usuario
+
+from .utils import limpiar_caches
+
+
+@override_settings(
+    DATABASE_ROUTERS=["auth_service.db_router.ReplicaRouter"],
+    REPLICA_STICKY_SECONDS=1,
+)
+class ReplicaRouterTests(TransactionTestCase):
+    # Dos bases independientes: lo que se escribe en default no está en la
+    # réplica, así se ve de cuál leyó cada consulta
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        limpiar_caches()
+        self.factory = RequestFactory()
+
+    def request(self, vista, token="a", **meta):
+        middleware = ReplicaStickinessMiddleware(lambda request: vista() or HttpResponse())
+        if token:
+            meta["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return middleware(self.factory.get("/", **meta))
+
+    def test_lecturas_a_la_replica(self):
+        self.assertEqual(router.db_for_read(Usuario), "replica")
+        Usuario.objects.create(email="nuevo@example.com", nombre="N", apellido="A")
+        self.assertFalse(Usuario.objects.filter(email="nuevo@example.com").exists())
+
+    def test_escrituras_al_primario(self):
+        self.assertEqual(router.db_for_write(Usuario), "default")
+
+    def test_dentro_de_atomic_lee_del_primario(self):
+        with transaction.atomic():
+            Usuario.objects.create(email="nuevo@example.com", nombre="N", apellido="A")
+            self.assertEqual(router.db_for_read(Usuario), "default")
+            self.assertTrue(Usuario.objects.filter(email="nuevo@example.com").exists())
+
+    def test_tokens_revocados_y_claves_siempre_al_primario(self):
+        for modelo in (OutstandingToken, BlacklistedToken, ClaveFirma):
+            self.assertEqual(router.db_for_read(modelo), "default", modelo)
+
+    def test_tras_escribir_el_resto_de_la_request_lee_del_primario(self):
+        vistos = []
+
+        def vista():
+            vistos.append(router.db_for_read(Usuario))
+            Usuario.objects.create(email="nuevo@example.com", nombre="N", apellido="A")
+            vistos.append(router.db_for_read(Usuario))
+            vistos.append(Usuario.objects.filter(email="nuevo@example.com").exists())
+
+        self.request(vista)
+        self.assertEqual(vistos, ["replica", "default", True])
+
+    def test_el_mismo_cliente_sigue_en_el_primario_durante_replica_sticky_seconds(self):
+        self.request(lambda: Usuario.objects.create(email="nuevo@example.com", nombre="N", apellido="A"))
+
+        vistos = []
+        self.request(lambda: vistos.append(router.db_for_read(Usuario)))
+        self.request(lambda: vistos.append(router.db_for_read(Usuario)), token="otro-cliente")
+        time.sleep(1.1)
+        self.request(lambda: vistos.append(router.db_for_read(Usuario)))
+        self.assertEqual(vistos, ["default", "replica", "replica"])
+
+    @override_settings(REPLICA_STICKY_SECONDS=60)
+    def test_anonimos_se_distinguen_por_la_ip_del_proxy(self):
+        # Detrás del proxy REMOTE_ADDR es el del proxy para todos
+        proxy = {"REMOTE_ADDR": "10.0.0.1"}
+        self.request(
+            lambda: Usuario.objects.create(email="nuevo@example.com", nombre="N", apellido="A"),
+            token=None, HTTP_X_FORWARDED_FOR="203.0.113.7", **proxy,
+        )
+        vistos = []
+        for ip in ("203.0.113.7", "198.51.100.2"):
+            self.request(lambda: vistos.append(router.db_for_read(Usuario)), token=None, HTTP_X_FORWARDED_FOR=ip, **proxy)
+        self.assertEqual(vistos, ["default", "replica"])
+
+    def test_sin_cache_compartida_todo_lee_del_primario(self):
+        vistos = []
+        with mock.patch("auth_service.db_router.es_compartida", return_value=False):
+            self.request(lambda: vistos.append(router.db_for_read(Usuario)))
+        self.assertEqual(vistos, ["default"])
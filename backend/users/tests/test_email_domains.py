@@ -0,0 +1,100 @@
+import threading
+from unittest import mock
+
+import dns.exception
+import dns.resolver
+from django.test import SimpleTestCase
+
+from users.email_domains import MXVerdictCache
+
+
+def respuesta_mx(ttl):
+    return mock.Mock(rrset=mock.Mock(ttl=ttl))
+
+
+class MXVerdictCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = MXVerdictCache(plazo=1.5, ttl_min=300, ttl_max=3600, ttl_negativo=900, max_entradas=2)
+        patcher = mock.patch("dns.resolver.Resolver")
+        self.resolver = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        reloj = mock.patch("users.email_domains.time.monotonic", return_value=1000.0)
+        self.reloj = reloj.start()
+        self.addCleanup(reloj.stop)
+
+    def test_ttl_del_registro_mx_acotado(self):
+        self.resolver.resolve.return_value = respuesta_mx(60)
+        self.assertTrue(self.cache.tiene_mx("Example.COM."))
+        self.assertEqual(self.cache._veredictos["example.com"], (True, 1000.0 + 300))
+
+        self.resolver.resolve.return_value = respuesta_mx(10 ** 6)
+        self.cache.tiene_mx("otro.com")
+        self.assertEqual(self.cache._veredictos["otro.com"], (True, 1000.0 + 3600))
+
+    def test_cacheado_hasta_que_expira(self):
+        self.resolver.resolve.return_value = respuesta_mx(600)
+        self.cache.tiene_mx("example.com")
+        self.reloj.return_value = 1599.0
+        self.cache.tiene_mx("example.com")
+        self.assertEqual(self.resolver.resolve.call_count, 1)
+        self.reloj.return_value = 1600.0
+        self.cache.tiene_mx("example.com")
+        self.assertEqual(self.resolver.resolve.call_count, 2)
+
+    def test_nxdomain_en_cache_negativa(self):
+        self.resolver.resolve.side_effect = dns.resolver.NXDOMAIN()
+        self.assertFalse(self.cache.tiene_mx("no-existe.example"))
+        self.assertFalse(self.cache.tiene_mx("no-existe.example"))
+        self.assertEqual(self.resolver.resolve.call_count, 1)
+        self.assertEqual(self.cache._veredictos["no-existe.example"], (False, 1000.0 + 900))
+
+    def test_timeout_acepta_y_no_cachea(self):
+        self.resolver.resolve.side_effect = dns.exception.Timeout()
+        with self.assertLogs("users.email_domains", "WARNING"):
+            self.assertTrue(self.cache.tiene_mx("lento.example"))
+            self.assertTrue(self.cache.tiene_mx("lento.example"))
+        self.assertEqual(self.resolver.resolve.call_count, 2)
+        self.assertNotIn("lento.example", self.cache._veredictos)
+
+    def test_plazo_del_resolver(self):
+        self.resolver.resolve.return_value = respuesta_mx(600)
+        self.cache.tiene_mx("example.com")
+        self.assertEqual((self.resolver.lifetime, self.resolver.timeout), (1.5, 1.5))
+
+    def test_entradas_acotadas(self):
+        self.resolver.resolve.return_value = respuesta_mx(600)
+        for dominio in ("a.com", "b.com", "c.com"):
+            self.cache.tiene_mx(dominio)
+        self.assertEqual(list(self.cache._veredictos), ["b.com", "c.com"])
+
+    def test_consultas_concurrentes_se_agrupan(self):
+        empezada, liberar = threading.Event(), threading.Event()
+
+        def resolver_lento(*args):
+            empezada.set()
+            liberar.wait(5)
+            return respuesta_mx(600)
+
+        self.resolver.resolve.side_effect = resolver_lento
+        resultados = []
+        propietario = threading.Thread(target=lambda: resultados.append(self.cache.tiene_mx("example.com")))
+        propietario.start()
+        empezada.wait(5)
+        seguidores = [
+            threading.Thread(target=lambda: resultados.append(self.cache.tiene_mx("example.com")))
+            for _ in range(3)
+        ]
+        for hilo in seguidores:
+            hilo.start()
+        liberar.set()
+        for hilo in (propietario, *seguidores):
+            hilo.join(5)
+
+        self.assertEqual(resultados, [True] * 4)
+        self.assertEqual(self.resolver.resolve.call_count, 1)
+
+    def test_seguidor_no_espera_mas_que_el_plazo(self):
+        self.cache.plazo = 0.01
+        self.cache._en_curso["example.com"] = mock.Mock(**{"result.side_effect": TimeoutError})
+        self.assertTrue(self.cache.tiene_mx("example.com"))
+        self.resolver.resolve.assert_not_called()
@@ -0,0 +1,47 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import CLAVE, cliente, crear_usuario, limpiar_caches
+
+
+class ETagUsuarioTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.user = crear_usuario("estudiante@example.com")
+        self.client = cliente(self.user)
+        self.url = reverse("users-detail", args=[self.user.pk])
+
+    def test_if_none_match_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        respuesta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_login_no_cambia_la_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        respuesta = cliente().post(reverse("login"), {"email": self.user.email, "password": CLAVE}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        limpiar_caches()
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)
+        # El cliente que tenía la ETag puede seguir editando
+        respuesta = self.client.patch(self.url, {"nombre": "Nuevo"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta["ETag"], etag)
+
+    def test_login_actualiza_ultimo_login_sin_cambiar_la_etag(self):
+        respuesta = self.client.get(self.url)
+        self.assertIn("ultimo_login", respuesta.data)
+        self.assertIsNone(respuesta.data["ultimo_login"])
+        etag = respuesta["ETag"]
+
+        cliente().post(reverse("login"), {"email": self.user.email, "password": CLAVE}, format="json")
+        # Sin vaciar cachés: la representación cacheada se renovó con el volcado
+        respuesta = self.client.get(self.url)
+        self.assertIsNotNone(respuesta.data["ultimo_login"])
+        self.assertEqual(respuesta["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_if_match_desactualizado_412(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.patch(self.url, {"nombre": "Uno"}, format="json")
+        respuesta = self.client.patch(self.url, {"nombre": "Dos"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 412)
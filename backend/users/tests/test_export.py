@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.export import COLUMNAS_EXPORT
+from users.models import Usuario
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.admin = crear_usuario("admin@example.com", rol="admin")
+        crear_usuario("ana@example.com", nombre="Ána", apellido="Pérez, Gil")
+        crear_usuario("orientador@example.com", rol="orientador")
+        crear_usuario("baja@example.com", activo=False)
+        fechas = {
+            "admin@example.com": datetime(2024, 1, 1, tzinfo=dt_timezone.utc),
+            "ana@example.com": datetime(2024, 2, 1, 12, tzinfo=dt_timezone.utc),
+            "orientador@example.com": datetime(2024, 3, 1, tzinfo=dt_timezone.utc),
+            "baja@example.com": datetime(2024, 4, 1, tzinfo=dt_timezone.utc),
+        }
+        for email, fecha in fechas.items():
+            Usuario.objects.filter(email=email).update(fecha_registro=fecha)
+        self.client = cliente(self.admin)
+
+    def exportar(self, **params):
+        respuesta = self.client.get(reverse("users-export"), params)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIsInstance(respuesta, StreamingHttpResponse)
+        return respuesta, b"".join(respuesta.streaming_content).decode()
+
+    def emails(self, **params):
+        _, cuerpo = self.exportar(**params)
+        return [json.loads(linea)["email"] for linea in cuerpo.splitlines()]
+
+    def test_ndjson(self):
+        respuesta, cuerpo = self.exportar()
+        self.assertEqual(respuesta["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="usuarios.ndjson"', respuesta["Content-Disposition"])
+        filas = [json.loads(linea) for linea in cuerpo.splitlines()]
+        self.assertEqual(
+            [f["email"] for f in filas],
+            ["admin@example.com", "ana@example.com", "orientador@example.com", "baja@example.com"],
+        )
+        self.assertEqual(list(filas[1]), COLUMNAS_EXPORT)
+        self.assertEqual((filas[1]["nombre"], filas[1]["apellido"]), ("Ána", "Pérez, Gil"))
+        self.assertNotIn("password", cuerpo)
+
+    def test_csv(self):
+        respuesta, cuerpo = self.exportar(formato="csv")
+        self.assertEqual(respuesta["Content-Type"], "text/csv; charset=utf-8")
+        filas = list(csv.reader(io.StringIO(cuerpo)))
+        self.assertEqual(filas[0], COLUMNAS_EXPORT)
+        self.assertEqual(len(filas), 5)
+        ana = dict(zip(filas[0], filas[2]))
+        self.assertEqual((ana["email"], ana["apellido"], ana["activo"]), ("ana@example.com", "Pérez, Gil", "True"))
+
+    def test_filtros(self):
+        self.assertEqual(self.emails(rol="orientador"), ["orientador@example.com"])
+        self.assertEqual(self.emails(activo="false"), ["baja@example.com"])
+        self.assertNotIn("baja@example.com", self.emails(activo="true"))
+        self.assertEqual(self.emails(desde="2024-02-01", hasta="2024-03-01"), ["ana@example.com", "orientador@example.com"])
+        self.assertEqual(self.emails(desde="2024-02-01T13:00:00Z"), ["orientador@example.com", "baja@example.com"])
+        self.assertEqual(self.emails(rol="estudiante", activo="true"), ["ana@example.com"])
+
+    @override_settings(USERS_EXPORT_CHUNK_SIZE=2)
+    def test_un_bloque_por_chunk(self):
+        respuesta = self.client.get(reverse("users-export"), {"formato": "csv"})
+        bloques = list(respuesta.streaming_content)
+        # Cabecera + 4 filas en bloques de 2
+        self.assertEqual(len(bloques), 3)
+
+    def test_fecha_invalida(self):
+        for params in ({"desde": "ayer"}, {"hasta": "2024-13-01"}):
+            respuesta = self.client.get(reverse("users-export"), params)
+            self.assertEqual(respuesta.status_code, 400, params)
+            self.assertIn(next(iter(params)), respuesta.data)
+
+    def test_formato_no_soportado(self):
+        self.assertEqual(self.client.get(reverse("users-export"), {"formato": "xml"}).status_code, 400)
+
+    def test_solo_admin(self):
+        estudiante = Usuario.objects.get(email="ana@example.com")
+        self.assertEqual(cliente(estudiante).get(reverse("users-export")).status_code, 403)
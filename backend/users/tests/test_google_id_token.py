@@ -0,0 +1,116 @@
+import datetime
+import time
+from unittest import mock
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.test import SimpleTestCase, override_settings
+
+from users.google_id_token import GoogleCertsCache, IdTokenInvalido, verificar_id_token
+
+CLIENT_ID = "cliente.apps.googleusercontent.com"
+
+
+def par_con_certificado():
+    privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    nombre = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "tests")])
+    ahora = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(nombre).issuer_name(nombre)
+        .public_key(privada.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(ahora - datetime.timedelta(days=1))
+        .not_valid_after(ahora + datetime.timedelta(days=1))
+        .sign(privada, hashes.SHA256())
+    )
+    return privada, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+PRIVADA, CERT = par_con_certificado()
+OTRA_PRIVADA, _ = par_con_certificado()
+
+
+def respuesta_certs(certs, max_age=100):
+    respuesta = mock.Mock(headers={"Cache-Control": f"public, max-age={max_age}"})
+    respuesta.json.return_value = certs
+    return respuesta
+
+
+def id_token(clave=PRIVADA, kid="k1", **claims):
+    ahora = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com", "aud": CLIENT_ID, "iat": ahora, "exp": ahora + 300,
+        "email": "google@example.com", "email_verified": True, **claims,
+    }
+    return jwt.encode(payload, clave, algorithm="RS256", headers={"kid": kid})
+
+
+@override_settings(GOOGLE_CLIENT_ID=CLIENT_ID)
+class VerificarIdTokenTests(SimpleTestCase):
+    def setUp(self):
+        self.certs = GoogleCertsCache("https://certs", refresco_anticipado=0.8, ttl_por_defecto=60)
+        self.get = mock.patch("users.google_id_token.google_client.get", return_value=respuesta_certs({"k1": CERT}))
+        self.descargas = self.get.start()
+        self.addCleanup(self.get.stop)
+        patcher = mock.patch("users.google_id_token.google_certs", self.certs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_valido(self):
+        claims = verificar_id_token(id_token())
+        self.assertEqual(claims["email"], "google@example.com")
+
+    def test_firma_de_otra_clave(self):
+        with self.assertRaises(IdTokenInvalido):
+            verificar_id_token(id_token(clave=OTRA_PRIVADA))
+
+    def test_audiencia_ajena(self):
+        with self.assertRaises(IdTokenInvalido):
+            verificar_id_token(id_token(aud="otro-cliente"))
+
+    def test_emisor_ajeno(self):
+        with self.assertRaisesMessage(IdTokenInvalido, "Emisor"):
+            verificar_id_token(id_token(iss="https://evil.example.com"))
+
+    def test_expirado(self):
+        ahora = int(time.time())
+        with self.assertRaises(IdTokenInvalido):
+            verificar_id_token(id_token(iat=ahora - 3600, exp=ahora - 600))
+
+    def test_email_sin_verificar(self):
+        with self.assertRaisesMessage(IdTokenInvalido, "email verificado"):
+            verificar_id_token(id_token(email_verified=False))
+
+    def test_malformado(self):
+        with self.assertRaises(IdTokenInvalido):
+            verificar_id_token("no-es-un-jwt")
+
+    def test_certificados_cacheados_por_max_age(self):
+        with mock.patch("users.google_id_token.time.monotonic", return_value=1000.0):
+            for _ in range(3):
+                verificar_id_token(id_token())
+        self.assertEqual(self.descargas.call_count, 1)
+        with mock.patch("users.google_id_token.time.monotonic", return_value=1100.0):
+            verificar_id_token(id_token())
+        self.assertEqual(self.descargas.call_count, 2)
+
+    def test_kid_nuevo_descarga_otra_vez(self):
+        verificar_id_token(id_token())
+        self.descargas.return_value = respuesta_certs({"k1": CERT, "k2": CERT})
+        verificar_id_token(id_token(kid="k2"))
+        self.assertEqual(self.descargas.call_count, 2)
+
+    def test_refresco_anticipado_en_segundo_plano(self):
+        with mock.patch("users.google_id_token.time.monotonic", return_value=1000.0):
+            verificar_id_token(id_token())
+        with mock.patch("users.google_id_token.time.monotonic", return_value=1085.0), \
+                mock.patch("users.google_id_token.threading.Thread") as hilo:
+            verificar_id_token(id_token())
+            verificar_id_token(id_token())
+        # Sigue usando los actuales y lanza un solo refresco
+        hilo.assert_called_once_with(target=self.certs._refrescar_en_fondo, daemon=True)
+        self.assertEqual(self.descargas.call_count, 1)
@@ -0,0 +1,97 @@
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from users import hashing
+from users.hashing import HashingBusy, HashingPool
+from users.models import Usuario
+
+from .utils import CLAVE, cliente, crear_usuario, limpiar_caches
+
+HASHERS_PRODUCCION = [
+    "users.hashing.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+@override_settings(PASSWORD_HASHERS=HASHERS_PRODUCCION)
+class Argon2Tests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+
+    def test_argon2id_por_defecto_con_el_coste_configurado(self):
+        encoded = hashing.hashear(CLAVE)
+        self.assertTrue(encoded.startswith("argon2$argon2id$"))
+        datos = get_hasher("argon2").decode(encoded)
+        self.assertEqual(
+            (datos["time_cost"], datos["memory_cost"], datos["parallelism"]),
+            (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM),
+        )
+        self.assertTrue(hashing.verificar(CLAVE, encoded))
+        self.assertFalse(hashing.verificar("otra", encoded))
+
+    def test_login_rehashea_pbkdf2_heredado(self):
+        user = crear_usuario("estudiante@example.com")
+        Usuario.objects.filter(pk=user.pk).update(password=make_password(CLAVE, hasher="pbkdf2_sha256"))
+
+        respuesta = cliente().post(reverse("login"), {"email": user.email, "password": CLAVE}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+        # El siguiente login ya no reescribe el hash
+        with mock.patch.object(Usuario, "save") as save:
+            cliente().post(reverse("login"), {"email": user.email, "password": CLAVE}, format="json")
+        save.assert_not_called()
+
+    def test_contrasena_incorrecta_no_rehashea(self):
+        user = crear_usuario("estudiante@example.com")
+        heredado = make_password(CLAVE, hasher="pbkdf2_sha256")
+        Usuario.objects.filter(pk=user.pk).update(password=heredado)
+        respuesta = cliente().post(reverse("login"), {"email": user.email, "password": "otra"}, format="json")
+        self.assertNotEqual(respuesta.status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(user.password, heredado)
+
+
+class HashingPoolTests(SimpleTestCase):
+    def test_en_linea_sin_workers(self):
+        pool = HashingPool(workers=0, timeout=1)
+        self.assertEqual(pool.ejecutar(len, "abc"), 3)
+        self.assertEqual(pool.mapear(len, ["a", "bb"]), [1, 2])
+        self.assertIsNone(pool._executor)
+
+    def test_pool_saturado_responde_503(self):
+        pool = HashingPool(workers=2, timeout=0.01)
+        futuro = mock.Mock()
+        futuro.result.side_effect = FuturesTimeoutError
+        executor = mock.Mock(**{"submit.return_value": futuro})
+        with mock.patch.object(HashingPool, "_get_executor", return_value=executor):
+            with self.assertRaises(HashingBusy) as ctx:
+                pool.ejecutar(len, "abc")
+        futuro.result.assert_called_once_with(timeout=0.01)
+        futuro.cancel.assert_called_once()
+        self.assertEqual(ctx.exception.status_code, 503)
+
+    def test_executor_acotado_y_recreado_tras_fork(self):
+        pool = HashingPool(workers=3, timeout=1)
+        with mock.patch("users.hashing.ProcessPoolExecutor") as executor, \
+                mock.patch("users.hashing.os.getpid", return_value=1) as getpid:
+            primero = pool._get_executor()
+            self.assertIs(pool._get_executor(), primero)
+            getpid.return_value = 2   # worker hecho con fork
+            pool._get_executor()
+        self.assertEqual(executor.call_count, 2)
+        self.assertEqual(executor.call_args.kwargs["max_workers"], 3)
+
+    def test_hashear_lote_deja_vacias_inutilizables(self):
+        pool = HashingPool(workers=0, timeout=1)
+        with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+            hashes = hashing.hashear_lote(["a", "", "b"], pool=pool)
+        self.assertTrue(hashes[0].startswith("md5$"))
+        self.assertTrue(hashes[1].startswith("!"))
+        self.assertTrue(hashes[2].startswith("md5$"))
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from users.warmup import Calentamiento
+
+
+def _falla():
+    raise RuntimeError("could not connect to server: db-interna.prod:5432 password=secreta")
+
+
+class ReadyzTests(SimpleTestCase):
+    def readyz(self, calentamiento):
+        with mock.patch("users.views_health.calentamiento", calentamiento), \
+                mock.patch.object(calentamiento, "ejecutar_en_fondo") as self.en_fondo:
+            return self.client.get(reverse("readyz"))
+
+    def test_listo(self):
+        calentamiento = Calentamiento([("rutas", lambda: "12 rutas")])
+        calentamiento.ejecutar()
+        respuesta = self.readyz(calentamiento)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), {"status": "ready"})
+
+    def test_fallido_no_expone_el_error(self):
+        calentamiento = Calentamiento([("rutas", lambda: "12 rutas"), ("base_de_datos", _falla)])
+        with self.assertLogs("users.warmup", "WARNING") as logs:
+            calentamiento.ejecutar()
+        respuesta = self.readyz(calentamiento)
+
+        self.assertEqual(respuesta.status_code, 503)
+        self.assertEqual(
+            respuesta.json(), {"status": "fallido", "pasos": {"rutas": "ok", "base_de_datos": "fallo"}},
+        )
+        self.assertNotIn(b"db-interna", respuesta.content)
+        # El detalle queda en el log
+        self.assertIn("db-interna.prod", "\n".join(logs.output))
+
+    def test_pendiente_lanza_el_calentamiento(self):
+        calentamiento = Calentamiento([])
+        respuesta = self.readyz(calentamiento)
+        self.assertEqual(respuesta.status_code, 503)
+        self.assertEqual(respuesta.json(), {"status": "pendiente", "pasos": {}})
+        self.en_fondo.assert_called_once_with()
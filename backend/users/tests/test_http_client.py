@@ -0,0 +1,137 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from users.http_client import CircuitBreaker, CircuitOpen, OAuthHttpClient
+
+
+class _Stub(BaseHTTPRequestHandler):
+    """/ok → 200, /lento → 200 tras 0.5 s, /caido → 503. Cuenta las llamadas por ruta."""
+
+    def _responder(self):
+        self.server.llamadas[self.path] = self.server.llamadas.get(self.path, 0) + 1
+        if self.path == "/lento":
+            time.sleep(0.5)
+        estado = 503 if self.path == "/caido" else 200
+        try:
+            self.send_response(estado)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        except ConnectionError:
+            pass   # el cliente ya cortó por timeout
+
+    do_GET = do_POST = _responder
+
+    def log_message(self, *args):
+        pass
+
+
+class OAuthHttpClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+        cls.servidor.llamadas = {}
+        cls.base = f"http://127.0.0.1:{cls.servidor.server_port}"
+        threading.Thread(target=cls.servidor.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.servidor.llamadas.clear()
+
+    def cliente(self, timeout=(0.5, 0.2), reintentos=2, backoff=0.1, umbral=100, enfriamiento=30):
+        return OAuthHttpClient(
+            timeout=timeout, reintentos=reintentos, backoff=backoff, pool_size=2,
+            breaker=CircuitBreaker(umbral=umbral, enfriamiento=enfriamiento),
+        )
+
+    def test_llamada_correcta(self):
+        client = self.cliente()
+        self.assertEqual(client.get(f"{self.base}/ok", "prueba").status_code, 200)
+        self.assertEqual(client.stats()["prueba"]["llamadas"], 1)
+        self.assertEqual(client.stats()["circuito"], "cerrado")
+
+    def test_timeout_de_lectura(self):
+        client = self.cliente(reintentos=0)
+        inicio = time.monotonic()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.get(f"{self.base}/lento", "prueba")
+        self.assertLess(time.monotonic() - inicio, 0.45)
+
+    def test_timeout_de_conexion(self):
+        # Socket con la cola de listen() llena: el SYN se descarta y connect() no termina
+        escucha = socket.socket()
+        escucha.bind(("127.0.0.1", 0))
+        escucha.listen(0)
+        relleno = []
+        for _ in range(3):
+            s = socket.socket()
+            s.setblocking(False)
+            s.connect_ex(escucha.getsockname())
+            relleno.append(s)
+        try:
+            client = self.cliente(timeout=(0.2, 1), reintentos=0)
+            inicio = time.monotonic()
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                client.get("http://%s:%d/" % escucha.getsockname(), "prueba")
+            self.assertLess(time.monotonic() - inicio, 1)
+        finally:
+            for s in relleno + [escucha]:
+                s.close()
+
+    @mock.patch("users.http_client.random.uniform", side_effect=lambda a, b: b)
+    @mock.patch("users.http_client.time.sleep")
+    def test_reintentos_con_backoff_en_5xx(self, sleep, uniform):
+        client = self.cliente(reintentos=2, backoff=0.1)
+        self.assertEqual(client.get(f"{self.base}/caido", "prueba").status_code, 503)
+        self.assertEqual(self.servidor.llamadas["/caido"], 3)
+        # Backoff exponencial: el tope del jitter se duplica en cada intento
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.2, 0.4])
+
+    @mock.patch("users.http_client.time.sleep")
+    def test_post_no_se_reintenta(self, sleep):
+        client = self.cliente(reintentos=2)
+        self.assertEqual(client.post(f"{self.base}/caido", "prueba").status_code, 503)
+        self.assertEqual(self.servidor.llamadas["/caido"], 1)
+        sleep.assert_not_called()
+
+    def test_circuito_se_abre_y_falla_rapido(self):
+        client = self.cliente(reintentos=0, umbral=3)
+        for _ in range(3):
+            client.get(f"{self.base}/caido", "prueba")
+        self.assertEqual(client.breaker.estado, "abierto")
+        with self.assertRaises(CircuitOpen):
+            client.get(f"{self.base}/ok", "prueba")
+        # No llegó a salir la petición
+        self.assertNotIn("/ok", self.servidor.llamadas)
+
+    def test_semiabierto_recupera_con_una_llamada_de_prueba(self):
+        client = self.cliente(reintentos=0, umbral=2, enfriamiento=0.05)
+        for _ in range(2):
+            client.get(f"{self.base}/caido", "prueba")
+        time.sleep(0.06)
+        self.assertEqual(client.breaker.estado, "semiabierto")
+        self.assertEqual(client.get(f"{self.base}/ok", "prueba").status_code, 200)
+        self.assertEqual(client.breaker.estado, "cerrado")
+
+    def test_semiabierto_deja_pasar_una_sola_prueba(self):
+        breaker = CircuitBreaker(umbral=1, enfriamiento=0.05)
+        breaker.fallo()
+        time.sleep(0.06)
+        breaker.antes_de_llamar()
+        with self.assertRaises(CircuitOpen):
+            breaker.antes_de_llamar()
+        # La prueba falla: vuelve a abrirse otro enfriamiento
+        breaker.fallo()
+        self.assertEqual(breaker.estado, "abierto")
@@ -0,0 +1,166 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import PerfilEstudiante, PerfilOrientador, Usuario
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+CSV = (
+    "email,nombre,apellido,password,rol,especialidad,carrera_interes\n"
+    "ana@example.com,Ana,Gil,Clave-1234,estudiante,,Medicina\n"
+    "luis@example.com,Luis,Paz,,orientador,Vocacional,\n"
+    "no-es-email,X,Y,,,,\n"
+    "ana@EXAMPLE.com,Ana,Otra,,,,\n"
+    "temp@mailinator.com,T,M,,,,\n"
+    "existe@example.com,E,X,,,,\n"
+    "sin-nombre@example.com,,X,,,,\n"
+)
+
+
+def filas_csv(n, desde=0):
+    return "".join(f"u{i:05}@example.com,Nombre{i},Apellido{i}\n" for i in range(desde, desde + n))
+
+
+@override_settings(USERS_IMPORT_BATCH_SIZE=2)
+class ImportarEndpointTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.client = cliente(crear_usuario("admin@example.com", rol="admin"))
+        crear_usuario("existe@example.com")
+
+    def importar(self, contenido, nombre="usuarios.csv", **params):
+        if isinstance(contenido, str):
+            contenido = contenido.encode()
+        url = reverse("users-importar")
+        if params:
+            url += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return self.client.post(url, {"archivo": SimpleUploadedFile(nombre, contenido)})
+
+    def test_csv_con_errores_por_fila(self):
+        respuesta = self.importar(CSV)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual((respuesta.data["creados"], respuesta.data["existentes"]), (2, 1))
+        errores = {e["fila"]: e for e in respuesta.data["errores"]}
+        self.assertEqual(sorted(errores), [4, 5, 6, 8])
+        self.assertIn("email", errores[4]["errores"])
+        self.assertEqual(errores[5]["errores"], "Email repetido en el archivo.")
+        self.assertIn("email", errores[6]["errores"])
+        self.assertIn("nombre", errores[8]["errores"])
+        self.assertNotIn("interrumpido", respuesta.data)
+
+        ana = Usuario.objects.get(email="ana@example.com")
+        self.assertTrue(ana.check_password("Clave-1234"))
+        self.assertEqual(PerfilEstudiante.objects.get(usuario=ana).carrera_interes, "Medicina")
+        luis = Usuario.objects.get(email="luis@example.com")
+        self.assertFalse(luis.has_usable_password())
+        self.assertEqual(PerfilOrientador.objects.get(usuario=luis).especialidad, "Vocacional")
+
+    def test_reejecutar_es_seguro(self):
+        self.importar(CSV)
+        total = Usuario.objects.count()
+        respuesta = self.importar(CSV)
+        self.assertEqual((respuesta.data["creados"], respuesta.data["existentes"]), (0, 3))
+        self.assertEqual(Usuario.objects.count(), total)
+        self.assertEqual(PerfilEstudiante.objects.filter(usuario__email="ana@example.com").count(), 1)
+
+    def test_ndjson(self):
+        contenido = "\n".join([
+            json.dumps({"email": "nd@example.com", "nombre": "N", "apellido": "D", "rol": "orientador"}),
+            "{no es json",
+            "[1, 2]",
+            "",
+            json.dumps({"email": "nd2@example.com", "nombre": "N", "apellido": "D"}),
+        ])
+        respuesta = self.importar(contenido, nombre="usuarios.ndjson")
+        self.assertEqual(respuesta.data["creados"], 2)
+        self.assertEqual([e["fila"] for e in respuesta.data["errores"]], [2, 3])
+        self.assertTrue(PerfilOrientador.objects.filter(usuario__email="nd@example.com").exists())
+
+    def test_bom_utf8(self):
+        respuesta = self.importar("﻿email,nombre,apellido\nbom@example.com,Begoña,Ñ\n".encode())
+        self.assertEqual(respuesta.data["creados"], 1)
+        self.assertEqual(Usuario.objects.get(email="bom@example.com").nombre, "Begoña")
+
+    def test_archivo_no_utf8_devuelve_400_con_lo_guardado(self):
+        # Más de un bloque de lectura de TextIOWrapper antes del byte inválido
+        validas = filas_csv(400)
+        contenido = ("email,nombre,apellido\n" + validas).encode() + "latin@example.com,José,Núñez\n".encode("latin-1")
+        respuesta = self.importar(contenido)
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertTrue(respuesta.data["interrumpido"])
+        creados = respuesta.data["creados"]
+        self.assertGreater(creados, 0)
+        self.assertEqual(Usuario.objects.filter(email__startswith="u").count(), creados)
+        error = respuesta.data["errores"][-1]
+        self.assertEqual(error["fila"], creados + 2)
+        self.assertIn("UTF-8", error["errores"])
+
+        # Corregido el archivo, re-subirlo completa la importación
+        corregido = ("email,nombre,apellido\n" + validas + "latin@example.com,José,Núñez\n").encode()
+        respuesta = self.importar(corregido)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual((respuesta.data["creados"], respuesta.data["existentes"]), (401 - creados, creados))
+
+    def test_sin_archivo_y_formato_no_soportado(self):
+        self.assertEqual(self.client.post(reverse("users-importar"), {}).status_code, 400)
+        self.assertEqual(self.importar(CSV, formato="xml").status_code, 400)
+
+    def test_solo_admin(self):
+        estudiante = Usuario.objects.get(email="existe@example.com")
+        archivo = SimpleUploadedFile("usuarios.csv", CSV.encode())
+        respuesta = cliente(estudiante).post(reverse("users-importar"), {"archivo": archivo})
+        self.assertEqual(respuesta.status_code, 403)
+
+
+class ImportUsersCommandTests(TestCase):
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+        crear_usuario("existe@example.com")
+
+    def archivo(self, contenido, nombre="usuarios.csv"):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, "wb") as f:
+            f.write(contenido if isinstance(contenido, bytes) else contenido.encode())
+        return ruta
+
+    def ejecutar(self, *args):
+        salida = io.StringIO()
+        call_command("import_users", *args, "--workers=0", "--lote=2", stdout=salida)
+        return salida.getvalue()
+
+    def test_resumen_y_errores(self):
+        salida = self.ejecutar(self.archivo(CSV))
+        self.assertIn("Creados: 2 · existentes: 1 · errores: 4", salida)
+        self.assertIn("fila 5 (ana@example.com): Email repetido en el archivo.", salida)
+
+        salida = self.ejecutar(self.archivo(CSV))
+        self.assertIn("Creados: 0 · existentes: 3", salida)
+
+    def test_reporte_csv(self):
+        reporte = os.path.join(self.directorio, "errores.csv")
+        self.ejecutar(self.archivo(CSV), f"--reporte={reporte}")
+        with open(reporte, encoding="utf-8") as f:
+            filas = list(csv.reader(f))
+        self.assertEqual(filas[0], ["fila", "email", "errores"])
+        self.assertEqual([f[0] for f in filas[1:]], ["4", "5", "6", "8"])
+
+    def test_archivo_no_utf8(self):
+        contenido = ("email,nombre,apellido\n" + filas_csv(400)).encode() + "x@example.com,José,N\n".encode("latin-1")
+        with self.assertRaisesMessage(CommandError, "UTF-8"):
+            self.ejecutar(self.archivo(contenido))
+        self.assertTrue(Usuario.objects.filter(email="u00000@example.com").exists())
+
+    def test_formato_no_soportado(self):
+        with self.assertRaises(CommandError):
+            call_command("import_users", self.archivo(CSV), "--formato=xml", stdout=io.StringIO(), stderr=io.StringIO())
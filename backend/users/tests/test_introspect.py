@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.token_service import emitir_tokens
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+@override_settings(INTROSPECT_API_KEY="clave-gateway")
+class IntrospectBatchTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.user = crear_usuario("estudiante@example.com")
+        self.inactivo = crear_usuario("inactivo@example.com")
+
+    def introspect(self, tokens, clave="clave-gateway"):
+        return cliente().post(
+            reverse("introspect-batch"), {"tokens": tokens}, format="json", HTTP_X_INTROSPECT_KEY=clave,
+        )
+
+    def test_un_lote_con_todos_los_casos(self):
+        activo = emitir_tokens(self.user)
+        revocado = emitir_tokens(self.user)["refresh"]
+        respuesta = cliente(self.user).post(reverse("logout"), {"refresh": revocado}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        de_inactivo = emitir_tokens(self.inactivo)["access"]
+        self.inactivo.activo = False
+        self.inactivo.save()
+        expirado = AccessToken.for_user(self.user)
+        expirado.set_exp(lifetime=-timedelta(seconds=1))
+
+        tokens = [activo["access"], activo["refresh"], revocado, de_inactivo, str(expirado), "no-es-un-jwt"]
+        # Lista negra y usuarios: una consulta por tabla para todo el lote
+        with self.assertNumQueries(2):
+            respuesta = self.introspect(tokens)
+        self.assertEqual(respuesta.status_code, 200)
+        resultados = respuesta.data["results"]
+        self.assertEqual(len(resultados), len(tokens))
+
+        acceso, refresh, revocado, inactivo, expirado, malformado = resultados
+        self.assertEqual((acceso["active"], acceso["token_type"]), (True, "access"))
+        self.assertEqual(acceso["claims"]["email"], "estudiante@example.com")
+        self.assertEqual((refresh["active"], refresh["token_type"]), (True, "refresh"))
+        self.assertEqual((revocado["active"], revocado["revoked"]), (False, True))
+        self.assertEqual((inactivo["active"], inactivo["revoked"], inactivo["usuario_activo"]), (False, False, False))
+        for resultado in (expirado, malformado):
+            self.assertFalse(resultado["active"])
+            self.assertIn("error", resultado)
+            self.assertNotIn("claims", resultado)
+
+    def test_limite_del_lote(self):
+        token = emitir_tokens(self.user)["access"]
+        self.assertEqual(self.introspect([token] * settings.INTROSPECT_BATCH_MAX).status_code, 200)
+        respuesta = self.introspect([token] * (settings.INTROSPECT_BATCH_MAX + 1))
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("tokens", respuesta.data)
+
+    def test_lote_vacio(self):
+        self.assertEqual(self.introspect([]).status_code, 400)
+
+    def test_sin_clave_ni_admin(self):
+        token = emitir_tokens(self.user)["access"]
+        respuesta = cliente(self.user).post(reverse("introspect-batch"), {"tokens": [token]}, format="json")
+        self.assertIn(respuesta.status_code, (401, 403))
+        respuesta = self.introspect([token], clave="otra")
+        self.assertIn(respuesta.status_code, (401, 403))
+
+    def test_admin_sin_clave(self):
+        admin = crear_usuario("admin@example.com", rol="admin")
+        token = emitir_tokens(self.user)["access"]
+        respuesta = cliente(admin).post(reverse("introspect-batch"), {"tokens": [token]}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
@@ -0,0 +1,101 @@
+import uuid
+from unittest import mock
+
+import jwt
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt import state
+
+from users.jwt_keys import keyring
+from users.management.commands.rotate_signing_keys import generar_par
+from users.models import ClaveFirma
+from users.token_service import emitir_tokens
+
+from .utils import cliente, crear_usuario, limpiar_caches, olvidar_llavero, rotar_claves
+
+
+class KeyRingTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        olvidar_llavero()
+        self.addCleanup(olvidar_llavero)
+        self.user = crear_usuario("estudiante@example.com")
+
+    def kid(self, token):
+        return jwt.get_unverified_header(token).get("kid")
+
+    def test_rotacion_firma_con_la_nueva_y_verifica_la_anterior(self):
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        anterior = emitir_tokens(self.user)["access"]
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        nuevo = emitir_tokens(self.user)["access"]
+
+        self.assertNotEqual(self.kid(anterior), self.kid(nuevo))
+        self.assertEqual(self.kid(nuevo), ClaveFirma.objects.order_by("-activa_desde").first().kid)
+        for token in (anterior, nuevo):
+            self.assertEqual(state.token_backend.decode(token)["user_id"], str(self.user.pk))
+
+    def test_clave_rotada_en_otra_instancia_se_carga_al_verla(self):
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        # Otra instancia rota: este worker aún no recargó por intervalo
+        privada, publica = generar_par("RS256")
+        ClaveFirma.objects.create(
+            kid="otra", algoritmo="RS256", clave_privada=privada, clave_publica=publica,
+            activa_desde=ClaveFirma.objects.get().activa_desde,
+        )
+        token = jwt.encode({"user_id": str(self.user.pk)}, privada, algorithm="RS256", headers={"kid": "otra"})
+        self.assertEqual(state.token_backend.decode(token)["user_id"], str(self.user.pk))
+
+    def test_kid_desconocido_no_recarga_en_cada_request(self):
+        keyring.cargar()
+        with mock.patch("users.jwt_keys.time.monotonic", return_value=1000.0):
+            keyring._cargado_en = 1000.0
+            with self.assertNumQueries(1):
+                for _ in range(5):
+                    self.assertIsNone(keyring.clave_publica(uuid.uuid4().hex))
+        with mock.patch("users.jwt_keys.time.monotonic", return_value=1000.0 + keyring.intervalo_forzado):
+            with self.assertNumQueries(1):
+                keyring.clave_publica(uuid.uuid4().hex)
+
+    def test_token_con_kid_desconocido_recibe_401(self):
+        privada, _ = generar_par("RS256")
+        token = jwt.encode({"user_id": str(self.user.pk)}, privada, algorithm="RS256", headers={"kid": "inventado"})
+        client = cliente()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(client.get(reverse("users-me")).status_code, 401)
+
+    def test_jwks_etag_y_304(self):
+        rotar_claves()
+        respuesta = cliente().get(reverse("jwks"))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual([k["kid"] for k in respuesta.json()["keys"]], [ClaveFirma.objects.get().kid])
+        self.assertIn("max-age", respuesta["Cache-Control"])
+
+        etag = respuesta["ETag"]
+        self.assertEqual(cliente().get(reverse("jwks"), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Otra clave publicada → ETag nuevo, el anterior ya no vale
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        respuesta = cliente().get(reverse("jwks"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta["ETag"], etag)
+        self.assertEqual(len(respuesta.json()["keys"]), 2)
+
+    def test_token_hs256_heredado(self):
+        # Sin claves en el llavero se firma HS256 sin `kid`
+        token = emitir_tokens(self.user)["access"]
+        self.assertIsNone(self.kid(token))
+        client = cliente()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(client.get(reverse("users-me")).status_code, 200)
+
+        # Con claves asimétricas se sigue aceptando mientras JWT_ACCEPT_LEGACY_HS256=1
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        self.assertEqual(client.get(reverse("users-me")).status_code, 200)
+        with override_settings(JWT_ACCEPT_LEGACY_HS256=False):
+            self.assertEqual(client.get(reverse("users-me")).status_code, 401)
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from users.last_seen import LastSeenRecorder
+from users.models import Usuario
+
+from .utils import crear_usuario, limpiar_caches
+
+
+class LastSeenRecorderTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.user = crear_usuario("estudiante@example.com")
+        # Intervalo largo: solo se vuelca cuando el test lo pide
+        self.recorder = LastSeenRecorder(intervalo=3600, max_pendientes=10)
+        self.recorder._asegurar_hilo = lambda: None
+
+    def ultimo_login(self):
+        return Usuario.objects.values_list("ultimo_login", flat=True).get(pk=self.user.pk)
+
+    def test_varios_logins_un_solo_volcado(self):
+        ahora = timezone.now()
+        self.recorder.registrar(self.user.pk, ahora - timedelta(minutes=1))
+        self.recorder.registrar(self.user.pk, ahora)
+        self.assertEqual(self.recorder.pendientes(), 1)
+        with CaptureQueriesContext(connection) as consultas:
+            self.recorder.volcar()
+        self.assertEqual(sum("UPDATE" in c["sql"] for c in consultas), 1)
+        self.assertEqual(self.ultimo_login(), ahora)
+
+    def test_un_instante_anterior_no_pisa_uno_posterior(self):
+        ahora = timezone.now()
+        self.recorder.registrar(self.user.pk, ahora)
+        self.recorder.volcar()
+        # Otro worker vuelca tarde un login más viejo
+        self.recorder.registrar(self.user.pk, ahora - timedelta(minutes=5))
+        self.recorder.volcar()
+        self.assertEqual(self.ultimo_login(), ahora)
+
+    def test_bufer_acotado(self):
+        for _ in range(12):
+            self.recorder.registrar(crear_usuario(f"u{_}@example.com").pk)
+        self.assertEqual(self.recorder.pendientes(), 10)
+        self.assertEqual(self.recorder.descartados, 2)
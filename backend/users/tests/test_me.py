@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class MeYExpandPerfilTests(TestCase):
+    """Usuario + perfil de su rol en una sola consulta (select_related)."""
+
+    def setUp(self):
+        limpiar_caches()
+        self.estudiante = crear_usuario("estudiante@example.com", rol="estudiante")
+        self.orientador = crear_usuario("orientador@example.com", rol="orientador")
+        self.admin = crear_usuario("admin@example.com", rol="admin")
+
+    def me(self, user):
+        client = cliente(user)
+        limpiar_caches()   # fallo de la caché de representaciones
+        with self.assertNumQueries(1):
+            respuesta = client.get(reverse("users-me"))
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.data
+
+    def test_me_estudiante(self):
+        datos = self.me(self.estudiante)
+        self.assertEqual(datos["email"], "estudiante@example.com")
+        self.assertIn("carrera_interes", datos["perfil"])
+
+    def test_me_orientador(self):
+        self.assertIn("especialidad", self.me(self.orientador)["perfil"])
+
+    def test_me_admin_sin_perfil(self):
+        self.assertIsNone(self.me(self.admin)["perfil"])
+
+    def test_me_acierto_de_cache_sin_consultas(self):
+        client = cliente(self.estudiante)
+        client.get(reverse("users-me"))
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get(reverse("users-me")).status_code, 200)
+
+    def test_retrieve_expand_perfil_fallo_de_cache(self):
+        client = cliente(self.admin)
+        limpiar_caches()
+        with self.assertNumQueries(1):
+            respuesta = client.get(reverse("users-detail", args=[self.orientador.pk]), {"expand": "perfil"})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn("especialidad", respuesta.data["perfil"])
+
+    def test_lista_expandida_una_consulta(self):
+        for i in range(5):
+            crear_usuario(f"e{i}@example.com", rol="estudiante")
+            crear_usuario(f"o{i}@example.com", rol="orientador")
+        client = cliente(self.admin)
+        with self.assertNumQueries(1):
+            respuesta = client.get(reverse("users-list"), {"expand": "perfil", "page_size": 20})
+        self.assertEqual(respuesta.status_code, 200)
+        filas = respuesta.data["results"]
+        self.assertEqual(len(filas), 13)
+        self.assertTrue(all(("perfil" in fila) for fila in filas))
@@ -0,0 +1,24 @@
+from django.test import TestCase, override_settings
+
+from .utils import cliente
+
+
+class MetricsViewTests(TestCase):
+    def setUp(self):
+        self.client = cliente()
+
+    @override_settings(METRICS_API_KEY="", DEBUG=False)
+    def test_sin_clave_no_se_expone(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    @override_settings(METRICS_API_KEY="", DEBUG=True)
+    def test_sin_clave_en_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @override_settings(METRICS_API_KEY="secreto")
+    def test_con_clave(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_X_METRICS_KEY="otra").status_code, 403)
+        respuesta = self.client.get("/metrics", HTTP_X_METRICS_KEY="secreto")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn(b"auth_http_request_duration_seconds", respuesta.content)
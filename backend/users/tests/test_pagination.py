@@ -0,0 +1,73 @@
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import Usuario
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.admin = crear_usuario("admin@example.com", rol="admin")
+        for i in range(22):
+            crear_usuario(f"e{i:02}@example.com")
+        # Empates en fecha_registro: grupos de 4 con la misma fecha (desempata el id)
+        inicio = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        for i, pk in enumerate(Usuario.objects.order_by("email").values_list("pk", flat=True)):
+            Usuario.objects.filter(pk=pk).update(fecha_registro=inicio + timedelta(days=i // 4))
+        self.esperado = [str(pk) for pk in Usuario.objects.order_by("-fecha_registro", "-id").values_list("pk", flat=True)]
+        self.client = cliente(self.admin)
+
+    def pagina(self, url, **params):
+        respuesta = self.client.get(url, params)
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.data
+
+    def ids(self, pagina):
+        return [fila["id"] for fila in pagina["results"]]
+
+    def test_recorrido_hacia_adelante_sin_saltos_ni_duplicados(self):
+        pagina = self.pagina(reverse("users-list"), page_size=5)
+        self.assertIsNone(pagina["previous"])
+        vistos = self.ids(pagina)
+        while pagina["next"]:
+            pagina = self.pagina(pagina["next"])
+            vistos += self.ids(pagina)
+        self.assertEqual(vistos, self.esperado)
+
+    def test_recorrido_hacia_atras_reproduce_las_paginas(self):
+        paginas = [self.pagina(reverse("users-list"), page_size=5)]
+        while paginas[-1]["next"]:
+            paginas.append(self.pagina(paginas[-1]["next"]))
+        self.assertEqual(len(paginas), 5)
+
+        pagina = paginas[-1]
+        for anterior in reversed(paginas[:-1]):
+            pagina = self.pagina(pagina["previous"])
+            self.assertEqual(self.ids(pagina), self.ids(anterior))
+        self.assertIsNone(pagina["previous"])
+        self.assertEqual(self.ids(self.pagina(pagina["next"])), self.ids(paginas[1]))
+
+    def test_alta_durante_el_recorrido_no_desplaza_las_paginas(self):
+        pagina = self.pagina(reverse("users-list"), page_size=5)
+        crear_usuario("nuevo@example.com")   # fecha_registro más reciente: va antes de la primera página
+        vistos = self.ids(pagina)
+        while pagina["next"]:
+            pagina = self.pagina(pagina["next"])
+            vistos += self.ids(pagina)
+        self.assertEqual(vistos, self.esperado)
+
+    def test_page_size_acotado(self):
+        with self.settings(USERS_PAGE_SIZE_MAX=7):
+            self.assertEqual(len(self.pagina(reverse("users-list"), page_size=100)["results"]), 7)
+            self.assertEqual(len(self.pagina(reverse("users-list"), page_size="x")["results"]), 7)
+
+    def test_cursor_invalido(self):
+        corrupto = base64.urlsafe_b64encode(b'[["no-es-fecha","x"],0]').decode()
+        for cursor in ("basura", corrupto, base64.urlsafe_b64encode(b'{"a":1}').decode()):
+            respuesta = self.client.get(reverse("users-list"), {"cursor": cursor})
+            self.assertEqual(respuesta.status_code, 404, cursor)
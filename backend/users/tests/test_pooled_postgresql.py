@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+
+from auth_service.pooled_postgresql.base import PoolConexiones
+
+
+class _Conexion:
+    """Doble de una conexión psycopg2: solo lo que usa el pool."""
+
+    def __init__(self, rollback_falla=False):
+        self.closed = 0
+        self.estado = extensions.TRANSACTION_STATUS_IDLE
+        self.rollback_falla = rollback_falla
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return self.estado
+
+    def rollback(self):
+        self.rollbacks += 1
+        if not self.rollback_falla:
+            self.estado = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return mock.MagicMock()
+
+    def close(self):
+        self.closed = 1
+
+
+class PoolConexionesTests(SimpleTestCase):
+    def setUp(self):
+        self.creadas = []
+        self.reloj = mock.patch("auth_service.pooled_postgresql.base.time.monotonic", return_value=1000.0)
+        self.ahora = self.reloj.start()
+        self.addCleanup(self.reloj.stop)
+
+    def conectar(self, **kwargs):
+        conexion = _Conexion(**kwargs)
+        self.creadas.append(conexion)
+        return conexion
+
+    def test_devuelta_se_reutiliza(self):
+        pool = PoolConexiones(max_size=2)
+        conexion = pool.obtener(self.conectar)
+        pool.devolver(conexion)
+        self.assertIs(pool.obtener(self.conectar), conexion)
+        self.assertEqual(len(self.creadas), 1)
+        self.assertEqual(pool.stats()["reutilizadas"], 1)
+
+    def test_en_transaccion_se_deshace_antes_de_volver(self):
+        pool = PoolConexiones()
+        conexion = pool.obtener(self.conectar)
+        conexion.estado = extensions.TRANSACTION_STATUS_INTRANS
+        pool.devolver(conexion)
+        self.assertEqual(conexion.rollbacks, 1)
+        self.assertIs(pool.obtener(self.conectar), conexion)
+
+    def test_transaccion_que_no_se_puede_deshacer_se_descarta(self):
+        pool = PoolConexiones()
+        conexion = pool.obtener(lambda: self.conectar(rollback_falla=True))
+        conexion.estado = extensions.TRANSACTION_STATUS_INERROR
+        pool.devolver(conexion)
+        self.assertTrue(conexion.closed)
+        self.assertIsNot(pool.obtener(self.conectar), conexion)
+        self.assertEqual(pool.stats()["descartadas"], 1)
+
+    def test_reciclado_por_vida_maxima(self):
+        pool = PoolConexiones(max_lifetime=60, max_idle=300)
+        vieja = pool.obtener(self.conectar)
+        pool.devolver(vieja)
+        self.ahora.return_value = 1061.0
+        nueva = pool.obtener(self.conectar)
+        self.assertIsNot(nueva, vieja)
+        self.assertTrue(vieja.closed)
+
+    def test_inactiva_demasiado_tiempo_se_cierra(self):
+        pool = PoolConexiones(max_idle=10)
+        vieja = pool.obtener(self.conectar)
+        pool.devolver(vieja)
+        self.ahora.return_value = 1011.0
+        self.assertIsNot(pool.obtener(self.conectar), vieja)
+
+    def test_agotado(self):
+        pool = PoolConexiones(max_size=1, timeout=0.01)
+        pool.obtener(self.conectar)
+        with self.assertRaises(OperationalError):
+            pool.obtener(self.conectar)
+        self.assertEqual(pool.stats()["agotado"], 1)
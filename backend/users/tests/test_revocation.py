@@ -0,0 +1,117 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from users.revocation import BloomFilter, RevocationIndex
+
+from .utils import crear_usuario
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_sin_falsos_negativos(self):
+        bloom = BloomFilter(1000, 0.01)
+        valores = [uuid.uuid4().hex for _ in range(1000)]
+        for valor in valores:
+            bloom.add(valor)
+        self.assertTrue(all(valor in bloom for valor in valores))
+
+    def test_tasa_de_falsos_positivos_acotada(self):
+        bloom = BloomFilter(1000, 0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+        falsos = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(falsos / 10000, 0.03)
+
+
+class RevocationIndexTests(TestCase):
+    def setUp(self):
+        self.user = crear_usuario("estudiante@example.com")
+        self.indice = RevocationIndex(capacidad=1000, tasa_fp=0.01, tamano_lru=2, intervalo=5, solapamiento=60)
+
+    def revocar_en_bd(self, jti=None, pk=None):
+        jti = jti or uuid.uuid4().hex
+        ahora = timezone.now()
+        pendiente = OutstandingToken.objects.create(
+            user=self.user, jti=jti, token="t", created_at=ahora, expires_at=ahora + timedelta(days=1),
+        )
+        BlacklistedToken.objects.create(id=pk, token=pendiente)
+        return jti
+
+    def test_negativo_del_bloom_sin_bd(self):
+        self.revocar_en_bd()
+        self.indice.sincronizar()
+        with self.assertNumQueries(0):
+            self.assertFalse(self.indice.esta_revocado(uuid.uuid4().hex))
+        self.assertEqual(self.indice.stats()["negativos_bloom"], 1)
+
+    def test_lru_acotado_y_positivo_fuera_del_lru_consulta_la_bd(self):
+        jtis = [self.revocar_en_bd() for _ in range(3)]
+        self.indice.sincronizar()
+        self.assertEqual(list(self.indice._lru), jtis[1:])
+        with self.assertNumQueries(0):
+            self.assertTrue(self.indice.esta_revocado(jtis[2]))
+        # Expulsado del LRU pero en el Bloom: la BD confirma y vuelve al LRU
+        with self.assertNumQueries(1):
+            self.assertTrue(self.indice.esta_revocado(jtis[0]))
+        self.assertIn(jtis[0], self.indice._lru)
+        self.assertEqual(len(self.indice._lru), 2)
+
+    def test_falso_positivo_del_bloom_lo_resuelve_la_bd(self):
+        self.indice.sincronizar()
+        with mock.patch.object(BloomFilter, "__contains__", return_value=True), self.assertNumQueries(1):
+            self.assertFalse(self.indice.esta_revocado(uuid.uuid4().hex))
+        self.assertEqual(self.indice.stats()["falsos_positivos"], 1)
+
+    def test_revocar_en_el_worker_es_visible_al_instante(self):
+        self.indice.sincronizar()
+        self.indice.revocar("local")
+        with self.assertNumQueries(0):
+            self.assertTrue(self.indice.esta_revocado("local"))
+
+    def test_sincronizacion_incremental_por_intervalo(self):
+        with mock.patch("users.revocation.time.monotonic", return_value=100.0):
+            self.indice.sincronizar()
+            jti = self.revocar_en_bd()
+            with self.assertNumQueries(0):
+                self.indice.sincronizar()
+        with mock.patch("users.revocation.time.monotonic", return_value=105.0):
+            with self.assertNumQueries(1):
+                self.indice.sincronizar()
+            with self.assertNumQueries(0):
+                self.assertTrue(self.indice.esta_revocado(jti))
+
+    def test_commit_fuera_de_orden_dentro_del_solapamiento(self):
+        with mock.patch("users.revocation.time.monotonic", return_value=100.0):
+            self.indice.sincronizar()
+        self.revocar_en_bd(pk=10)
+        with mock.patch("users.revocation.time.monotonic", return_value=105.0):
+            self.indice.sincronizar()
+        # Una transacción que obtuvo el id 5 antes que el 10 hace commit después
+        tardio = self.revocar_en_bd(pk=5)
+        with mock.patch("users.revocation.time.monotonic", return_value=110.0):
+            self.indice.sincronizar()
+        self.assertIn(tardio, self.indice._bloom)
+        self.assertEqual(self.indice.stats()["entradas_bloom"], 2)
+
+    def test_la_ventana_avanza_con_el_tiempo(self):
+        with mock.patch("users.revocation.time.monotonic", return_value=100.0):
+            self.indice.sincronizar()
+        self.revocar_en_bd(pk=10)
+        with mock.patch("users.revocation.time.monotonic", return_value=105.0):
+            self.indice.sincronizar()
+        with mock.patch("users.revocation.time.monotonic", return_value=200.0):
+            self.assertEqual(self.indice._releer_desde(200.0), 10)
+            self.indice.sincronizar()
+        self.assertEqual(len(self.indice._marcas), 2)
+
+    def test_saturado_reconstruye(self):
+        indice = RevocationIndex(capacidad=2, tasa_fp=0.01, tamano_lru=10, intervalo=0, solapamiento=60)
+        indice.sincronizar()
+        for _ in range(3):
+            self.revocar_en_bd()
+        indice.sincronizar(forzar=True)
+        self.assertEqual(indice.stats()["reconstrucciones"], 2)
@@ -0,0 +1,37 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class BusquedaUsuariosTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.admin = crear_usuario("admin@example.com", rol="admin")
+        crear_usuario("maria.lopez@example.com", nombre="María", apellido="López")
+        crear_usuario("jose@example.com", nombre="José", apellido="Pérez")
+        crear_usuario("ana@otro.org", nombre="Ana", apellido="Marín")
+        self.client = cliente(self.admin)
+
+    def buscar(self, q, **params):
+        respuesta = self.client.get(reverse("users-list"), {"q": q, **params})
+        self.assertEqual(respuesta.status_code, 200)
+        return {u["email"] for u in respuesta.data["results"]}
+
+    @skipUnless(connection.vendor != "postgresql", "fallback de los demás motores")
+    def test_sqlite_icontains_en_email_nombre_y_apellido(self):
+        self.assertEqual(self.buscar("example.com") - {"admin@example.com"}, {"maria.lopez@example.com", "jose@example.com"})
+        self.assertEqual(self.buscar("pérez"), {"jose@example.com"})
+        self.assertEqual(self.buscar("MARíN"), {"ana@otro.org"})
+        self.assertEqual(self.buscar("nadie"), set())
+
+    def test_limite(self):
+        self.assertEqual(len(self.buscar("example", limit=1)), 1)
+
+    @skipUnless(connection.vendor == "postgresql", "índice pg_trgm + unaccent")
+    def test_postgres_sin_tildes(self):
+        self.assertEqual(self.buscar("jose perez"), {"jose@example.com"})
+        self.assertIn("maria.lopez@example.com", self.buscar("Maria"))
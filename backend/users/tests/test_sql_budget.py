@@ -0,0 +1,230 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, URLResolver, reverse
+
+from users import urls as users_urls
+from users.models import PerfilEstudiante, Usuario
+from users.sql_budget import PresupuestoSQLExcedido, capturar_sql, comprobar_presupuesto
+
+from .utils import CLAVE, cliente, crear_usuario, limpiar_caches
+
+# Rutas de users/urls.py sin presupuesto fijo (crecen con la entrada)
+SIN_PRESUPUESTO = {"users-importar"}
+CONSULTAS_POR_LOTE_IMPORT = 4
+
+
+def _nombres(patrones):
+    for patron in patrones:
+        if isinstance(patron, URLResolver):
+            yield from _nombres(patron.url_patterns)
+        elif isinstance(patron, URLPattern) and patron.name:
+            yield patron.name
+
+
+class PresupuestoSQLTests(TestCase):
+    """Cada ruta de users/urls.py dentro de su entrada de SQL_BUDGETS."""
+
+    def setUp(self):
+        limpiar_caches()
+        self.admin = crear_usuario("admin@example.com", rol="admin")
+        self.estudiante = crear_usuario("estudiante@example.com")
+        self.orientador = crear_usuario("orientador@example.com", rol="orientador")
+        self.client = cliente(self.admin)
+
+    def medir(self, ruta, metodo, url, client=None, **kwargs):
+        with capturar_sql() as registro:
+            respuesta = getattr(client or self.client, metodo)(url, **kwargs)
+        comprobar_presupuesto(ruta, registro, metodo.upper())
+        return respuesta
+
+    def detalle(self, user=None):
+        return reverse("users-detail", args=[(user or self.estudiante).pk])
+
+    def test_todas_las_rutas_tienen_presupuesto(self):
+        nombres = set(_nombres(users_urls.urlpatterns))
+        con_presupuesto = {clave.split(" ")[-1] for clave in settings.SQL_BUDGETS}
+        self.assertEqual(nombres - con_presupuesto - SIN_PRESUPUESTO, set())
+
+    # --- 🔐 Autenticación ---
+    def test_register(self):
+        datos = {"email": "nuevo@example.com", "password": CLAVE, "nombre": "N", "apellido": "A"}
+        respuesta = self.medir("register", "post", reverse("register"), client=cliente(), data=datos, format="json")
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertTrue(PerfilEstudiante.objects.filter(usuario__email="nuevo@example.com").exists())
+
+    def test_register_email_duplicado(self):
+        # Sin exists() previo: el INSERT choca con UNIQUE y solo entonces se comprueba el email
+        datos = {"email": "estudiante@example.com", "password": CLAVE, "nombre": "N", "apellido": "A"}
+        respuesta = self.medir("register", "post", reverse("register"), client=cliente(), data=datos, format="json")
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("email", respuesta.data)
+
+    def test_register_otra_integrity_error_se_propaga(self):
+        datos = {"email": "nuevo@example.com", "password": CLAVE, "nombre": "N", "apellido": "A"}
+        with mock.patch.object(PerfilEstudiante.objects, "create", side_effect=IntegrityError("perfil")):
+            with self.assertRaises(IntegrityError):
+                cliente().post(reverse("register"), datos, format="json")
+        # El usuario se deshizo junto con el perfil
+        self.assertFalse(Usuario.objects.filter(email="nuevo@example.com").exists())
+
+    def test_login(self):
+        datos = {"email": "estudiante@example.com", "password": CLAVE}
+        respuesta = self.medir("login", "post", reverse("login"), client=cliente(), data=datos, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_token_obtain_pair_y_refresh(self):
+        datos = {"email": "estudiante@example.com", "password": CLAVE}
+        respuesta = self.medir(
+            "token_obtain_pair", "post", reverse("token_obtain_pair"), client=cliente(), data=datos, format="json",
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        respuesta = self.medir(
+            "token_refresh", "post", reverse("token_refresh"), client=cliente(),
+            data={"refresh": respuesta.data["refresh"]}, format="json",
+        )
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_logout(self):
+        login = cliente().post(
+            reverse("login"), {"email": "estudiante@example.com", "password": CLAVE}, format="json",
+        ).data
+        respuesta = self.medir(
+            "logout", "post", reverse("logout"), client=cliente(self.estudiante),
+            data={"refresh": login["tokens"]["refresh"]}, format="json",
+        )
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_jwks(self):
+        self.assertEqual(self.medir("jwks", "get", reverse("jwks"), client=cliente()).status_code, 200)
+
+    @override_settings(INTROSPECT_API_KEY="clave-gateway")
+    def test_introspect_batch(self):
+        login = cliente().post(
+            reverse("login"), {"email": "estudiante@example.com", "password": CLAVE}, format="json",
+        ).data
+        tokens = [login["tokens"]["access"], login["tokens"]["refresh"], "basura"]
+        respuesta = self.medir(
+            "introspect-batch", "post", reverse("introspect-batch"), client=cliente(),
+            data={"tokens": tokens}, format="json", HTTP_X_INTROSPECT_KEY="clave-gateway",
+        )
+        self.assertEqual(respuesta.status_code, 200)
+
+    # --- 🌐 Google OAuth ---
+    def test_google_login(self):
+        respuesta = self.medir("google-login", "get", reverse("google-login"), client=cliente())
+        self.assertIn(respuesta.status_code, (200, 302))
+
+    def test_google_callback(self):
+        intercambio = mock.Mock(status_code=200)
+        intercambio.json.return_value = {"access_token": "g-access", "id_token": "g-id"}
+        perfil_google = {"email": "google@example.com", "given_name": "G", "family_name": "O"}
+        with mock.patch("users.http_client.google_client.post", return_value=intercambio), \
+                mock.patch("users.google_id_token.verificar_id_token", return_value=perfil_google):
+            for _ in range(2):   # alta y login de un usuario existente
+                respuesta = self.medir(
+                    "google-callback", "get", reverse("google-callback"), client=cliente(), data={"code": "c"},
+                )
+                self.assertEqual(respuesta.status_code, 302)
+
+    # --- 👥 CRUD de usuarios ---
+    def test_api_root(self):
+        self.assertEqual(self.medir("api-root", "get", reverse("api-root")).status_code, 200)
+
+    def test_lista_independiente_del_tamano_de_pagina(self):
+        for i in range(60):
+            crear_usuario(f"e{i}@example.com", rol="estudiante" if i % 2 else "orientador")
+        for params in ({"page_size": 5}, {"page_size": 50}, {"page_size": 50, "expand": "perfil"},
+                       {"page_size": 5, "total": 1}):
+            respuesta = self.medir("users-list", "get", reverse("users-list"), data=params)
+            self.assertEqual(respuesta.status_code, 200, params)
+
+    def test_crear_usuario(self):
+        datos = {"email": "nuevo@example.com", "password": CLAVE, "nombre": "N", "apellido": "A"}
+        respuesta = self.medir("users-list", "post", reverse("users-list"), data=datos, format="json")
+        self.assertEqual(respuesta.status_code, 201)
+
+    def test_detalle(self):
+        for params in ({}, {"expand": "perfil"}):
+            limpiar_caches()
+            respuesta = self.medir("users-detail", "get", self.detalle(), data=params)
+            self.assertEqual(respuesta.status_code, 200)
+            # If-None-Match desactualizado y sin entrada en caché: versión + fila
+            limpiar_caches()
+            respuesta = self.medir("users-detail", "get", self.detalle(), data=params, HTTP_IF_NONE_MATCH='"u0"')
+            self.assertEqual(respuesta.status_code, 200)
+
+    def test_put_y_patch(self):
+        datos = {"email": "estudiante@example.com", "password": CLAVE, "nombre": "Otro", "apellido": "A"}
+        self.assertEqual(self.medir("users-detail", "put", self.detalle(), data=datos, format="json").status_code, 200)
+        respuesta = self.medir("users-detail", "patch", self.detalle(), data={"nombre": "X"}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_patch_if_match_bloquea_y_lee_en_una_consulta(self):
+        for params in ("", "?expand=perfil"):
+            url = self.detalle() + params
+            etag = self.client.get(url)["ETag"]
+            original = QuerySet.select_for_update
+            with mock.patch.object(QuerySet, "select_for_update", autospec=True, side_effect=original) as bloqueo, \
+                    capturar_sql() as registro:
+                respuesta = self.client.patch(url, {"nombre": "Y"}, format="json", HTTP_IF_MATCH=etag)
+            self.assertEqual(respuesta.status_code, 200)
+            bloqueo.assert_called_once()
+            self.assertEqual(bloqueo.call_args.kwargs, {"of": ("self",)})
+            comprobar_presupuesto("users-detail", registro, "PATCH")
+            # SELECT … FOR UPDATE + UPDATE + versión nueva (+ perfil expandido)
+            self.assertEqual(len(registro.contadas), 4 if params else 3)
+            if connection.features.has_select_for_update_of:
+                self.assertIn("FOR UPDATE OF", registro.contadas[0]["sql"])
+
+    def test_patch_if_match_desactualizado(self):
+        respuesta = self.medir(
+            "users-detail", "patch", self.detalle(), data={"nombre": "Y"}, format="json", HTTP_IF_MATCH='"u0"',
+        )
+        self.assertEqual(respuesta.status_code, 412)
+
+    def test_delete(self):
+        login = cliente().post(
+            reverse("login"), {"email": "estudiante@example.com", "password": CLAVE}, format="json",
+        )
+        self.assertEqual(login.status_code, 200)
+        self.assertEqual(self.medir("users-detail", "delete", self.detalle()).status_code, 204)
+
+    def test_me(self):
+        for user in (self.estudiante, self.orientador, self.admin):
+            limpiar_caches()
+            respuesta = self.medir("users-me", "get", reverse("users-me"), client=cliente(user))
+            self.assertEqual(respuesta.status_code, 200)
+
+    def test_export(self):
+        # Las filas se leen al transmitir la respuesta, fuera de la vista
+        respuesta = self.medir("users-export", "get", reverse("users-export"))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn(b"estudiante@example.com", b"".join(respuesta.streaming_content))
+
+    def test_importar_por_lote(self):
+        archivo = SimpleUploadedFile(
+            "usuarios.csv", b"email,nombre,apellido\na@example.com,A,B\nb@example.com,C,D\n", content_type="text/csv",
+        )
+        with capturar_sql() as registro:
+            respuesta = self.client.post(reverse("users-importar"), {"archivo": archivo})
+        self.assertEqual(respuesta.status_code, 200)
+        comprobar_presupuesto("users-importar", registro, limite=CONSULTAS_POR_LOTE_IMPORT)
+
+    # --- 🧮 El propio helper ---
+    def test_exceso_muestra_las_consultas(self):
+        with capturar_sql() as registro:
+            self.client.get(reverse("users-list"))
+        with self.assertRaisesMessage(PresupuestoSQLExcedido, "users-list: 1 consultas (presupuesto 0)"):
+            comprobar_presupuesto("users-list", registro, limite=0)
+
+    @override_settings(SQL_BUDGET_MODE="raise")
+    def test_middleware_en_modo_raise(self):
+        middleware = [*settings.MIDDLEWARE, "users.sql_budget.SQLBudgetMiddleware"]
+        with override_settings(MIDDLEWARE=middleware, SQL_BUDGETS={**settings.SQL_BUDGETS, "users-list": 0}):
+            with self.assertRaises(PresupuestoSQLExcedido):
+                self.client.get(reverse("users-list"))
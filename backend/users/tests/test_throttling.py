@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.checks import run_checks
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .utils import cliente, limpiar_caches
+
+IP_REAL = "203.0.113.7"
+
+
+@override_settings(LOGIN_THROTTLE_IP="4/60", LOGIN_THROTTLE_EMAIL="100/60", LOGIN_THROTTLE_IP_EMAIL="100/60")
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.client = cliente()
+        self.intentos = 0
+
+    def login(self, xff=IP_REAL):
+        # Un email distinto por intento: solo actúa el límite por IP
+        self.intentos += 1
+        return self.client.post(
+            reverse("login"), {"email": f"u{self.intentos}@example.com", "password": "x"},
+            format="json", HTTP_X_FORWARDED_FOR=xff,
+        )
+
+    def test_429_con_retry_after(self):
+        for _ in range(4):
+            self.assertEqual(self.login().status_code, 401)
+        respuesta = self.login()
+        self.assertEqual(respuesta.status_code, 429)
+        self.assertGreater(int(respuesta["Retry-After"]), 0)
+
+    def test_rechaza_antes_de_authenticate(self):
+        for _ in range(4):
+            self.login()
+        with mock.patch("users.views_auth.authenticate") as authenticate:
+            self.assertEqual(self.login().status_code, 429)
+        authenticate.assert_not_called()
+
+    def test_ventana_deslizante(self):
+        with mock.patch("users.throttling.time") as reloj:
+            reloj.time.return_value = 6000.0          # inicio de una ventana de 60 s
+            for _ in range(4):
+                self.assertEqual(self.login().status_code, 401)
+
+            reloj.time.return_value = 6030.0
+            respuesta = self.login()
+            self.assertEqual(respuesta.status_code, 429)
+            self.assertEqual(respuesta["Retry-After"], "30")
+
+            # Ventana siguiente: la anterior todavía pesa casi entera, solo entra un intento
+            reloj.time.return_value = 6061.0
+            self.assertEqual(self.login().status_code, 401)
+            self.assertEqual(self.login().status_code, 429)
+
+            # Dos ventanas después ya no queda nada de la primera
+            reloj.time.return_value = 6180.0
+            for _ in range(4):
+                self.assertEqual(self.login().status_code, 401)
+
+    def test_x_forwarded_for_falso_no_reinicia_el_contador(self):
+        # El cliente rota la IP que envía; el proxy (NUM_PROXIES=1) añade la real al final
+        for i in range(4):
+            self.assertEqual(self.login(f"10.0.0.{i}, {IP_REAL}").status_code, 401)
+        self.assertEqual(self.login(f"10.0.0.99, {IP_REAL}").status_code, 429)
+        self.assertEqual(self.login("198.51.100.1").status_code, 401)
+
+    def test_bloqueo_progresivo_por_cuenta(self):
+        with override_settings(LOGIN_LOCKOUT_THRESHOLD=2, LOGIN_THROTTLE_IP="100/60"):
+            for _ in range(2):
+                self.client.post(reverse("login"), {"email": "a@example.com", "password": "x"}, format="json")
+            respuesta = self.client.post(reverse("login"), {"email": "A@example.com", "password": "x"}, format="json")
+        self.assertEqual(respuesta.status_code, 429)
+        self.assertIn("Retry-After", respuesta)
+
+    def test_email_no_str_no_da_500(self):
+        for email in (["a@example.com"], 123, {"a": 1}, True):
+            respuesta = self.client.post(
+                reverse("login"), {"email": email, "password": "x"}, format="json", HTTP_X_FORWARDED_FOR=IP_REAL,
+            )
+            self.assertIn(respuesta.status_code, (400, 401), email)
+        # Sin cubeta por email, pero la IP sí cuenta: el quinto intento excede el límite
+        self.assertEqual(self.login().status_code, 429)
+
+    def test_registro_con_email_no_str(self):
+        respuesta = self.client.post(
+            reverse("register"), {"email": ["a@example.com"], "password": "x"}, format="json",
+        )
+        self.assertEqual(respuesta.status_code, 400)
+
+
+class CacheThrottlingCheckTests(TestCase):
+    def test_locmem_con_varios_workers_es_un_error(self):
+        with override_settings(WEB_CONCURRENCY=4):
+            ids = [e.id for e in run_checks()]
+        self.assertIn("users.E001", ids)
+
+    def test_un_worker_no_necesita_redis(self):
+        self.assertNotIn("users.E001", [e.id for e in run_checks()])
@@ -0,0 +1,109 @@
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import jwt
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from users.auth import register_view
+from users.jwt_keys import keyring
+from users.models import Usuario
+from users.token_service import token_minter
+
+from .utils import CLAVE, cliente, crear_usuario, limpiar_caches, olvidar_llavero, rotar_claves
+
+# Cambian en cada emisión
+VOLATILES = {"jti", "exp", "iat"}
+
+
+class TokenMinterTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        olvidar_llavero()
+        self.addCleanup(olvidar_llavero)
+
+    def registrar(self):
+        datos = {"email": "nuevo@example.com", "password": CLAVE, "nombre": "Nuevo", "apellido": "Usuario"}
+        respuesta = register_view(APIRequestFactory().post("/", datos, format="json"))
+        self.assertEqual(respuesta.status_code, 201, respuesta.data)
+        return respuesta.data["tokens"]
+
+    def login(self, ruta):
+        respuesta = cliente().post(reverse(ruta), {"email": "nuevo@example.com", "password": CLAVE}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.data.get("tokens", respuesta.data)
+
+    def google(self):
+        intercambio = mock.Mock(status_code=200)
+        intercambio.json.return_value = {"access_token": "g-access", "id_token": "g-id"}
+        perfil = {"email": "nuevo@example.com", "given_name": "Nuevo", "family_name": "Usuario"}
+        with mock.patch("users.http_client.google_client.post", return_value=intercambio), \
+                mock.patch("users.google_id_token.verificar_id_token", return_value=perfil):
+            respuesta = cliente().get(reverse("google-callback"), {"code": "c"})
+        self.assertEqual(respuesta.status_code, 302)
+        params = parse_qs(urlparse(respuesta["Location"]).query)
+        return {"access": params["access"][0], "refresh": params["refresh"][0]}
+
+    def emitidos_por_cada_via(self):
+        return {
+            "register": self.registrar(),
+            "login": self.login("login"),
+            "token_obtain_pair": self.login("token_obtain_pair"),
+            "google": self.google(),
+        }
+
+    def comprobar_mismos_claims(self):
+        vias = self.emitidos_por_cada_via()
+        user = Usuario.objects.get(email="nuevo@example.com")
+        referencia = {}
+        for via, tokens in vias.items():
+            for tipo in ("access", "refresh"):
+                # Verificados por el backend instalado (llavero)
+                payload = state.token_backend.decode(tokens[tipo])
+                self.assertEqual(payload["token_type"], tipo, via)
+                estables = {k: v for k, v in payload.items() if k not in VOLATILES}
+                referencia.setdefault(tipo, estables)
+                self.assertEqual(estables, referencia[tipo], via)
+                self.assertTrue(VOLATILES <= set(payload), via)
+        self.assertEqual(referencia["access"]["user_id"], str(user.pk))
+        self.assertEqual(
+            {k: referencia["access"][k] for k in ("email", "nombre", "apellido", "rol", "activo")},
+            {"email": user.email, "nombre": "Nuevo", "apellido": "Usuario", "rol": "estudiante", "activo": True},
+        )
+        return vias
+
+    def test_mismos_claims_en_todas_las_vias_hs256(self):
+        vias = self.comprobar_mismos_claims()
+        self.assertIsNone(jwt.get_unverified_header(vias["login"]["access"]).get("kid"))
+
+    def test_mismos_claims_en_todas_las_vias_con_llavero(self):
+        rotar_claves()
+        keyring.cargar(forzar=True)
+        vias = self.comprobar_mismos_claims()
+        kid, algoritmo, _ = keyring.clave_firma()
+        for tokens in vias.values():
+            cabecera = jwt.get_unverified_header(tokens["access"])
+            self.assertEqual((cabecera["kid"], cabecera["alg"]), (kid, algoritmo))
+
+    def test_refresh_registrado_y_renovable(self):
+        tokens = self.registrar()
+        jti = state.token_backend.decode(tokens["refresh"])["jti"]
+        self.assertTrue(OutstandingToken.objects.filter(jti=jti, token=tokens["refresh"]).exists())
+        respuesta = cliente().post(reverse("token_refresh"), {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        renovado = state.token_backend.decode(respuesta.data["access"])
+        self.assertEqual(renovado["email"], "nuevo@example.com")
+
+    def test_lote_con_un_solo_insert(self):
+        usuarios = [crear_usuario(f"u{i}@example.com") for i in range(5)]
+        keyring.cargar()
+        with self.assertNumQueries(1):
+            pares = token_minter.emitir_lote(usuarios)
+        self.assertEqual(
+            [state.token_backend.decode(p["access"])["email"] for p in pares],
+            [u.email for u in usuarios],
+        )
+        self.assertEqual(OutstandingToken.objects.filter(user__in=usuarios).count(), 5)
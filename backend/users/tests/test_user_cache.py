@@ -0,0 +1,42 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.user_cache import user_repr_cache
+
+from .utils import cliente, crear_usuario, limpiar_caches
+
+
+class UserReprCacheTests(TestCase):
+    def setUp(self):
+        limpiar_caches()
+        self.user = crear_usuario("estudiante@example.com")
+        self.client = cliente(self.user)
+        self.url = reverse("users-detail", args=[self.user.pk])
+
+    def test_acierto_sin_consultas(self):
+        self.client.get(self.url)
+        aciertos = user_repr_cache.stats()["aciertos"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(user_repr_cache.stats()["aciertos"], aciertos + 1)
+
+    def test_invalida_al_guardar_usuario_y_perfil(self):
+        self.client.get(self.url)
+        self.user.nombre = "Otro"
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).data["nombre"], "Otro")
+
+        url_perfil = self.url + "?expand=perfil"
+        self.client.get(url_perfil)
+        perfil = self.user.perfil_estudiante
+        perfil.carrera_interes = "Medicina"
+        perfil.save()
+        self.assertEqual(self.client.get(url_perfil).data["perfil"]["carrera_interes"], "Medicina")
+
+    @override_settings(WEB_CONCURRENCY=2, AUTH_CLAIMS_ONLY=False)
+    def test_sin_cache_compartida_no_se_cachea(self):
+        # Con LocMem y varios workers una invalidación no llegaría a los demás
+        self.client.get(self.url)   # usuario autenticado en la caché por usuario
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get(self.url).status_code, 200)
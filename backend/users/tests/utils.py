@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from users.jwt_keys import keyring
+from users.models import PerfilEstudiante, PerfilOrientador, Usuario
+from users.token_service import emitir_tokens
+
+CLAVE = "Clave-segura-123"
+
+
+def crear_usuario(email, rol="estudiante", **extra):
+    """Usuario con el perfil de su rol, como lo deja el registro."""
+    extra = {"nombre": "Nombre", "apellido": "Apellido", **extra}
+    user = Usuario.objects.create_user(email, CLAVE, rol=rol, **extra)
+    if rol == "estudiante":
+        PerfilEstudiante.objects.create(usuario=user)
+    elif rol == "orientador":
+        PerfilOrientador.objects.create(usuario=user)
+    return user
+
+
+def cliente(user=None):
+    """APIClient con el access token de `user` (emitido como en el login)."""
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {emitir_tokens(user)['access']}")
+    return client
+
+
+def limpiar_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def rotar_claves():
+    """Nueva clave de firma que firma desde ya (como rotate_signing_keys con --publicar-antes=0)."""
+    call_command("rotate_signing_keys", "--publicar-antes=0", stdout=mock.Mock())
+
+
+def olvidar_llavero():
+    # El llavero es global al proceso: que el siguiente uso recargue desde la BD
+    keyring._cargado_en = keyring._forzado_en = None
@@ -0,0 +1,135 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+
+def _cache():
+    return caches[settings.LOGIN_THROTTLE_CACHE]
+
+
+def _parse_limite(texto):
+    """'10/300' → (10 intentos, 300 segundos)."""
+    limite, periodo = texto.split("/")
+    return int(limite), int(periodo)
+
+
+def _normalizar_email(email):
+    """Clave del email; un JSON con email no-str no tiene cubeta propia (solo cuenta la IP)."""
+    return email.strip().lower() if isinstance(email, str) else ""
+
+
+class LoginThrottle(BaseThrottle):
+    """
+    Limitador de ventana deslizante para las vistas de autenticación.
+    Se evalúa en `initial()` de DRF, es decir, ANTES de `authenticate()`:
+    rechazar cuesta una lectura de caché, un hash cuesta ~300 ms.
+    ✅ Claves: IP, email, IP+email (contador compartido vía caché de Django)
+    ✅ Bloqueo progresivo por cuenta tras fallos consecutivos
+    ✅ 429 con cabecera Retry-After
+    La vista define `login_throttle_scope` para separar login/registro/Google.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "login_throttle_scope", "login")
+        ip = self.get_ident(request)
+        datos = request.data if request.method == "POST" and hasattr(request.data, "get") else {}
+        email = _normalizar_email(datos.get("email"))
+
+        if email:
+            restante = tiempo_bloqueo(email)
+            if restante:
+                metrics.login(scope, "throttled")
+                raise Throttled(
+                    wait=restante,
+                    detail="Demasiados intentos fallidos. La cuenta está bloqueada temporalmente.",
+                )
+
+        ventanas = [(f"{scope}:ip:{ip}", settings.LOGIN_THROTTLE_IP)]
+        if email:
+            ventanas += [
+                (f"{scope}:email:{email}", settings.LOGIN_THROTTLE_EMAIL),
+                (f"{scope}:ipemail:{ip}:{email}", settings.LOGIN_THROTTLE_IP_EMAIL),
+            ]
+
+        ahora = time.time()
+        self.espera = 0
+        for clave, limite in ventanas:
+            self.espera = max(self.espera, self._espera_ventana(clave, *_parse_limite(limite), ahora))
+        if self.espera:
+            metrics.login(scope, "throttled")
+            return False
+
+        for clave, limite in ventanas:
+            self._contar(clave, _parse_limite(limite)[1], ahora)
+        return True
+
+    def wait(self):
+        return self.espera
+
+    # --- 🪟 Ventana deslizante (aproximación de dos ventanas fijas) ---
+    @staticmethod
+    def _espera_ventana(clave, limite, periodo, ahora):
+        actual = int(ahora // periodo)
+        transcurrido = ahora - actual * periodo
+        valores = _cache().get_many([f"throttle:{clave}:{actual}", f"throttle:{clave}:{actual - 1}"])
+        en_actual = valores.get(f"throttle:{clave}:{actual}", 0)
+        en_previa = valores.get(f"throttle:{clave}:{actual - 1}", 0)
+
+        peso = 1 - transcurrido / periodo
+        if en_actual + en_previa * peso < limite:
+            return 0
+        if en_actual >= limite or not en_previa:
+            return math.ceil(periodo - transcurrido)
+        # Momento en que el peso de la ventana previa deja pasar un intento más
+        peso_objetivo = (limite - en_actual) / en_previa
+        return max(1, math.ceil((1 - peso_objetivo) * periodo - transcurrido))
+
+    @staticmethod
+    def _contar(clave, periodo, ahora):
+        key = f"throttle:{clave}:{int(ahora // periodo)}"
+        cache = _cache()
+        cache.add(key, 0, timeout=2 * periodo)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expiró entre add() e incr()
+            cache.set(key, 1, timeout=2 * periodo)
+
+
+# --- 🔒 Bloqueo progresivo por cuenta ---
+def tiempo_bloqueo(email):
+    hasta = _cache().get(f"throttle:bloqueo:{_normalizar_email(email)}")
+    if not hasta:
+        return 0
+    return max(0, math.ceil(hasta - time.time()))
+
+
+def registrar_fallo(email):
+    """Cuenta un fallo de credenciales; a partir del umbral bloquea con backoff exponencial."""
+    email = _normalizar_email(email)
+    if not email:
+        return
+    cache = _cache()
+    key = f"throttle:fallos:{email}"
+    cache.add(key, 0, timeout=settings.LOGIN_LOCKOUT_RESET)
+    try:
+        fallos = cache.incr(key)
+    except ValueError:
+        fallos = 1
+        cache.set(key, fallos, timeout=settings.LOGIN_LOCKOUT_RESET)
+
+    exceso = fallos - settings.LOGIN_LOCKOUT_THRESHOLD
+    if exceso >= 0:
+        duracion = min(settings.LOGIN_LOCKOUT_BASE * 2 ** exceso, settings.LOGIN_LOCKOUT_MAX)
+        cache.set(f"throttle:bloqueo:{email}", time.time() + duracion, timeout=duracion)
+
+
+def registrar_exito(email):
+    email = _normalizar_email(email)
+    _cache().delete_many([f"throttle:fallos:{email}", f"throttle:bloqueo:{email}"])
@@ -0,0 +1,133 @@
+import base64
+import json
+from uuid import uuid4
+
+from django.utils import timezone
+from jwt.algorithms import get_default_algorithms
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .authentication import CLAIMS_USUARIO
+from .jwt_keys import keyring
+from .metrics import TOKENS_EMITIDOS
+
+
+def _b64(datos):
+    return base64.urlsafe_b64encode(datos).rstrip(b"=")
+
+
+def claims_usuario(user):
+    """
+    Claims de usuario comunes a access y refresh, iguales en todos los logins.
+    Son los que `ClaimsJWTAuthentication` lee sin ir a la BD.
+    """
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    if not isinstance(user_id, int):
+        user_id = str(user_id)
+    claims = {api_settings.USER_ID_CLAIM: user_id, "id": str(user.id)}
+    claims.update((campo, getattr(user, campo)) for campo in CLAIMS_USUARIO)
+    if api_settings.CHECK_REVOKE_TOKEN:
+        claims[api_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(user.password)
+    return claims
+
+
+class TokenMinter:
+    """
+    Emisión de pares access/refresh en un solo paso.
+    ✅ Claims construidos una vez por usuario (`claims_usuario`)
+    ✅ Cabecera JOSE pre-codificada y clave ya preparada, por `kid` activo
+    ✅ Cada token se firma exactamente una vez (RefreshToken.for_user + str()
+       firmaba el refresh dos veces)
+    ✅ Emisión por lotes: un único INSERT de OutstandingToken
+    Los tokens son idénticos en formato a los de simplejwt (mismos claims
+    estándar, `kid`, aud/iss), así que los verifica el backend instalado.
+    """
+
+    def __init__(self, keyring):
+        self.keyring = keyring
+        self._preparado = (None, None)   # (firma del llavero, (cabecera, algoritmo, clave))
+
+    def _firmante(self):
+        firma = self.keyring.clave_firma()
+        origen, preparado = self._preparado
+        if preparado is not None and origen is firma:
+            return preparado
+
+        algoritmos = get_default_algorithms()
+        if firma is None:
+            # Sin claves en el llavero: HS256 heredado con SIGNING_KEY
+            nombre = api_settings.ALGORITHM
+            algoritmo = algoritmos[nombre]
+            clave = algoritmo.prepare_key(api_settings.SIGNING_KEY)
+            cabecera = {"alg": nombre, "typ": "JWT"}
+        else:
+            kid, nombre, clave = firma
+            algoritmo = algoritmos[nombre]
+            cabecera = {"alg": nombre, "kid": kid, "typ": "JWT"}
+
+        cabecera_b64 = _b64(json.dumps(cabecera, separators=(",", ":"), sort_keys=True).encode())
+        preparado = (cabecera_b64 + b".", algoritmo, clave)
+        self._preparado = (firma, preparado)
+        return preparado
+
+    @staticmethod
+    def _firmar(firmante, payload):
+        cabecera, algoritmo, clave = firmante
+        entrada = cabecera + _b64(
+            json.dumps(payload, separators=(",", ":"), cls=api_settings.JSON_ENCODER).encode()
+        )
+        return (entrada + b"." + _b64(algoritmo.sign(entrada, clave))).decode()
+
+    def firmar(self, payload):
+        """Firma un payload arbitrario con la clave activa (p. ej. calentamiento)."""
+        return self._firmar(self._firmante(), payload)
+
+    def emitir_lote(self, usuarios):
+        """Devuelve [{"access": …, "refresh": …}] en el mismo orden que `usuarios`."""
+        firmante = self._firmante()
+        ahora = timezone.now()
+        iat = int(ahora.timestamp())
+        expira_refresh = ahora + api_settings.REFRESH_TOKEN_LIFETIME
+        exp_refresh = int(expira_refresh.timestamp())
+        exp_access = int((ahora + api_settings.ACCESS_TOKEN_LIFETIME).timestamp())
+        extra = {}
+        if api_settings.AUDIENCE is not None:
+            extra["aud"] = api_settings.AUDIENCE
+        if api_settings.ISSUER is not None:
+            extra["iss"] = api_settings.ISSUER
+
+        pares, pendientes = [], []
+        for user in usuarios:
+            claims = claims_usuario(user)
+            claims.update(extra)
+            jti = uuid4().hex
+            refresh = self._firmar(firmante, {
+                api_settings.TOKEN_TYPE_CLAIM: "refresh", "exp": exp_refresh, "iat": iat,
+                api_settings.JTI_CLAIM: jti, **claims,
+            })
+            access = self._firmar(firmante, {
+                api_settings.TOKEN_TYPE_CLAIM: "access", "exp": exp_access, "iat": iat,
+                api_settings.JTI_CLAIM: uuid4().hex, **claims,
+            })
+            pendientes.append(OutstandingToken(
+                user=user, jti=jti, token=refresh, created_at=ahora, expires_at=expira_refresh,
+            ))
+            pares.append({"access": access, "refresh": refresh})
+
+        # Igual que BlacklistMixin.for_user: el refresh queda registrado para logout/blacklist
+        OutstandingToken.objects.bulk_create(pendientes)
+        TOKENS_EMITIDOS.labels("access").inc(len(pares))
+        TOKENS_EMITIDOS.labels("refresh").inc(len(pares))
+        return pares
+
+    def emitir(self, user):
+        return self.emitir_lote([user])[0]
+
+
+token_minter = TokenMinter(keyring)
+
+
+def emitir_tokens(user):
+    """Par access/refresh para `user` (todas las vías de login usan esto)."""
+    return token_minter.emitir(user)
@@ -0,0 +1,23 @@
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .metrics import TOKENS_REVOCADOS
+from .revocation import revocation_index
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    RefreshToken que consulta la lista negra a través del índice en memoria
+    (`users.revocation`) en lugar de un JOIN a `token_blacklist` por refresh.
+    """
+
+    def check_blacklist(self):
+        if revocation_index.esta_revocado(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("Token is blacklisted")
+
+    def blacklist(self):
+        resultado = super().blacklist()
+        revocation_index.revocar(self.payload[api_settings.JTI_CLAIM])
+        TOKENS_REVOCADOS.inc()
+        return resultado
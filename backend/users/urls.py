@@ -5,6 +5,8 @@ from .views import UserViewSet
 from .views_auth import RegisterView, LoginView, LogoutView
 from .views_google import GoogleLoginView, GoogleCallbackView
 from .views_jwt import CustomTokenObtainPairView
+from .views_jwks import JWKSView
+from .views_introspect import IntrospectBatchView
 
 # 🔹 CRUD de usuarios
 router = DefaultRouter()
@@ -23,6 +25,8 @@ urlpatterns = [
     # -------------------------------
     path("auth/token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("auth/.well-known/jwks.json", JWKSView.as_view(), name="jwks"),
+    path("auth/introspect/batch/", IntrospectBatchView.as_view(), name="introspect-batch"),
 
     # -------------------------------
     # 🌐 Google OAuth
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache_compartida import es_compartida
+
+
+class UserReprCache:
+    """
+    Caché read-through de la representación serializada de cada usuario.
+    Clave = id + versión (+ variante del serializer). Invalidar es subir la
+    versión: las entradas viejas dejan de leerse y caducan por TTL, y una
+    lectura concurrente con la escritura nunca publica datos viejos bajo la
+    versión nueva.
+    ✅ Usa el backend de caché de Django (LocMem o Redis)
+    ✅ Contadores de aciertos/fallos por proceso (`stats()`)
+    Solo se usa con una caché compartida entre workers: con LocMem, una
+    invalidación en un worker no llega a los demás, que seguirían sirviendo
+    (y respondiendo 304 a) la versión vieja hasta el TTL. Sin ella cada
+    lectura construye la representación (users.W001).
+    """
+
+    def __init__(self, ttl, prefijo="usuarios:repr"):
+        self.ttl = ttl
+        self.prefijo = prefijo
+        self._lock = threading.Lock()
+        self._contadores = {"aciertos": 0, "fallos": 0, "invalidaciones": 0}
+
+    def _key_version(self, user_id):
+        return f"{self.prefijo}:ver:{user_id}"
+
+    def _version(self, user_id):
+        key = self._key_version(user_id)
+        version = cache.get(key)
+        if version is None:
+            # Si la versión se perdió (desalojo), se parte de un valor nuevo
+            # para no resucitar entradas de versiones anteriores
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    def _contar(self, contador):
+        with self._lock:
+            self._contadores[contador] += 1
+
+    def obtener(self, user_id, construir, variante="base"):
+        """Devuelve la representación cacheada o la construye con `construir()`."""
+        if not es_compartida():
+            return construir()
+        key = f"{self.prefijo}:{user_id}:{self._version(user_id)}:{variante}"
+        datos = cache.get(key)
+        if datos is not None:
+            self._contar("aciertos")
+            return datos
+        self._contar("fallos")
+        datos = construir()
+        cache.set(key, datos, timeout=self.ttl)
+        return datos
+
+    def _subir_version(self, user_id):
+        key = self._key_version(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+    def invalidar(self, user_id):
+        self._contar("invalidaciones")
+        self._subir_version(user_id)
+        # Y otra vez al confirmar: una lectura durante la transacción pudo
+        # cachear el estado anterior con la versión recién subida
+        transaction.on_commit(lambda: self._subir_version(user_id))
+
+    def stats(self):
+        with self._lock:
+            contadores = dict(self._contadores)
+        total = contadores["aciertos"] + contadores["fallos"]
+        contadores["tasa_aciertos"] = contadores["aciertos"] / total if total else 0.0
+        return contadores
+
+
+user_repr_cache = UserReprCache(ttl=settings.USER_REPR_CACHE_TTL)
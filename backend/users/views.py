@@ -1,14 +1,33 @@
-from django.db.models import Q
+import io
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .models import Usuario
-from .serializers import UsuarioSerializer, CustomTokenObtainPairSerializer
+from .models import RELACION_PERFIL, Usuario
+from .serializers import UsuarioSerializer, UsuarioConPerfilSerializer, CustomTokenObtainPairSerializer
+from .etags import (
+    NoModificado, PrecondicionFallida, coincide_if_match, coincide_if_none_match,
+    etag_lista, etag_usuario, no_modificado,
+)
+from .export import FORMATOS, filas_export, filtrar_export
+from .bulk_import import detectar_formato, importar_usuarios, leer_filas
+from .pagination import KeysetPagination
 from .permissions import IsAdmin, IsSelfOrAdmin
+from .search import buscar_usuarios
+from .last_seen import last_seen
+from . import metrics
+from .throttling import LoginThrottle, registrar_exito, registrar_fallo
+from .token_service import emitir_tokens
+from .user_cache import user_repr_cache
 
 
 # -----------------------------
@@ -19,31 +38,183 @@ class UserViewSet(viewsets.ModelViewSet):
     CRUD completo de usuarios (solo admin puede listar, crear y borrar).
     Permite búsqueda por nombre, apellido o email.
     """
-    queryset = Usuario.objects.all().order_by("-fecha_registro")
+    queryset = Usuario.objects.all().order_by("-fecha_registro", "-id")
     serializer_class = UsuarioSerializer
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
-        if self.action in ["list", "create", "destroy"]:
+        if self.action in ["list", "create", "destroy", "export", "importar"]:
             return [IsAdmin()]
         if self.action in ["retrieve", "update", "partial_update"]:
             return [IsSelfOrAdmin()]
         return super().get_permissions()
 
+    # 👤 ?expand=perfil → perfil del rol en la misma consulta (select_related)
+    def expandir_perfil(self):
+        return self.action == "me" or self.request.query_params.get("expand") == "perfil"
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.expandir_perfil():
+            qs = qs.select_related("perfil_estudiante", "perfil_orientador")
+        if getattr(self, "bloquear_fila", False):
+            qs = qs.select_for_update(of=("self",))
+        return qs
+
+    def get_serializer_class(self):
+        return UsuarioConPerfilSerializer if self.expandir_perfil() else UsuarioSerializer
+
+    def _etag(self, instancia):
+        perfil = instancia.perfil if self.expandir_perfil() else None
+        return etag_usuario(instancia.version, *([perfil.version] if perfil else []))
+
+    def _etag_actual(self, pk):
+        """ETag desde una lectura de versiones por clave primaria (sin serializar)."""
+        if not self.expandir_perfil():
+            version = Usuario.objects.filter(pk=pk).values_list("version", flat=True).first()
+            return None if version is None else etag_usuario(version)
+        fila = (
+            Usuario.objects.filter(pk=pk)
+            .values("version", "rol", "perfil_estudiante__version", "perfil_orientador__version")
+            .first()
+        )
+        if fila is None:
+            return None
+        relacion = RELACION_PERFIL.get(fila["rol"])
+        version_perfil = fila[f"{relacion}__version"] if relacion else None
+        return etag_usuario(fila["version"], *([version_perfil] if version_perfil else []))
+
+    def _detalle(self, request, pk):
+        """
+        Representación servida desde users.user_cache, con ETag fuerte.
+        Con If-None-Match y sin entrada en caché, el 304 se decide con una
+        lectura de versiones por clave primaria, sin serializar.
+        """
+        def construir():
+            if request.headers.get("If-None-Match"):
+                etag = self._etag_actual(pk)
+                if etag is None:
+                    raise Http404
+                if coincide_if_none_match(request, etag):
+                    raise NoModificado(etag)
+            instancia = get_object_or_404(self.get_queryset(), pk=pk)
+            return {"etag": self._etag(instancia), "datos": self.get_serializer(instancia).data}
+
+        variante = "perfil" if self.expandir_perfil() else "base"
+        try:
+            entrada = user_repr_cache.obtener(pk, construir, variante=variante)
+        except NoModificado as e:
+            return no_modificado(e.etag)
+        if coincide_if_none_match(request, entrada["etag"]):
+            return no_modificado(entrada["etag"])
+        return Response(entrada["datos"], headers={"ETag": entrada["etag"]})
+
+    def retrieve(self, request, *args, **kwargs):
+        # El permiso se comprueba sobre el id de la URL: un acierto de caché no toca la BD
+        try:
+            pk = str(uuid.UUID(str(kwargs[self.lookup_field])))
+        except ValueError:
+            raise Http404
+        self.check_object_permissions(request, Usuario(id=pk))
+        return self._detalle(request, pk)
+
+    @action(detail=False, methods=["get"])
+    def me(self, request):
+        """Usuario autenticado con su perfil (una consulta como máximo)."""
+        return self._detalle(request, str(request.user.id))
+
+    def update(self, request, *args, **kwargs):
+        """PUT/PATCH; con If-Match, concurrencia optimista (412 si la versión cambió)."""
+        if "If-Match" not in request.headers:
+            response = super().update(request, *args, **kwargs)
+        else:
+            with transaction.atomic():
+                # Lee y bloquea la fila en la misma consulta: nadie cambia la
+                # versión entre la comparación y el UPDATE
+                self.bloquear_fila = True
+                instancia = self.get_object()
+                if not coincide_if_match(request, self._etag(instancia)):
+                    raise PrecondicionFallida()
+                serializer = self.get_serializer(instancia, data=request.data, partial=kwargs.get("partial", False))
+                serializer.is_valid(raise_exception=True)
+                self.perform_update(serializer)
+                response = Response(serializer.data)
+        response["ETag"] = self.etag_actualizado
+        return response
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.etag_actualizado = self._etag(serializer.instance)
+
     def list(self, request, *args, **kwargs):
         q = request.query_params.get("q")
         qs = self.get_queryset()
         if q:
-            qs = qs.filter(
-                Q(email__icontains=q) |
-                Q(nombre__icontains=q) |
-                Q(apellido__icontains=q)
-            )
+            # 🔎 Resultados por relevancia, acotados (ver users.search)
+            try:
+                limite = int(request.query_params.get("limit", settings.USER_SEARCH_LIMIT))
+            except ValueError:
+                limite = settings.USER_SEARCH_LIMIT
+            limite = max(1, min(limite, settings.USER_SEARCH_MAX_LIMIT))
+            resultados = list(buscar_usuarios(qs, q, limite))
+            etag = etag_lista(resultados, con_perfil=self.expandir_perfil())
+            if coincide_if_none_match(request, etag):
+                return no_modificado(etag)
+            ser = self.get_serializer(resultados, many=True)
+            return Response({"next": None, "previous": None, "results": ser.data}, headers={"ETag": etag})
+        # 📄 Paginación keyset (ver users.pagination)
         page = self.paginate_queryset(qs)
-        if page is not None:
-            ser = self.get_serializer(page, many=True)
-            return self.get_paginated_response(ser.data)
-        ser = self.get_serializer(qs, many=True)
-        return Response(ser.data)
+        # 🏷️ ETag de la página (ids + versiones): 304 sin serializar
+        etag = etag_lista(
+            page, self.paginator.get_next_link(), self.paginator.get_previous_link(), self.paginator.total,
+            con_perfil=self.expandir_perfil(),
+        )
+        if coincide_if_none_match(request, etag):
+            return no_modificado(etag)
+        ser = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(ser.data)
+        response["ETag"] = etag
+        return response
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Exportación completa en streaming (?formato=ndjson|csv).
+        Filtros: ?rol=, ?activo=, ?desde=, ?hasta= (fecha de registro).
+        """
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS:
+            return Response(
+                {"error": f"Formato no soportado. Usa: {', '.join(FORMATOS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        qs = filtrar_export(Usuario.objects.order_by("fecha_registro", "id"), request.query_params)
+        response = StreamingHttpResponse(
+            filas_export(qs, formato, settings.USERS_EXPORT_CHUNK_SIZE),
+            content_type=FORMATOS[formato],
+        )
+        response["Content-Disposition"] = f'attachment; filename="usuarios.{formato}"'
+        return response
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def importar(self, request):
+        """
+        Alta masiva desde un archivo CSV o NDJSON (campo multipart `archivo`).
+        Devuelve creados, existentes y los errores por fila. Para archivos muy
+        grandes usar `manage.py import_users`.
+        """
+        archivo = request.FILES.get("archivo")
+        if archivo is None:
+            return Response({"error": "Falta el archivo (campo 'archivo')."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            formato = detectar_formato(archivo.name, request.query_params.get("formato"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+        resultado = importar_usuarios(leer_filas(texto, formato), settings.USERS_IMPORT_BATCH_SIZE)
+        # Interrumpido: las filas anteriores ya se guardaron (van en `creados`); re-subir es seguro
+        codigo = status.HTTP_400_BAD_REQUEST if resultado.interrumpido else status.HTTP_200_OK
+        return Response(resultado.resumen(), status=codigo)
 
 
 # -----------------------------
@@ -66,6 +237,8 @@ class LoginView(APIView):
     ✅ Verifica si el usuario está activo
     ✅ Retorna tokens con rol y campos personalizados
     """
+    throttle_classes = [LoginThrottle]
+
     def post(self, request):
         email = request.data.get("email")
         password = request.data.get("password")
@@ -78,13 +251,17 @@ class LoginView(APIView):
 
         user = authenticate(request, email=email, password=password)
         if not user:
+            registrar_fallo(email)
+            metrics.login("login", "bad_credentials")
             return Response(
                 {"detail": "Credenciales inválidas"},
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        registrar_exito(email)
 
         # 🚫 Bloquear acceso a usuarios inactivos
         if not getattr(user, "activo", True):
+            metrics.login("login", "inactive")
             return Response(
                 {
                     "detail": "Tu cuenta está inactiva. "
@@ -93,31 +270,16 @@ class LoginView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # ✅ Usuario activo → generar tokens
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
+        last_seen.registrar(user.pk)
+        metrics.login("login", "success")
 
-        # Agregar campos personalizados al token (para el frontend)
-        access_token["email"] = user.email
-        access_token["nombre"] = getattr(user, "nombre", "")
-        access_token["apellido"] = getattr(user, "apellido", "")
-        access_token["rol"] = getattr(user, "rol", "estudiante")
-        access_token["activo"] = getattr(user, "activo", True)
-
-        # También agregar al refresh si quieres mantener consistencia
-        refresh["rol"] = getattr(user, "rol", "estudiante")
-        refresh["email"] = user.email
-        refresh["nombre"] = getattr(user, "nombre", "")
-        refresh["apellido"] = getattr(user, "apellido", "")
-        refresh["activo"] = getattr(user, "activo", True)
+        # ✅ Usuario activo → generar tokens (claims comunes, ver users.token_service)
+        tokens = emitir_tokens(user)
 
         # Respuesta completa
         return Response(
             {
-                "tokens": {
-                    "access": str(access_token),
-                    "refresh": str(refresh),
-                },
+                "tokens": tokens,
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
@@ -1,13 +1,19 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RefreshToken
 from .serializers import RegisterSerializer, LoginSerializer
+from .token_service import emitir_tokens
+from .last_seen import last_seen
+from . import metrics
+from .throttling import LoginThrottle, registrar_exito, registrar_fallo
 from django.contrib.auth import authenticate
 
 class RegisterView(generics.CreateAPIView):
     permission_classes = [AllowAny]
     serializer_class = RegisterSerializer
+    throttle_classes = [LoginThrottle]
+    login_throttle_scope = "register"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -40,6 +46,7 @@ class LoginView(generics.GenericAPIView):
     ✅ Devuelve tokens con rol, nombre, activo, etc.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request, *args, **kwargs):
         email = request.data.get("email")
@@ -53,37 +60,32 @@ class LoginView(generics.GenericAPIView):
 
         user = authenticate(request, email=email, password=password)
         if not user:
+            registrar_fallo(email)
+            metrics.login("login", "bad_credentials")
             return Response(
                 {"detail": "Credenciales inválidas."},
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        registrar_exito(email)
 
         # 🚫 Bloquear acceso a usuarios inactivos
         if not getattr(user, "activo", True):
+            metrics.login("login", "inactive")
             return Response(
                 {"detail": "Tu cuenta está inactiva. Un administrador debe activarla antes de ingresar."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # ✅ Usuario activo → generar tokens
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
+        last_seen.registrar(user.pk)
+        metrics.login("login", "success")
 
-        # Agregar campos personalizados al token
-        for t in (refresh, access_token):
-            t["email"] = user.email
-            t["nombre"] = getattr(user, "nombre", "")
-            t["apellido"] = getattr(user, "apellido", "")
-            t["rol"] = getattr(user, "rol", "")
-            t["activo"] = getattr(user, "activo", True)
+        # ✅ Usuario activo → generar tokens (claims comunes, ver users.token_service)
+        tokens = emitir_tokens(user)
 
         # 🧩 Respuesta para frontend
         return Response(
             {
-                "tokens": {
-                    "access": str(access_token),
-                    "refresh": str(refresh),
-                },
+                "tokens": tokens,
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
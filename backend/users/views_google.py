@@ -1,3 +1,5 @@
+import logging
+
 from django.conf import settings
 from django.http import JsonResponse
 from django.shortcuts import redirect
@@ -5,12 +7,16 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from . import metrics
+from .last_seen import last_seen
 from .models import Usuario
-import requests
+from .throttling import LoginThrottle
+from .token_service import emitir_tokens
 from urllib.parse import urlencode
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 class GoogleLoginView(APIView):
     permission_classes = [AllowAny]
@@ -28,16 +34,19 @@ class GoogleLoginView(APIView):
 
 class GoogleCallbackView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
+    login_throttle_scope = "google"
 
     def get(self, request):
+        # requests y google-auth al primer uso: la mayoría de los workers no sirven OAuth
+        import requests
+        from .google_id_token import IdTokenInvalido, verificar_id_token
+        from .http_client import CircuitOpen, google_client
+
         code = request.query_params.get("code")
         if not code:
             return Response({"error": "Missing code"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Log temporal para depurar
-        print("🔹 Using redirect URI:", settings.GOOGLE_REDIRECT_URI)
-        print("🔹 Client ID:", settings.GOOGLE_CLIENT_ID[:10], "...")
-
         # Intercambio del código por tokens de Google
         token_url = "https://oauth2.googleapis.com/token"
         data = {
@@ -48,30 +57,51 @@ class GoogleCallbackView(APIView):
             "grant_type": "authorization_code",
         }
         try:
-            r = requests.post(token_url, data=data)
+            r = google_client.post(token_url, "google_token", data=data)
             if r.status_code != 200:
-                print("❌ Token exchange error:", r.text)
+                logger.warning("Google OAuth: intercambio de código fallido (%s): %s", r.status_code, r.text)
                 return Response(
                     {"error": "Token exchange failed", "details": r.text},
                     status=r.status_code,
                 )
+        except CircuitOpen as e:
+            return Response({"error": "Google no disponible", "details": str(e)}, status=503)
         except requests.exceptions.RequestException as e:
-            print("❌ Request exception:", e)
+            logger.warning("Google OAuth: error de red: %s", e)
             return Response({"error": "Request exception", "details": str(e)}, status=500)
 
         tokens = r.json()
         google_access_token = tokens.get("access_token")
         google_refresh_token = tokens.get("refresh_token")
 
-        # Obtener info del usuario
-        userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
-        headers = {"Authorization": f"Bearer {google_access_token}"}
-        r = requests.get(userinfo_url, headers=headers)
-        if r.status_code != 200:
-            print("❌ User info error:", r.text)
-            return Response({"error": "Failed to get user info"}, status=r.status_code)
+        # Info del usuario: id_token verificado localmente (sin otra llamada a Google)
+        userinfo = None
+        if tokens.get("id_token"):
+            try:
+                userinfo = verificar_id_token(tokens["id_token"])
+            except (IdTokenInvalido, requests.exceptions.RequestException) as e:
+                logger.warning("Google OAuth: id_token no verificado localmente: %s", e)
+
+        # Fallback opcional: endpoint userinfo
+        if userinfo is None:
+            if not settings.GOOGLE_USERINFO_FALLBACK:
+                metrics.login("google", "bad_credentials")
+                return Response({"error": "Invalid id_token"}, status=status.HTTP_401_UNAUTHORIZED)
+
+            userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
+            headers = {"Authorization": f"Bearer {google_access_token}"}
+            try:
+                r = google_client.get(userinfo_url, "google_userinfo", headers=headers)
+            except CircuitOpen as e:
+                return Response({"error": "Google no disponible", "details": str(e)}, status=503)
+            except requests.exceptions.RequestException as e:
+                logger.warning("Google OAuth: error de red: %s", e)
+                return Response({"error": "Request exception", "details": str(e)}, status=500)
+            if r.status_code != 200:
+                logger.warning("Google OAuth: userinfo fallido (%s): %s", r.status_code, r.text)
+                return Response({"error": "Failed to get user info"}, status=r.status_code)
+            userinfo = r.json()
 
-        userinfo = r.json()
         email = userinfo.get("email")
         nombre = userinfo.get("given_name", "")
         apellido = userinfo.get("family_name", "")
@@ -81,20 +111,15 @@ class GoogleCallbackView(APIView):
             defaults={"nombre": nombre, "apellido": apellido, "rol": "estudiante"},
         )
 
-        refresh = RefreshToken.for_user(user)
-        access = refresh.access_token
+        last_seen.registrar(user.pk)
+        metrics.login("google", "success")
 
-        access["email"] = user.email
-        access["nombre"] = user.nombre
-        access["apellido"] = user.apellido
-        access["rol"] = user.rol
-        access["id"] = str(user.id)
-        access["activo"] = user.activo
+        tokens = emitir_tokens(user)
 
         frontend_url = f"{settings.FRONTEND_URL.rstrip('/')}/google/callback"
         params = {
-            "access": str(access),
-            "refresh": str(refresh),
+            "access": tokens["access"],
+            "refresh": tokens["refresh"],
             "email": user.email,
             "nombre": user.nombre,
             "apellido": user.apellido,
@@ -103,5 +128,6 @@ class GoogleCallbackView(APIView):
             "google_refresh_token": google_refresh_token,
         }
         redirect_url = f"{frontend_url}?{urlencode(params)}"
-        print("✅ Redirecting to frontend:", redirect_url)
+        # La URL lleva los tokens: no se registra
+        logger.info("Google OAuth: login de %s (nuevo=%s)", user.pk, created)
         return redirect(redirect_url)
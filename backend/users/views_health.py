@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from .warmup import calentamiento
+
+
+@never_cache
+def healthz(request):
+    """Liveness: el proceso responde. Sin BD ni caché."""
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readyz(request):
+    """Readiness: 200 solo cuando el calentamiento del worker terminó bien."""
+    if calentamiento.listo:
+        return JsonResponse({"status": "ready"})
+    # Servidores sin el hook de gunicorn (runserver) o calentamiento fallido
+    calentamiento.ejecutar_en_fondo()
+    return JsonResponse(
+        {"status": calentamiento.estado, "pasos": calentamiento.resumen()}, status=503,
+    )
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone as dt_timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .models import Usuario
+from .permissions import HasIntrospectionKey
+from .serializers import IntrospectBatchSerializer
+
+
+class IntrospectBatchView(APIView):
+    """
+    Introspección de varios tokens (access o refresh) en una sola llamada.
+    ✅ Firma y expiración se validan localmente por token
+    ✅ Lista negra y estado `activo` se consultan con una query por lote
+    La respuesta conserva el orden de los tokens recibidos.
+    """
+    permission_classes = [HasIntrospectionKey]
+
+    def post(self, request):
+        serializer = IntrospectBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tokens = serializer.validated_data["tokens"]
+
+        # 1️⃣ Validación local (sin BD)
+        payloads = []
+        for raw in tokens:
+            try:
+                payloads.append(UntypedToken(raw).payload)
+            except TokenError as e:
+                payloads.append(str(e))
+
+        validos = [p for p in payloads if isinstance(p, dict)]
+        jtis = {
+            p[api_settings.JTI_CLAIM] for p in validos
+            if p.get(api_settings.TOKEN_TYPE_CLAIM) == "refresh" and api_settings.JTI_CLAIM in p
+        }
+        user_ids = {str(p[api_settings.USER_ID_CLAIM]) for p in validos if api_settings.USER_ID_CLAIM in p}
+
+        # 2️⃣ Consultas por conjunto (una por tabla, no una por token)
+        revocados = set()
+        if jtis:
+            revocados = set(
+                BlacklistedToken.objects.filter(token__jti__in=jtis)
+                .values_list("token__jti", flat=True)
+            )
+        activos = {}
+        if user_ids:
+            activos = {
+                str(pk): activo
+                for pk, activo in Usuario.objects.filter(pk__in=user_ids).values_list("pk", "activo")
+            }
+
+        # 3️⃣ Resultado por token
+        resultados = []
+        for payload in payloads:
+            if not isinstance(payload, dict):
+                resultados.append({"active": False, "error": payload})
+                continue
+
+            user_id = str(payload.get(api_settings.USER_ID_CLAIM))
+            revocado = payload.get(api_settings.JTI_CLAIM) in revocados
+            usuario_activo = activos.get(user_id, False)
+            exp = payload.get("exp")
+            resultados.append({
+                "active": not revocado and usuario_activo,
+                "token_type": payload.get(api_settings.TOKEN_TYPE_CLAIM),
+                "exp": exp,
+                "expires_at": datetime.fromtimestamp(exp, tz=dt_timezone.utc).isoformat() if exp else None,
+                "revoked": revocado,
+                "usuario_activo": usuario_activo,
+                "claims": payload,
+            })
+
+        return Response({"results": resultados}, status=status.HTTP_200_OK)
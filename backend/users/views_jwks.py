@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from .jwt_keys import keyring
+
+
+class JWKSView(APIView):
+    """
+    Claves públicas vigentes (RFC 7517) para que otros servicios verifiquen
+    los JWT localmente. Cacheable por los clientes (ETag + Cache-Control).
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        jwks, etag = keyring.jwks()
+        cache_control = f"public, max-age={settings.JWKS_MAX_AGE}"
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse(jwks)
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
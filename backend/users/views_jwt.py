@@ -1,8 +1,21 @@
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers_jwt import CustomTokenObtainPairSerializer
+from .throttling import LoginThrottle, registrar_exito, registrar_fallo
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Vista personalizada para emitir tokens JWT con datos del usuario.
     """
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginThrottle]
+
+    def post(self, request, *args, **kwargs):
+        email = request.data.get("email")
+        try:
+            response = super().post(request, *args, **kwargs)
+        except AuthenticationFailed:
+            registrar_fallo(email)
+            raise
+        registrar_exito(email)
+        return response
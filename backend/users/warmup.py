@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections
+from django.urls import URLResolver, get_resolver, resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+
+# --- 🔥 Pasos del calentamiento ---
+def _rutas():
+    """Construye el resolver y compila el patrón de cada ruta (se hace perezosamente)."""
+    def recorrer(patrones):
+        total = 0
+        for patron in patrones:
+            patron.pattern.regex
+            if isinstance(patron, URLResolver):
+                total += recorrer(patron.url_patterns)
+            else:
+                total += 1
+        return total
+
+    resolver = get_resolver()
+    total = recorrer(resolver.url_patterns)
+    resolver.reverse_dict  # índices de reverse()
+    resolve(reverse("users-me"))
+    return f"{total} rutas"
+
+
+def _drf():
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+    for nombre in (
+        "DEFAULT_AUTHENTICATION_CLASSES", "DEFAULT_PERMISSION_CLASSES", "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES", "DEFAULT_THROTTLE_CLASSES", "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+    ):
+        getattr(api_settings, nombre)
+    jwt_settings.AUTH_TOKEN_CLASSES
+    jwt_settings.TOKEN_USER_CLASS
+
+
+def _base_de_datos():
+    # Conexión del hilo que atiende las requests (workers sync): queda abierta
+    # (CONN_MAX_AGE) o vuelve al pool (DB_POOL)
+    for alias in settings.DATABASES:
+        conexion = connections[alias]
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if conexion.settings_dict.get("CONN_MAX_AGE") == 0:
+            conexion.close()
+    return ", ".join(settings.DATABASES)
+
+
+def _llavero():
+    from .jwt_keys import keyring
+
+    keyring.cargar(forzar=True)
+    firma = keyring.clave_firma()
+    return firma[1] if firma else "HS256"
+
+
+def _tokens():
+    from rest_framework_simplejwt import state
+    from rest_framework_simplejwt.settings import api_settings
+
+    from .token_service import token_minter
+
+    ahora = int(time.time())
+    token = token_minter.firmar({
+        api_settings.TOKEN_TYPE_CLAIM: "access", "exp": ahora + 60, "iat": ahora,
+        api_settings.JTI_CLAIM: uuid4().hex, api_settings.USER_ID_CLAIM: "calentamiento",
+    })
+    state.token_backend.decode(token, verify=True)
+
+
+def _hash():
+    from . import hashing
+
+    # Arranca el pool de procesos y carga argon2 en él
+    if not hashing.verificar("calentamiento", hashing.hashear("calentamiento")):
+        raise RuntimeError("La verificación del hash de prueba falló")
+
+
+def _revocados():
+    from .revocation import revocation_index
+
+    revocation_index.sincronizar(forzar=True)
+    return f"{revocation_index.stats()['entradas_bloom']} jti"
+
+
+PASOS = (
+    ("rutas", _rutas),
+    ("drf", _drf),
+    ("base_de_datos", _base_de_datos),
+    ("llavero", _llavero),
+    ("tokens", _tokens),
+    ("hash", _hash),
+    ("revocados", _revocados),
+)
+
+
+class Calentamiento:
+    """
+    Calentamiento del worker antes de recibir tráfico (hook post_worker_init
+    de gunicorn): así la primera request no paga el resolver de URLs, la
+    conexión TLS a Postgres, el llavero, la primera firma ni el primer hash.
+    /readyz responde 200 solo cuando terminó bien. Si falla (p. ej. BD caída)
+    /readyz lo reintenta en segundo plano.
+    """
+
+    def __init__(self, pasos):
+        self.pasos = pasos
+        self._lock = threading.Lock()
+        self.estado = "pendiente"   # pendiente → en_curso → listo | fallido
+        self.resultados = {}
+
+    @property
+    def listo(self):
+        return self.estado == "listo"
+
+    def ejecutar(self):
+        with self._lock:
+            if self.estado in ("en_curso", "listo"):
+                return self.listo
+            self.estado = "en_curso"
+
+        resultados, ok, inicio = {}, True, time.perf_counter()
+        for nombre, paso in self.pasos:
+            t0 = time.perf_counter()
+            try:
+                detalle = paso()
+            except Exception as e:
+                ok = False
+                # El detalle solo va al log: /readyz es público
+                resultados[nombre] = {"ok": False, "error": type(e).__name__}
+                logger.warning("Calentamiento: falló el paso %s", nombre, exc_info=True)
+                continue
+            resultados[nombre] = {"ok": True, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+            if detalle:
+                resultados[nombre]["detalle"] = detalle
+
+        self.resultados = resultados
+        self.estado = "listo" if ok else "fallido"
+        logger.info(
+            "Calentamiento %s en %.0f ms: %s", self.estado, (time.perf_counter() - inicio) * 1000, resultados,
+        )
+        return ok
+
+    def resumen(self):
+        """Estado de cada paso para /readyz, sin detalles ni errores."""
+        return {nombre: "ok" if r["ok"] else "fallo" for nombre, r in self.resultados.items()}
+
+    def ejecutar_en_fondo(self):
+        if self.estado in ("pendiente", "fallido"):
+            threading.Thread(target=self.ejecutar, daemon=True).start()
+
+
+calentamiento = Calentamiento(PASOS)